@@ -8,4 +8,5 @@ pylxca_api_path = os.path.dirname(__file__)
 os.environ['PYLXCA_API_PATH'] = pylxca_api_path
 
 # All submodules of this package are imported; so clients need to import just this package.
-from .lxca_api import *
\ No newline at end of file
+from .lxca_api import *
+from .lxca_manager import *
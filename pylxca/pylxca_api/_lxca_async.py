@@ -0,0 +1,93 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: Implementation of lxca_async, kept in its own module because coroutine
+syntax does not parse on python 2. Import lxca_async_api from lxca_async.
+
+It is a thread pool facade, not native asyncio I/O: each command runs the blocking
+lxca_api in a worker thread, so concurrency is bounded by max_workers and every
+request in flight holds one thread and one pooled connection.
+'''
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from pylxca.pylxca_api.lxca_api import lxca_api
+from pylxca.pylxca_api.lxca_connection import lxca_connection
+from pylxca.pylxca_api.lxca_connection import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+class lxca_async_api(object):
+    '''
+    Asyncio facade over lxca_api.
+
+    Commands are executed by the same code as the blocking API, so results are
+    identical; blocking socket I/O of each request is moved to a worker thread
+    while the event loop keeps scheduling other commands.
+
+    Example:
+
+        aapi = lxca_async_api(con)
+        nodes, chassis = await asyncio.gather(aapi.nodes(), aapi.chassis())
+        jobs = await aapi.gather([('jobs', {'id': '12'}), ('jobs', {'id': '13'})])
+    '''
+
+    def __init__(self, con = None, max_workers = None):
+        '''
+        @param con: default lxca_connection for commands
+        @param max_workers: number of requests in flight, defaults to pool size of con
+        '''
+        self.con = con
+        if max_workers is None:
+            max_workers = getattr(con, 'pool_maxsize', None) or 10
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in lxca_api().func_dict:
+            raise AttributeError("'%s' object has no attribute '%s'" %(self.__class__.__name__, name))
+
+        def command(dict_handler = None, con = None):
+            return self.api(name, dict_handler, con)
+        command.__name__ = name
+        return command
+
+    async def api(self, object_name, dict_handler = None, con = None):
+        '''
+        Coroutine version of lxca_api.api
+        '''
+        if object_name == "connect":
+            con = None
+        else:
+            con = con or self.con
+            if not isinstance(con, lxca_connection):
+                raise ConnectionError("Invalid Connection Object")
+
+        # Some commands consume keys of dict_handler, each call gets its own copy
+        if dict_handler:
+            dict_handler = dict(dict_handler)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except AttributeError:
+            # python < 3.7
+            loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(self._executor, lxca_api().api, object_name, dict_handler, con)
+        if object_name == "connect" and self.con is None:
+            self.con = result
+        return result
+
+    async def gather(self, calls, return_exceptions = False):
+        '''
+        Run list of (object_name, dict_handler) or (object_name, dict_handler, con)
+        concurrently, results are returned in order of calls.
+        '''
+        coros = [self.api(*call) for call in calls]
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
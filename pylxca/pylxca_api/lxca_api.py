@@ -11,14 +11,114 @@ single entry point for APIs.
 
 import logging.config
 import json
+import threading
 
 from pylxca.pylxca_api.lxca_connection import lxca_connection
 from pylxca.pylxca_api.lxca_connection import ConnectionError
 from  pylxca.pylxca_api.lxca_rest import lxca_rest
 from  pylxca.pylxca_api.lxca_rest import HTTPError
+from pylxca.pylxca_api import lxca_timeout
+from pylxca.pylxca_api import lxca_json
+from pylxca.pylxca_api import lxca_cache
+from pylxca.pylxca_api import lxca_batch
+from pylxca.pylxca_api import lxca_bulk
+from pylxca.pylxca_api import lxca_bulk_discovery
+from pylxca.pylxca_api import lxca_bulk_manage
+from pylxca.pylxca_api import lxca_bulk_firmware
+from pylxca.pylxca_api import lxca_bulk_power
+from pylxca.pylxca_api import lxca_bulk_switches
+from pylxca.pylxca_api import lxca_bulk_ffdc
+from pylxca.pylxca_api import lxca_bulk_import
+from pylxca.pylxca_api import lxca_jobs
+from pylxca.pylxca_api.lxca_session_cache import lxca_session_cache
+from pylxca.pylxca_api.lxca_retry import lxca_retry_policy, lxca_circuit_breaker, RETRIES
 
 logger = logging.getLogger(__name__)
 
+# dict_handler flag returning generator of records instead of whole list, see iter_dict
+ITERATE_KEY = 'iterate'
+
+def get_projection(dict_handler):
+    '''
+    Returns (includeAttributes, excludeAttributes) of dict_handler as comma separated
+    strings, values may be given as strings or lists of attribute names
+    '''
+    projection = []
+    for key in ['includeAttributes', 'excludeAttributes']:
+        value = (dict_handler or {}).get(key)
+        if isinstance(value, (list, tuple, set)):
+            value = ','.join(str(item) for item in value)
+        if value:
+            value = ','.join(item.strip() for item in str(value).split(',') if item.strip())
+        projection.append(value or None)
+    if projection[0] and projection[1]:
+        raise ValueError("includeAttributes and excludeAttributes can not be used together")
+    return tuple(projection)
+
+def get_connection_args(dict_handler):
+    '''
+    Returns (url, user, passwd, verify, keyword arguments) of lxca_connection
+    for connect dict_handler
+    '''
+    url = user = passwd = None
+    verify = True
+    pool_args = dict()
+    if dict_handler:
+        url = next(item for item in [dict_handler.get('l') , dict_handler.get('url')] if item is not None)
+        user = next(item for item in [dict_handler.get('u') , dict_handler.get('user')] if item is not None)
+        passwd = next(item for item in [dict_handler.get('p') , dict_handler.get('pw')] if item is not None)
+        if "noverify" in dict_handler: verify = False
+        for key in ['pool_connections', 'pool_maxsize']:
+            if dict_handler.get(key) is not None:
+                pool_args[key] = int(dict_handler.get(key))
+        for key in ['pool_block', 'share_pool']:
+            value = dict_handler.get(key)
+            if value is not None:
+                if isinstance(value, bool):
+                    pool_args[key] = value
+                else:
+                    pool_args[key] = (str(value).lower() == "true")
+        timeout_args = dict()
+        for key, arg in [('connect_timeout', 'connect'), ('read_timeout', 'read'), ('deadline', 'deadline')]:
+            if dict_handler.get(key) is not None:
+                timeout_args[arg] = float(dict_handler.get(key))
+        if timeout_args:
+            pool_args['timeout_policy'] = lxca_timeout.lxca_timeout_policy(**timeout_args)
+        if dict_handler.get('retries') is not None:
+            pool_args['retries'] = int(dict_handler.get('retries'))
+        if dict_handler.get('backoff_factor') is not None:
+            pool_args['retry_policy'] = lxca_retry_policy(pool_args.get('retries', RETRIES),
+                                                          float(dict_handler.get('backoff_factor')))
+        breaker_args = dict()
+        for key, arg in [('breaker_threshold', 'threshold'), ('breaker_reset', 'reset')]:
+            if dict_handler.get(key) is not None:
+                breaker_args[arg] = float(dict_handler.get(key))
+        if breaker_args:
+            pool_args['circuit_breaker'] = lxca_circuit_breaker(**breaker_args)
+        session_cache = dict_handler.get('session_cache')
+        if session_cache is not None and str(session_cache).lower() != "false":
+            # True/"true" selects default cache directory, other values name the directory
+            path = None if str(session_cache).lower() == "true" else session_cache
+            pool_args['session_cache'] = lxca_session_cache(path)
+        conditional_get = dict_handler.get('conditional_get')
+        if conditional_get is not None:
+            pool_args['conditional_get'] = str(conditional_get).lower() != "false"
+        if dict_handler.get('discovery_ttl') is not None:
+            pool_args['discovery_ttl'] = float(dict_handler.get('discovery_ttl'))
+    return url, user, passwd, verify, pool_args
+
+def project(record, includeAttributes, excludeAttributes):
+    '''
+    Apply projection to a record locally, for lists LXCA returns embedded in other objects
+    '''
+    if includeAttributes:
+        names = includeAttributes.split(',')
+        return dict((key, value) for key, value in list(record.items()) if key in names)
+    if excludeAttributes:
+        names = excludeAttributes.split(',')
+        return dict((key, value) for key, value in list(record.items()) if key not in names)
+    return record
+
 class Singleton(type):
     
     def __call__(cls, *args, **kwargs):#@NoSelf
@@ -48,6 +148,11 @@ class lxca_api(with_metaclass(Singleton, object)):
         Constructor
         '''
         
+        # Connection passed to a command is tracked per thread so that commands for
+        # different connections can run concurrently, connect sets the default
+        self._local = threading.local()
+        self._con = None
+        self.response_cache = None
         self.con = None
         self.func_dict = {'connect':self.connect,
                           'chassis':self.get_chassis,
@@ -80,10 +185,29 @@ class lxca_api(with_metaclass(Singleton, object)):
                           'rules': self.get_set_rules,
                           'compositeResults': self.get_set_compositeResults
                         }
+        # commands which yield records of large lists one at a time
+        self.iter_dict = {'nodes':self.iter_nodes,
+                          'lxcalog':self.iter_lxcalog,
+                          'jobs':self.iter_jobs,
+                          'tasks':self.iter_tasks,
+                          'discover':self.iter_discovery
+                        }
     
+    @property
+    def con(self):
+        return getattr(self._local, 'con', None) or self._con
+
+    @con.setter
+    def con(self, value):
+        self._local.con = value
+        self._con = value
+
     def api( self, object_name, dict_handler = None, con = None ):
         
- 
+        # connection passed by caller serves only this call in this thread, default
+        # connection of the singleton is left alone and never disconnected here
+        explicit = con is not None and object_name != "connect"
+        previous = getattr(self._local, 'con', None)
         try:
             # If Any connection is establibshed
             if con == None and self.con and isinstance(self.con,lxca_connection):
@@ -91,14 +215,55 @@ class lxca_api(with_metaclass(Singleton, object)):
                 
             if object_name  != "connect":
                 if con and isinstance(con,lxca_connection): 
-                    self.con = con
+                    if explicit:
+                        self._local.con = con
                 else:
                     raise ConnectionError("Invalid Connection Object")
 
-            return self.func_dict[object_name](dict_handler)
+            bypass_cache = refresh_cache = False
+            if dict_handler and (lxca_cache.BYPASS_KEY in dict_handler or lxca_cache.REFRESH_KEY in dict_handler):
+                dict_handler = dict(dict_handler)
+                bypass_cache = str(dict_handler.pop(lxca_cache.BYPASS_KEY, False)).lower() == "true"
+                refresh_cache = str(dict_handler.pop(lxca_cache.REFRESH_KEY, False)).lower() == "true"
+
+            iterate = False
+            if dict_handler and ITERATE_KEY in dict_handler:
+                dict_handler = dict(dict_handler)
+                # console passes flag without value
+                iterate = str(dict_handler.pop(ITERATE_KEY)).lower() not in ("false", "none")
+                if iterate and object_name not in self.iter_dict:
+                    raise ValueError("Command %s does not support %s" %(object_name, ITERATE_KEY))
+
+            # Deadline of command bounds all requests and polling done by it
+            seconds = None
+            if con is not None and getattr(con, 'timeout_policy', None):
+                seconds = con.timeout_policy.get_deadline(object_name)
+            with lxca_timeout.deadline(seconds):
+                if iterate:
+                    # request is sent on first next() under deadline of this call,
+                    # records are read while caller iterates
+                    return self.iter_dict[object_name](dict_handler)
+
+                cache = self.response_cache
+                if cache is None or object_name == "connect":
+                    return self.func_dict[object_name](dict_handler)
+
+                if not bypass_cache and cache.is_cacheable(object_name, dict_handler):
+                    key = cache.make_key(con, object_name, dict_handler)
+                    if not refresh_cache:
+                        py_obj = cache.get(key)
+                        if py_obj is not None:
+                            return py_obj
+                    py_obj = self.func_dict[object_name](dict_handler)
+                    cache.put(key, py_obj)
+                    return py_obj
+
+                py_obj = self.func_dict[object_name](dict_handler)
+                cache.on_command(con, object_name, dict_handler)
+                return py_obj
         except ConnectionError as re:
             logger.error("Connection Exception: Exception = %s", re)
-            if self.con: 
+            if self.con and not explicit:
                 self.con.disconnect()
                 self.con = None
             raise re
@@ -114,25 +279,46 @@ class lxca_api(with_metaclass(Singleton, object)):
         except Exception as re:
             logger.error("Exception %s Occurred while calling REST API for object %s" %(re, object_name))
             raise re
+        finally:
+            if explicit:
+                self._local.con = previous
         return None
     
+    def get_by_uuids(self, uuids, fetch, *query_values):
+        '''
+        Resolve list of UUIDs with batched fetch(url, session, comma separated uuids)
+        returning inventory response, returns dict uuid -> record
+        '''
+        url = self.con.get_url()
+        session = self.con.get_session()
+
+        def _fetch(chunk):
+            return lxca_json.load_response(fetch(url, session, chunk))
+        return lxca_batch.fetch_by_uuid(_fetch, uuids, lxca_batch.url_room(url, *query_values),
+                                        getattr(self.con, 'pool_maxsize', None))
+
+    def set_response_cache(self, cache):
+        '''
+        Install lxca_response_cache used by read-only commands of all connections, None disables it
+        '''
+        self.response_cache = cache
+        return cache
+
     def connect( self, dict_handler = None ):
-        url = user = passwd = None
-        verify = True
+        url, user, passwd, verify, pool_args = get_connection_args(dict_handler)
         if dict_handler:
-            url = next(item for item in [dict_handler.get('l') , dict_handler.get('url')] if item is not None)
-            user = next(item for item in [dict_handler.get('u') , dict_handler.get('user')] if item is not None)
-            passwd = next(item for item in [dict_handler.get('p') , dict_handler.get('pw')] if item is not None)
-            if "noverify" in dict_handler: verify = False
-                 
-        self.con = lxca_connection(url,user,passwd,verify)
+            response_cache = dict_handler.get('response_cache')
+            if response_cache is not None and str(response_cache).lower() == "true" and self.response_cache is None:
+                self.set_response_cache(lxca_cache.lxca_response_cache())
+
+        self.con = lxca_connection(url,user,passwd,verify,**pool_args)
         
         #clear the temp stored passwd
         passwd = None
         
         if self.con.connect() == True:
             self.con.test_connection()
-            logger.debug("Connection to LXCA Success")
+            logger.debug("Connection to LXCA Success, session from %s", self.con.session_source)
             return self.con    
         else:
             logger.error("Connection to LXCA Failed")
@@ -174,9 +360,14 @@ class lxca_api(with_metaclass(Singleton, object)):
         if dict_handler:
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             status = next((item for item in [dict_handler.get('s') , dict_handler.get('status')] if item is not None),None)
+        include, exclude = get_projection(dict_handler)
+
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_chassis(url, session, chunk, status, include, exclude),
+                                     include, exclude)
         
-        resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),uuid,status)
-        py_obj = json.loads(resp.text)
+        resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),uuid,status,include,exclude)
+        py_obj = lxca_json.load_response(resp)
         return py_obj
     
     def get_nodes( self, dict_handler = None ):
@@ -191,15 +382,45 @@ class lxca_api(with_metaclass(Singleton, object)):
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             status = next((item for item in [dict_handler.get('s') , dict_handler.get('status')] if item is not None),None)
             chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
+        include, exclude = get_projection(dict_handler)
+
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_nodes(url, session, chunk, status, include, exclude),
+                                     include, exclude)
             
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,status)
-            py_obj = json.loads(resp.text)
-            py_obj = {'nodesList':py_obj["nodes"]}
+            py_obj = lxca_json.load_response(resp)
+            py_obj = {'nodesList':[project(node, include, exclude) for node in py_obj["nodes"]]}
         else:
-            resp = lxca_rest().get_nodes(self.con.get_url(),self.con.get_session(),uuid,status)
-            py_obj = json.loads(resp.text)
+            resp = lxca_rest().get_nodes(self.con.get_url(),self.con.get_session(),uuid,status,include,exclude)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
+
+    def iter_nodes( self, dict_handler = None ):
+        uuid = None
+        status = None
+        chassis_uuid = None
+
+        if not self.con:
+            raise ConnectionError("Connection is not Initialized.")
+
+        if dict_handler:
+            uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
+            status = next((item for item in [dict_handler.get('s') , dict_handler.get('status')] if item is not None),None)
+            chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
+        include, exclude = get_projection(dict_handler)
+
+        if isinstance(uuid, (list, tuple, set)):
+            nodes = self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_nodes(url, session, chunk, status, include, exclude),
+                                      include, exclude)
+            return (node for node in list(nodes.values()))
+        url, session = self.con.get_url(), self.con.get_session()
+        if chassis_uuid:
+            request = lxca_timeout.bind(lambda: lxca_rest().get_chassis(url,session,chassis_uuid,status))
+            return (project(node, include, exclude) for node in lxca_json.iter_request(request, 'nodes'))
+        request = lxca_timeout.bind(lambda: lxca_rest().get_nodes(url,session,uuid,status,include,exclude))
+        return lxca_json.iter_request(request, 'nodeList')
         
     def get_switches( self, dict_handler = None ):
         uuid = None
@@ -218,20 +439,31 @@ class lxca_api(with_metaclass(Singleton, object)):
             action = next((item for item in [dict_handler.get('action')] if item is not None),
                              None)
             if "ports" in dict_handler: list_port = True
-
+            port_map = next((item for item in [dict_handler.get('port_map')] if item is not None),None)
+            if isinstance(port_name, dict):
+                port_map = port_name
+            if port_map:
+                # ports of many switches, one request per switch sent concurrently
+                max_workers = next((item for item in [dict_handler.get('max_workers')] if item is not None),None)
+                return lxca_bulk_switches.bulk_switch_ports(self.con, port_map, action, max_workers and int(max_workers))
+        include, exclude = get_projection(dict_handler)
+
+        if isinstance(uuid, (list, tuple, set)) and not list_port:
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_switches(url, session, chunk, include, exclude),
+                                     include, exclude)
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,None)
-            py_obj = json.loads(resp.text)
-            py_obj = {'switchesList':py_obj["switches"]}
+            py_obj = lxca_json.load_response(resp)
+            py_obj = {'switchesList':[project(switch, include, exclude) for switch in py_obj["switches"]]}
         elif list_port and (action==None):
             resp = lxca_rest().get_switches_port(self.con.get_url(), self.con.get_session(), uuid, list_port)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         elif port_name and action:
             resp = lxca_rest().put_switches_port(self.con.get_url(), self.con.get_session(), uuid, port_name, action)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         else:
-            resp = lxca_rest().get_switches(self.con.get_url(),self.con.get_session(),uuid)
-            py_obj = json.loads(resp.text)
+            resp = lxca_rest().get_switches(self.con.get_url(),self.con.get_session(),uuid,include,exclude)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
     
     def get_fans( self, dict_handler = None ):
@@ -245,13 +477,15 @@ class lxca_api(with_metaclass(Singleton, object)):
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
             
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_fan(url, session, chunk))
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,None)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
             py_obj = {'fansList':py_obj["fans"]}
         else:
             resp = lxca_rest().get_fan(self.con.get_url(),self.con.get_session(),uuid)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
 
     def get_powersupply( self, dict_handler = None ):
@@ -265,13 +499,15 @@ class lxca_api(with_metaclass(Singleton, object)):
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
             
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_powersupply(url, session, chunk))
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,None)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
             py_obj = {'powersuppliesList':py_obj["powerSupplies"]}
         else:
             resp = lxca_rest().get_powersupply(self.con.get_url(),self.con.get_session(),uuid)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
     
     def get_fanmux( self, dict_handler = None ):
@@ -285,13 +521,15 @@ class lxca_api(with_metaclass(Singleton, object)):
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
             
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_fanmux(url, session, chunk))
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,None)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
             py_obj = {'fanmuxesList':py_obj["fanmuxes"]}
         else:
             resp = lxca_rest().get_fanmux(self.con.get_url(),self.con.get_session(),uuid)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
 
     def get_cmm( self, dict_handler = None ):
@@ -305,13 +543,15 @@ class lxca_api(with_metaclass(Singleton, object)):
             uuid = next((item for item in [dict_handler.get('u') , dict_handler.get('uuid')] if item is not None),None)
             chassis_uuid = next((item for item in [dict_handler.get('c') , dict_handler.get('chassis')] if item is not None),None)
             
+        if isinstance(uuid, (list, tuple, set)):
+            return self.get_by_uuids(uuid, lambda url, session, chunk: lxca_rest().get_cmm(url, session, chunk))
         if chassis_uuid:
             resp = lxca_rest().get_chassis(self.con.get_url(),self.con.get_session(),chassis_uuid,None)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
             py_obj = {'cmmsList':py_obj["cmms"]}
         else:
             resp = lxca_rest().get_cmm(self.con.get_url(),self.con.get_session(),uuid)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
         return py_obj
 
     def get_scalablesystem( self, dict_handler = None ):
@@ -326,7 +566,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             complextype = next((item for item in [dict_handler.get('t') , dict_handler.get('type')] if item is not None),None)
 
         resp = lxca_rest().get_scalablesystem(self.con.get_url(),self.con.get_session(),complexid,complextype)
-        py_obj = json.loads(resp.text)
+        py_obj = lxca_json.load_response(resp)
         return py_obj
 
     def do_discovery( self, dict_handler = None ):
@@ -339,14 +579,37 @@ class lxca_api(with_metaclass(Singleton, object)):
         if dict_handler:
             ip_addr = next((item for item in [dict_handler.get  ('i') , dict_handler.get('ip')] if item is not None),None)
             jobid = next((item for item in [dict_handler.get  ('j') , dict_handler.get('job')] if item is not None),None)
+            if next((item for item in [dict_handler.get  ('s') , dict_handler.get('sweep')] if item is not None),None):
+                return list(self.iter_discovery(dict_handler))
         
         resp = lxca_rest().do_discovery(self.con.get_url(),self.con.get_session(),ip_addr,jobid)
         
         try:
-            py_obj = json.loads(resp.text)
-            return py_obj
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
+        # finished discovery job tells devices which manage may reuse
+        discovery_cache = getattr(self.con, 'discovery_cache', None)
+        if jobid and discovery_cache is not None and isinstance(py_obj, dict) and lxca_jobs.is_done(py_obj):
+            discovery_cache.store(lxca_bulk_discovery.iter_devices(py_obj))
+        return py_obj
+
+    def iter_discovery( self, dict_handler = None ):
+        sweep = None
+        max_jobs = lxca_bulk.MAX_JOBS
+        rate = lxca_bulk_discovery.SWEEP_RATE
+
+        if not self.con:
+            raise ConnectionError("Connection is not Initialized.")
+
+        if dict_handler:
+            sweep = next((item for item in [dict_handler.get  ('s') , dict_handler.get('sweep')] if item is not None),None)
+            max_jobs = next((item for item in [dict_handler.get('max_jobs')] if item is not None),max_jobs)
+            rate = next((item for item in [dict_handler.get('rate')] if item is not None),rate)
+
+        if not sweep:
+            raise ValueError("Discovery yields devices only for sweep of address ranges")
+        return lxca_bulk_discovery.sweep_discovery(self.con, sweep, int(max_jobs), rate=float(rate) if rate else None)
 
     def do_manage( self, dict_handler = None ):
         ip_addr = None
@@ -358,6 +621,7 @@ class lxca_api(with_metaclass(Singleton, object)):
         type = None
         uuid = None
         force = None
+        refresh = False
         
         if not self.con:
             raise ConnectionError("Connection is not Initialized.")
@@ -369,11 +633,20 @@ class lxca_api(with_metaclass(Singleton, object)):
             rpw = next((item for item in [dict_handler.get  ('r') , dict_handler.get('rpw')] if item is not None),None)
             jobid = next((item for item in [dict_handler.get  ('j') , dict_handler.get('job')] if item is not None),None)
             force = next((item for item in [dict_handler.get  ('f') , dict_handler.get('force')] if item is not None),None)
+            endpoints = next((item for item in [dict_handler.get  ('e') , dict_handler.get('endpoints')] if item is not None),None)
+            max_jobs = next((item for item in [dict_handler.get('max_jobs')] if item is not None),lxca_bulk.MAX_JOBS)
+            # discover again even when discovery cache has the endpoint
+            refresh = str(dict_handler.get('refresh_discovery', False)).lower() == "true"
+
+            if endpoints:
+                # list of endpoints or CSV/JSON file of them, user/pw/rpw are defaults
+                return lxca_bulk_manage.bulk_manage(self.con, endpoints, force, int(max_jobs),
+                                             user=user, pw=pw, rpw=rpw, refresh_discovery=refresh)
         
-        resp = lxca_rest().do_manage(self.con.get_url(),self.con.get_session(),ip_addr,user,pw,rpw,force,jobid)
+        resp = lxca_rest().do_manage(self.con.get_url(),self.con.get_session(),ip_addr,user,pw,rpw,force,jobid,refresh)
         
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             return py_obj
         except AttributeError as ValueError:
             return resp
@@ -391,11 +664,18 @@ class lxca_api(with_metaclass(Singleton, object)):
             endpoints = next((item for item in [dict_handler.get  ('i') , dict_handler.get('ip')] if item is not None),None)
             force = next((item for item in [dict_handler.get  ('f') , dict_handler.get('force')] if item is not None),False)
             jobid = next((item for item in [dict_handler.get  ('j') , dict_handler.get('job')] if item is not None),None)
+            bulk_endpoints = next((item for item in [dict_handler.get  ('e') , dict_handler.get('endpoints')] if item is not None),None)
+            max_jobs = next((item for item in [dict_handler.get('max_jobs')] if item is not None),lxca_bulk.MAX_JOBS)
+            retries = next((item for item in [dict_handler.get('retries')] if item is not None),lxca_bulk_manage.UNMANAGE_RETRIES)
+
+            if bulk_endpoints:
+                # endpoint records or CSV/JSON file of them, unmanaged in chunks
+                return lxca_bulk_manage.bulk_unmanage(self.con, bulk_endpoints, force, int(max_jobs), retries=int(retries))
             
         resp = lxca_rest().do_unmanage(self.con.get_url(),self.con.get_session(),endpoints,force,jobid)
         
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -412,7 +692,7 @@ class lxca_api(with_metaclass(Singleton, object)):
         resp = lxca_rest().get_configtargets(self.con.get_url(),self.con.get_session(),targetid)
 
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             return py_obj
 
         except AttributeError as ValueError:
@@ -445,7 +725,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             # get all patterns and get id from name
             resp = lxca_rest().do_configpatterns(self.con.get_url(), self.con.get_session(), None, None,
                                                  None, None, None, None)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             for item in py_obj['items']:
                 if item['name'] == patternname:
                     patternid = item['id']
@@ -461,7 +741,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             # if endpoint:
             #     return resp
             # else:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             return py_obj
         
         except AttributeError as ValueError:
@@ -513,8 +793,8 @@ class lxca_api(with_metaclass(Singleton, object)):
             resp = lxca_rest().get_configprofiles(self.con.get_url(),self.con.get_session(),profileid)
 
         try:
-            if len(resp.text):
-                py_obj = json.loads(resp.text)
+            if len(resp.content):
+                py_obj = lxca_json.decode_response(resp)
                 return py_obj
             elif resp.status_code == 204:   # Its success for rename of profile with empty text
                 return { 'ID':profileid, 'name':profilename}
@@ -542,16 +822,36 @@ class lxca_api(with_metaclass(Singleton, object)):
         
         try:
             if jobid:
-                py_obj = json.loads(resp.text)
+                py_obj = lxca_json.decode_response(resp)
             if canceljobid or deletejobid:
                 return resp
             else:
-                py_obj = json.loads(resp.text)
+                py_obj = lxca_json.decode_response(resp)
                 py_obj = {'jobsList':py_obj}
             return py_obj
         except AttributeError as ValueError:
             return resp
 
+    def iter_jobs( self, dict_handler = None ):
+        jobid = None
+        uuid = None
+        state = None
+
+        if not self.con:
+            raise ConnectionError("Connection is not Initialized.")
+
+        if dict_handler:
+            jobid = next((item for item in [dict_handler.get  ('i') , dict_handler.get('id')] if item is not None),None)
+            uuid = next((item for item in [dict_handler.get  ('u') , dict_handler.get('uuid')] if item is not None),False)
+            state = next((item for item in [dict_handler.get  ('s') , dict_handler.get('state')] if item is not None),None)
+            for key in ['c', 'cancel', 'd', 'delete']:
+                if dict_handler.get(key) is not None:
+                    raise ValueError("Jobs can not be cancelled or deleted with %s" %ITERATE_KEY)
+
+        url, session = self.con.get_url(), self.con.get_session()
+        request = lxca_timeout.bind(lambda: lxca_rest().get_jobs(url,session,jobid,uuid,state,None,None,stream=True))
+        return lxca_json.iter_request(request)
+
 
 
     def get_users( self, dict_handler = None ):
@@ -568,9 +868,9 @@ class lxca_api(with_metaclass(Singleton, object)):
         try:
             
             if userid:
-                py_obj = json.loads(resp.text)['response']
+                py_obj = lxca_json.decode_response(resp)['response']
             else:
-                py_obj = json.loads(resp.text)
+                py_obj = lxca_json.decode_response(resp)
                 py_obj = {'usersList':py_obj['response']}
         except AttributeError as ValueError:
             return resp
@@ -588,11 +888,24 @@ class lxca_api(with_metaclass(Singleton, object)):
         resp = lxca_rest().get_lxcalog(self.con.get_url(),self.con.get_session(),filter)
         
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.load_response(resp)
             py_obj = {'eventList':py_obj}
             return py_obj
         except AttributeError as ValueError:
             return resp
+
+    def iter_lxcalog( self, dict_handler = None ):
+        filter = None
+
+        if not self.con:
+            raise ConnectionError("Connection is not Initialized.")
+
+        if dict_handler:
+            filter = next((item for item in [dict_handler.get  ('f') , dict_handler.get('filter')] if item is not None),None)
+
+        url, session = self.con.get_url(), self.con.get_session()
+        request = lxca_timeout.bind(lambda: lxca_rest().get_lxcalog(url,session,filter))
+        return lxca_json.iter_request(request)
         
     def get_ffdc( self, dict_handler = None ): 
         uuid = None
@@ -602,11 +915,17 @@ class lxca_api(with_metaclass(Singleton, object)):
         
         if dict_handler:
             uuid = next((item for item in [dict_handler.get  ('u') , dict_handler.get('uuid')] if item is not None),None)
+            directory = next((item for item in [dict_handler.get('directory')] if item is not None),None)
+
+            if directory or isinstance(uuid, (list, tuple)):
+                # collect from all endpoints at once and stream archives into directory
+                max_workers = next((item for item in [dict_handler.get('max_workers')] if item is not None),None)
+                return lxca_bulk_ffdc.bulk_ffdc(self.con, uuid, directory or '.', max_workers and int(max_workers))
             
         resp = lxca_rest().get_ffdc(self.con.get_url(),self.con.get_session(),uuid)
         
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -636,7 +955,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             resp = lxca_rest().get_updatepolicy(self.con.get_url(), self.con.get_session(), info, jobid)
 
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             if info == "RESULTS":
                 py_obj = py_obj["all"]
         except AttributeError as ValueError:
@@ -670,7 +989,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             raise Exception("Invalid argument")
 
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -697,6 +1016,14 @@ class lxca_api(with_metaclass(Singleton, object)):
             type = next((item for item in [dict_handler.get('t'), dict_handler.get('type')] if item is not None), None)
             jobid = next((item for item in [dict_handler.get('j'), dict_handler.get('jobid')] if item is not None), None)
             files = next((item for item in [dict_handler.get('files')] if item is not None),       None)
+            stream = str(dict_handler.get('stream', False)).lower() == "true"
+
+            if action == 'import' and jobid is None and (stream or isinstance(files, (list, tuple))):
+                # one streamed upload per package, packages LXCA already has are skipped
+                max_workers = next((item for item in [dict_handler.get('max_workers')] if item is not None),lxca_bulk_import.IMPORT_WORKERS)
+                retries = next((item for item in [dict_handler.get('retries')] if item is not None),lxca_bulk_import.IMPORT_RETRIES)
+                skip_existing = str(dict_handler.get('skip_existing', True)).lower() != "false"
+                return lxca_bulk_import.bulk_import_updates(self.con, files, int(max_workers), int(retries), skip_existing)
         if key:
             resp = lxca_rest().get_managementserver(self.con.get_url(), self.con.get_session(), key, fixids, type)
         elif action:
@@ -705,7 +1032,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             resp = lxca_rest().get_managementserver(self.con.get_url(), self.con.get_session(), key, fixids, type)
 
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -728,15 +1055,30 @@ class lxca_api(with_metaclass(Singleton, object)):
             storage = next((item for item in [dict_handler.get  ('t') , dict_handler.get('storage')] if item is not None),None)
             switch = next((item for item in [dict_handler.get  ('w') , dict_handler.get('switch')] if item is not None),None)
             cmm = next((item for item in [dict_handler.get  ('c') , dict_handler.get('cmm')] if item is not None),None)
+            updates = next((item for item in [dict_handler.get('updates')] if item is not None),None)
+
+            if updates:
+                # device uuids or records or CSV/JSON file of them, updated in rolling waves
+                rollout = dict((key, dict_handler[key]) for key in ['component', 'fixid', 'on_error'] if dict_handler.get(key) is not None)
+                for key, convert in [('wave_size', int), ('per_chassis', int), ('max_failures', float)]:
+                    if dict_handler.get(key) is not None:
+                        rollout[key] = convert(dict_handler[key])
+                return lxca_bulk_firmware.rollout_firmware(self.con, updates, mode or 'immediate', **rollout)
+
+            devices = next((item for item in [dict_handler.get('devices')] if item is not None),None)
+            if action == 'power' and (devices or [item for item in [server, switch, storage, cmm] if isinstance(item, list)]):
+                # lists of devices per type or CSV/JSON file of them, sent in few powerState requests
+                if not devices:
+                    devices = dict((device_type, item) for device_type, item in
+                                   [('server', server), ('switch', switch), ('storage', storage), ('cmm', cmm)] if item)
+                state = next((item for item in [dict_handler.get('state')] if item is not None),None)
+                max_jobs = next((item for item in [dict_handler.get('max_jobs')] if item is not None),lxca_bulk.MAX_JOBS)
+                return lxca_bulk_power.bulk_power(self.con, devices, state, int(max_jobs))
                         
         resp = lxca_rest().do_updatecomp(self.con.get_url(),self.con.get_session(),mode,action,server,switch,storage,cmm)
         
         try:
-            if mode == None and action == None and server == None and  switch == None and storage == None and cmm == None :
-                py_obj = json.loads(resp.text)
-            else:
-                py_obj = json.loads(resp._content)
-            return py_obj
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -767,14 +1109,36 @@ class lxca_api(with_metaclass(Singleton, object)):
             py_obj = resp.status_code
         elif job_uuid:
             resp = lxca_rest().get_tasks_list(self.con.get_url(), self.con.get_session(), job_uuid, includeChildren)
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             py_obj = {'TaskList': py_obj[:]}
         else:
             resp = lxca_rest().get_tasks(self.con.get_url(), self.con.get_session())
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
             py_obj = {'TaskList': py_obj[:]}
         return py_obj
 
+    def iter_tasks(self, dict_handler=None):
+        job_uuid = None
+        includeChildren = "false"
+
+        if not self.con:
+            raise ConnectionError("Connection is not Initialized.")
+
+        if dict_handler:
+            job_uuid = next((item for item in [ dict_handler.get('jobUID')] if item is not None), None)
+            includeChildren = next((item for item in [ dict_handler.get('children')] if item is not None), "false")
+            if includeChildren != "false":
+                includeChildren = 'true'
+            if dict_handler.get('action') is not None:
+                raise ValueError("Tasks can not be changed with %s" %ITERATE_KEY)
+
+        url, session = self.con.get_url(), self.con.get_session()
+        if job_uuid:
+            request = lxca_timeout.bind(lambda: lxca_rest().get_tasks_list(url, session, job_uuid, includeChildren, stream=True))
+        else:
+            request = lxca_timeout.bind(lambda: lxca_rest().get_tasks(url, session, stream=True))
+        return lxca_json.iter_request(request)
+
     def get_set_manifests( self, dict_handler = None ):
         sol_id = None
         filepath = None
@@ -789,7 +1153,7 @@ class lxca_api(with_metaclass(Singleton, object)):
         resp = lxca_rest().get_set_manifests(self.con.get_url(),self.con.get_session(),sol_id,filepath)
         
         try:
-            py_obj = json.loads(resp._content)
+            py_obj = lxca_json.decode_response(resp)
             return py_obj
         except AttributeError as ValueError:
             return resp
@@ -858,7 +1222,7 @@ class lxca_api(with_metaclass(Singleton, object)):
         else:
             resp = lxca_rest().set_osimage(osimages_info, url=self.con.get_url(), session=self.con.get_session(), **kwargs)
         try:
-            py_obj = json.loads(resp._content)
+            py_obj = lxca_json.decode_response(resp)
             return py_obj
         except AttributeError as ValueError:
             return resp
@@ -888,7 +1252,7 @@ class lxca_api(with_metaclass(Singleton, object)):
         resp = lxca_rest().get_set_resourcegroups(self.con.get_url(),self.con.get_session(),uuid,name,desc,type,solutionVPD,members,criteria)
         
         try:
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except AttributeError as ValueError:
             return resp
         return py_obj
@@ -919,7 +1283,7 @@ class lxca_api(with_metaclass(Singleton, object)):
             resp = lxca_rest().set_rules(self.con.get_url(), self.con.get_session(), name, targetResourceType, targetGroup, content)
         else:
             resp = lxca_rest().get_rules(self.con.get_url(), self.con.get_session(), id)
-        py_obj = json.loads(resp.text)
+        py_obj = lxca_json.decode_response(resp)
         return py_obj
 
     def get_set_compositeResults(self, dict_handler=None):
@@ -939,5 +1303,5 @@ class lxca_api(with_metaclass(Singleton, object)):
             resp = lxca_rest().set_compositeResults(self.con.get_url(), self.con.get_session(), solutionGroup)
         else:
             resp = lxca_rest().get_compositeResults(self.con.get_url(), self.con.get_session(), id)
-        py_obj = json.loads(resp.text)
+        py_obj = lxca_json.decode_response(resp)
         return py_obj
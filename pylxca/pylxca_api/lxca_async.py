@@ -0,0 +1,19 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides asyncio facade for pylxca API interface. Every command
+of lxca_api.func_dict is available as coroutine, so many LXCA requests can be awaited
+concurrently on one event loop.
+
+Requires python 3.5 or newer, on older python importing this module raises ImportError
+while the rest of pylxca keeps working.
+'''
+
+import sys
+
+if sys.version_info < (3, 5):
+    raise ImportError("lxca_async requires python 3.5 or newer, running %d.%d" %sys.version_info[:2])
+
+from pylxca.pylxca_api._lxca_async import lxca_async_api
@@ -0,0 +1,133 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module resolves lists of UUIDs with as few inventory requests as
+possible. UUIDs are joined with commas into paths like /nodes/uuid1,uuid2, split in
+chunks which keep URLs under MAX_URL_LENGTH, and chunks are fetched concurrently over
+the connection pool.
+'''
+
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.exceptions import HTTPError
+
+from pylxca.pylxca_api import lxca_timeout
+
+logger = logging.getLogger(__name__)
+
+# Conservative limit of request line accepted by LXCA and proxies in front of it
+MAX_URL_LENGTH = 2048
+
+# Room kept for resource path (e.g. /powerSupplies/) and query separators
+PATH_RESERVE = 64
+
+# Chunks fetched at once when connection does not tell its pool size
+MAX_WORKERS = 4
+
+def url_room(base_url, *query_values):
+    '''
+    Returns characters left for comma separated UUIDs in URL of base_url
+    '''
+    room = MAX_URL_LENGTH - len(base_url) - PATH_RESERVE
+    for value in query_values:
+        if value:
+            room -= len(value) + len('&excludeAttributes=')
+    return room
+
+def chunk_uuids(uuids, room):
+    '''
+    Split uuids into comma separated strings of at most room characters, a single
+    UUID longer than room still gets its own chunk
+    '''
+    chunks = []
+    current = []
+    size = 0
+    for uuid in uuids:
+        extra = len(uuid) + (1 if current else 0)
+        if current and size + extra > room:
+            chunks.append(','.join(current))
+            current = []
+            size = 0
+            extra = len(uuid)
+        current.append(uuid)
+        size += extra
+    if current:
+        chunks.append(','.join(current))
+    return chunks
+
+def get_records(py_obj):
+    '''
+    Returns records of response for one or many UUIDs, which LXCA sends as single
+    object, list or list wrapped in object like {'nodeList': [...]}
+    '''
+    if isinstance(py_obj, list):
+        return py_obj
+    if isinstance(py_obj, dict) and len(py_obj) == 1:
+        key, value = list(py_obj.items())[0]
+        if key.endswith('List') and isinstance(value, list):
+            return value
+    return [py_obj]
+
+def _fetch_chunk(fetch, chunk):
+    '''
+    Returns list of responses for chunk. LXCA answers 404 for whole request when one
+    of its UUIDs is unknown, such chunk is split in halves until the unknown UUIDs are
+    requested alone and left out.
+    '''
+    try:
+        return [fetch(chunk)]
+    except HTTPError as e:
+        if getattr(e.response, 'status_code', None) != 404:
+            raise
+    uuids = chunk.split(',')
+    if len(uuids) == 1:
+        logger.debug("UUID %s was not found", chunk)
+        return []
+    half = len(uuids) // 2
+    return _fetch_chunk(fetch, ','.join(uuids[:half])) + _fetch_chunk(fetch, ','.join(uuids[half:]))
+
+def fetch_by_uuid(fetch, uuids, room, max_workers = MAX_WORKERS, key = 'uuid', missing = None):
+    '''
+    Resolve uuids with fetch(comma separated uuids) returning decoded response,
+    records are matched to uuids by their key attribute (e.g. id of jobs).
+
+    @param missing: list extended with UUIDs LXCA did not return or answered 404 for
+
+    @return: OrderedDict uuid -> record in order of uuids, UUIDs LXCA did not
+             return are left out
+    '''
+    uuids = list(OrderedDict.fromkeys(str(uuid).strip() for uuid in uuids if uuid))
+    chunks = chunk_uuids(uuids, room)
+    logger.debug("Fetching %d UUIDs in %d requests", len(uuids), len(chunks))
+
+    def _fetch(chunk):
+        return _fetch_chunk(fetch, chunk)
+
+    workers = min(max_workers or MAX_WORKERS, len(chunks))
+    if workers <= 1:
+        responses = [_fetch(chunk) for chunk in chunks]
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            responses = list(executor.map(lxca_timeout.bind(_fetch), chunks))
+        finally:
+            executor.shutdown(wait=True)
+
+    # LXCA reports UUIDs in upper case, callers may use any
+    found = dict()
+    for py_obj in [py_obj for chunk_responses in responses for py_obj in chunk_responses]:
+        for record in get_records(py_obj):
+            if isinstance(record, dict) and record.get(key) is not None:
+                found[str(record[key]).upper()] = record
+
+    result = OrderedDict((uuid, found[uuid.upper()]) for uuid in uuids if uuid.upper() in found)
+    if len(result) < len(uuids):
+        not_found = [uuid for uuid in uuids if uuid not in result]
+        logger.warning("%d of %d UUIDs were not found: %s", len(not_found), len(uuids), ','.join(not_found))
+        if missing is not None:
+            missing.extend(not_found)
+    return result
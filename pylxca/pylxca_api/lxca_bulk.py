@@ -0,0 +1,255 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module holds what bulk operations of the lxca_bulk_* modules share:
+deadline of a bulk run, per item results with their summary, the job pipeline driven
+from the calling thread, worker threads stopped at end of run, and reading of item
+records and finished job records.
+'''
+
+import csv
+import functools
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from pylxca.pylxca_api.lxca_rest import get_job_location
+from pylxca.pylxca_api.lxca_timeout import remaining
+from pylxca.pylxca_api import lxca_timeout
+from pylxca.pylxca_api import lxca_jobs
+from pylxca.pylxca_api import lxca_json
+
+logger = logging.getLogger(__name__)
+
+# LXCA jobs of a bulk run in flight at once
+MAX_JOBS = 4
+
+# Requests sent at once by worker threads when connection does not tell its pool size
+MAX_WORKERS = 8
+
+# DeviceList entry of each device type in updatableComponents requests
+DEVICE_LISTS = {'server': 'ServerList', 'switch': 'SwitchList', 'storage': 'StorageList', 'cmm': 'CMMList'}
+
+def bulk_command(command):
+    '''
+    Runs decorated bulk function of connection under deadline of command + '_bulk'
+    in its timeout policy, deadline of the single command it was dispatched from
+    does not bound the run
+    '''
+    def decorate(fn):
+        @functools.wraps(fn)
+        def _run(con, *args, **kwargs):
+            policy = getattr(con, 'timeout_policy', None)
+            seconds = policy.get_deadline(command + lxca_timeout.BULK_SUFFIX) if policy else None
+            with lxca_timeout.deadline(seconds, replace=True):
+                return fn(con, *args, **kwargs)
+        return _run
+    return decorate
+
+def get_time_left(timeout = None):
+    '''
+    Returns seconds a bulk run may take, the lesser of timeout and what is left of
+    deadline of the running command, None when neither bounds it. Deadline is kept by
+    thread running the command, so it is taken before work goes to other threads.
+    '''
+    left = remaining()
+    if timeout is not None:
+        left = float(timeout) if left is None else min(left, float(timeout))
+    return left
+
+class bulk_results(object):
+    '''
+    Per item results of one bulk run in the order items were given, each an
+    OrderedDict of fields with status, message and seconds since start of the run.
+
+    Example:
+
+        results = bulk_results(['uuid', 'status', 'message', 'job', 'seconds'])
+        results.add('8C0C...', uuid='8C0C...')
+        results.finish('8C0C...', 'done')
+        return results.report("Bulk power of %d devices" %len(results))
+    '''
+
+    def __init__(self, fields, start = None):
+        self.fields = list(fields)
+        self.start = time.time() if start is None else start
+        self.rows = OrderedDict()
+
+    def add(self, key, **values):
+        row = OrderedDict((field, None) for field in self.fields)
+        row['status'] = 'pending'
+        row.update(values)
+        self.rows[key] = row
+        return row
+
+    def __getitem__(self, key):
+        return self.rows[key]
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def items(self):
+        return list(self.rows.items())
+
+    def values(self):
+        return list(self.rows.values())
+
+    def finish(self, key, status, message = None, **values):
+        row = self.rows[key]
+        row['status'] = status
+        row['message'] = message
+        row.update(values)
+        row['seconds'] = round(time.time() - self.start, 3)
+
+    def finish_pending(self, status, message, pending = ('pending',)):
+        '''
+        Finish items still in one of pending statuses, e.g. at deadline
+        '''
+        for key, row in self.items():
+            if row['status'] in pending:
+                self.finish(key, status, message)
+
+    def get_counts(self):
+        counts = dict()
+        for row in self.values():
+            counts[row['status']] = counts.get(row['status'], 0) + 1
+        return counts
+
+    def elapsed(self):
+        return time.time() - self.start
+
+    def report(self, description):
+        '''
+        Log counts of statuses of the run, returns list of results
+        '''
+        logger.info("%s took %.1f seconds: %s", description, self.elapsed(), self.get_counts())
+        return self.values()
+
+def stop_workers(executor, futures, cancelled):
+    '''
+    Cancel queued work, tell running workers to stop through cancelled and wait for them
+    '''
+    cancelled.set()
+    for future in futures:
+        future.cancel()
+    executor.shutdown(wait=True)
+
+def run_workers(fn, items, max_workers, timeout, cancelled):
+    '''
+    Call fn(item) for each item in up to max_workers threads for at most timeout
+    seconds. Items not started by then are dropped and running ones are told to stop
+    through threading.Event cancelled and waited for, so fn changes no result after
+    this returns.
+    '''
+    executor = ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(items) or 1)))
+    futures = []
+    try:
+        futures = [executor.submit(fn, item) for item in items]
+        wait(futures, timeout=timeout)
+    finally:
+        stop_workers(executor, futures, cancelled)
+
+class job_pipeline(object):
+    '''
+    State of one bulk run, driven from the calling thread. Poller callbacks only
+    queue finished jobs, requests are sent by the calling thread.
+    '''
+
+    def __init__(self, con, max_jobs, batch_size, timeout, fields = ()):
+        self.con = con
+        self.max_jobs = max(1, int(max_jobs))
+        self.batch_size = max(1, int(batch_size))
+        self.url = con.get_url()
+        self.session = con.get_session()
+        self.poller = con.get_job_poller()
+        self.events = queue.Queue()
+        self.discovery_cache = getattr(con, 'discovery_cache', None)
+        self.results = bulk_results(fields)
+        self.watched = []
+        self._set_deadline(timeout)
+
+    def _set_deadline(self, timeout):
+        # a sweep is iterated after command returns, so deadline is taken now
+        self.start = self.results.start = time.time()
+        left = get_time_left(timeout)
+        self.expires = None if left is None else self.start + left
+
+    def _left(self):
+        return None if self.expires is None else max(0, self.expires - time.time())
+
+    def _watch(self, job, kind, *event):
+        '''
+        Watch job with poller of connection, event + (future,) is queued when it is done
+        '''
+        def _done(future):
+            self.events.put(event + (future,))
+        self.watched.append((job, kind))
+        self.poller.watch(job, kind, callback=_done, timeout=self._left())
+
+    def unwatch(self):
+        '''
+        Stop polling jobs of this run which are not done yet, returns their number
+        '''
+        watched, self.watched = self.watched, []
+        return len([job for job, kind in watched if self.poller.unwatch(job, kind)])
+
+def read_records(source):
+    '''
+    Returns list of records of source, which is a list or path of CSV file with
+    header row or of JSON file
+    '''
+    if isinstance(source, (list, tuple)):
+        return source
+    with open(source) as f:
+        if source.lower().endswith('.json'):
+            return json.load(f)
+        return list(csv.DictReader(f))
+
+def get_endpoint_results(record):
+    '''
+    Returns dict uuid/ip (upper case) -> per endpoint entry of finished job record
+    '''
+    results = dict()
+    for value in list(record.values()):
+        if isinstance(value, list):
+            for entry in value:
+                if isinstance(entry, dict):
+                    for key in [entry.get('uuid'), entry.get('UUID')] + list(entry.get('ipAddresses') or []):
+                        if key:
+                            results[str(key).upper()] = entry
+    return results
+
+def is_failed(entry):
+    state = lxca_jobs.get_state(entry)
+    if not hasattr(state, 'lower'):
+        state = entry.get('result')
+    return hasattr(state, 'lower') and ('fail' in state.lower() or 'error' in state.lower())
+
+def get_update_job(resp):
+    '''
+    Returns job of updatableComponents or import request from its location header or body
+    '''
+    job = get_job_location(resp)
+    if job:
+        return job
+    try:
+        py_obj = lxca_json.decode_response(resp)
+    except ValueError:
+        return None
+    if isinstance(py_obj, dict):
+        return next((py_obj.get(key) for key in ['jobUID', 'jobId', 'jobid', 'taskid', 'id'] if py_obj.get(key)), None)
+    return None
@@ -0,0 +1,249 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module sweeps address ranges by discovery. Ranges are split into
+discovery requests of limited size sent at a capped rate, their jobs are polled
+together and each device is yielded once as soon as the job which found it is done.
+'''
+
+import logging
+import re
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest
+from pylxca.pylxca_api.lxca_bulk import job_pipeline, MAX_JOBS
+
+logger = logging.getLogger(__name__)
+
+# Addresses per discoverRequest of a sweep, smaller requests report devices sooner
+SWEEP_BATCH_SIZE = 64
+
+# discoverRequests of a sweep started per second, None for no limit
+SWEEP_RATE = 2.0
+
+# Largest number of addresses one sweep accepts (a /14 network)
+MAX_SWEEP_ADDRESSES = 1 << 18
+
+_IPV4 = re.compile(r'^(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})$')
+
+def _ipv4_to_int(ip):
+    match = _IPV4.match(ip)
+    if not match or any(int(part) > 255 for part in match.groups()):
+        raise ValueError("Invalid IPv4 address %s" %ip)
+    value = 0
+    for part in match.groups():
+        value = value << 8 | int(part)
+    return value
+
+def _int_to_ipv4(value):
+    return '.'.join(str(value >> shift & 255) for shift in (24, 16, 8, 0))
+
+def parse_ranges(ranges):
+    '''
+    Returns list of (first, last) IPv4 addresses as integers, or (address, None) for IPv6
+    addresses, of comma separated string or list of ranges. A range is single address,
+    CIDR network (10.240.0.0/22) or span of addresses (10.240.0.10-10.240.0.99 or
+    10.240.0.10-99). Network and broadcast addresses of CIDR networks are left out.
+    '''
+    if not isinstance(ranges, (list, tuple)):
+        ranges = ranges.split(',')
+    parsed = []
+    total = 0
+    for item in ranges:
+        item = item.strip()
+        if not item:
+            continue
+        if ':' in item:
+            # IPv6 networks are too large to sweep, single addresses are passed as they are
+            if '/' in item:
+                raise ValueError("IPv6 network %s can not be swept" %item)
+            parsed.append((item, None))
+            total += 1
+            continue
+        if '/' in item:
+            ip, prefix = item.split('/', 1)
+            if not prefix.isdigit() or int(prefix) > 32:
+                raise ValueError("Invalid prefix length in %s" %item)
+            prefix = int(prefix)
+            mask = (0xffffffff << (32 - prefix)) & 0xffffffff
+            first = _ipv4_to_int(ip.strip()) & mask
+            last = first | (~mask & 0xffffffff)
+            if prefix < 31:
+                first, last = first + 1, last - 1
+        elif '-' in item:
+            start, end = [part.strip() for part in item.split('-', 1)]
+            first = _ipv4_to_int(start)
+            if '.' in end:
+                last = _ipv4_to_int(end)
+            elif end.isdigit() and int(end) <= 255:
+                last = (first & 0xffffff00) | int(end)
+            else:
+                raise ValueError("Invalid end of range %s" %item)
+            if last < first:
+                raise ValueError("Range %s ends before it starts" %item)
+        else:
+            first = last = _ipv4_to_int(item)
+        parsed.append((first, last))
+        total += last - first + 1
+    if total > MAX_SWEEP_ADDRESSES:
+        raise ValueError("%d addresses are more than %d which one sweep accepts" %(total, MAX_SWEEP_ADDRESSES))
+    return parsed
+
+def expand_addresses(ranges):
+    '''
+    Returns iterator over each address of ranges once, ranges are checked at once
+    and addresses are made while iterating, see parse_ranges
+    '''
+    return _expand(parse_ranges(ranges))
+
+def _expand(parsed):
+    seen = set()
+    for first, last in parsed:
+        if last is None:
+            values = [first]
+        else:
+            values = range(first, last + 1)
+        for value in values:
+            if value not in seen:
+                seen.add(value)
+                yield value if last is None else _int_to_ipv4(value)
+
+def iter_devices(record):
+    '''
+    Yield devices of finished discovery job record, which lists them by type
+    (e.g. serverList, rackswitchList)
+    '''
+    for value in list(record.values()):
+        if isinstance(value, list):
+            for device in value:
+                if isinstance(device, dict):
+                    yield device
+
+def get_devices(record):
+    '''
+    Returns dict ip -> device of finished discovery job record
+    '''
+    devices = dict()
+    for device in iter_devices(record):
+        for ip in device.get('ipAddresses') or []:
+            devices[ip] = device
+    return devices
+
+def post_discovery(url, session, batch):
+    '''
+    Returns job id of discoverRequest of batch of addresses, error message when it failed
+    '''
+    try:
+        job = lxca_rest().do_discovery(url, session, ','.join(batch), None)
+    except Exception as e:
+        return None, "Discovery request failed: %s" %e
+    if not job:
+        return None, "Discovery request was not accepted"
+    return job, None
+
+class _discovery_sweep(job_pipeline):
+    '''
+    Discovery sweep of address ranges, see sweep_discovery
+    '''
+
+    def __init__(self, con, ranges, max_jobs, batch_size, rate, timeout):
+        job_pipeline.__init__(self, con, max_jobs, batch_size, timeout)
+        self.addresses = expand_addresses(ranges)
+        self.interval = 1.0 / float(rate) if rate else 0
+        self.stats = {'addresses': 0, 'requests': 0, 'failed': 0, 'devices': 0}
+
+    def _batches(self):
+        batch = []
+        for address in self.addresses:
+            batch.append(address)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def run(self):
+        batches = self._batches()
+        batch = next(batches, None)
+        in_flight = 0
+        next_start = self.start
+        seen = set()
+        try:
+            while batch is not None or in_flight:
+                while batch is not None and in_flight < self.max_jobs and time.time() >= next_start:
+                    self.stats['addresses'] += len(batch)
+                    self.stats['requests'] += 1
+                    job, message = post_discovery(self.url, self.session, batch)
+                    if job:
+                        self._watch(job, 'discover', batch)
+                        in_flight += 1
+                    else:
+                        logger.error("Discovery of %s-%s: %s", batch[0], batch[-1], message)
+                        self.stats['failed'] += 1
+                    next_start = time.time() + self.interval
+                    batch = next(batches, None)
+
+                left = self._left()
+                if left == 0:
+                    break
+                timeout = left
+                if batch is not None and in_flight < self.max_jobs:
+                    # next request waits only for its rate slot
+                    timeout = max(0, next_start - time.time()) if left is None else max(0, min(left, next_start - time.time()))
+                try:
+                    done, future = self.events.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                in_flight -= 1
+                try:
+                    record = future.result()
+                except Exception as e:
+                    logger.error("Discovery of %s-%s failed: %s", done[0], done[-1], e)
+                    self.stats['failed'] += 1
+                    continue
+                if self.discovery_cache is not None:
+                    self.discovery_cache.store(iter_devices(record))
+                for device in iter_devices(record):
+                    key = device.get('uuid') or tuple(device.get('ipAddresses') or [])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    self.stats['devices'] += 1
+                    yield device
+
+            if batch is not None or in_flight:
+                logger.warning("Discovery sweep stopped at deadline with %d jobs running", in_flight)
+        finally:
+            # sweep closed early or cut by deadline, its jobs are no longer polled
+            left_running = self.unwatch()
+            if left_running:
+                logger.info("Stopped polling %d discovery jobs of sweep", left_running)
+        logger.info("Discovery sweep took %.1f seconds: %s", time.time() - self.start, self.stats)
+
+def sweep_discovery(con, ranges, max_jobs = MAX_JOBS, batch_size = SWEEP_BATCH_SIZE,
+                    rate = SWEEP_RATE, timeout = None):
+    '''
+    Discover devices of address ranges.
+
+    Addresses are split into discoverRequests of batch_size addresses, at most rate
+    requests are started per second and at most max_jobs discovery jobs run at once.
+    Jobs are polled together by the job poller of con. Ranges are checked when this is
+    called, requests are sent while the result is iterated.
+
+    @param ranges: comma separated string or list of addresses, CIDR networks and
+                   address spans, see parse_ranges
+    @return: iterator yielding each discovered device once, as soon as discovery
+             job which found it is done
+
+    Example:
+
+        for device in sweep_discovery(con, '10.240.0.0/22,10.241.5.10-10.241.5.90'):
+            print(device['type'], device['ipAddresses'])
+    '''
+    return _discovery_sweep(con, ranges, max_jobs, batch_size, rate, timeout).run()
@@ -0,0 +1,197 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module collects FFDC of many endpoints at once. Collection starts on
+all endpoints together and each archive is streamed to disk as soon as its job is done.
+'''
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from requests.exceptions import Timeout
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest
+from pylxca.pylxca_api.lxca_timeout import DeadlineExceeded
+from pylxca.pylxca_api.lxca_bulk import bulk_command, job_pipeline, stop_workers, is_failed, MAX_WORKERS
+from pylxca.pylxca_api import lxca_timeout
+
+logger = logging.getLogger(__name__)
+
+# Bytes of FFDC archive read and written at a time, memory use does not grow with archive size
+FFDC_CHUNK_SIZE = 1 << 20
+
+# Attribute of finished FFDC job record naming archive served by /ffdc/fileName/<name>
+FFDC_FILE_KEY = 'fileName'
+
+FFDC_FIELDS = ('uuid', 'status', 'message', 'job', 'file', 'bytes', 'seconds')
+
+def get_ffdc_file_name(record):
+    '''
+    Returns name of FFDC archive of finished collection job record, None when it names
+    none or its name is not a plain file name
+    '''
+    name = record.get(FFDC_FILE_KEY)
+    if not name or not hasattr(name, 'lower'):
+        return None
+    if '/' in name or '\\' in name or name in ('.', '..'):
+        logger.error("FFDC job named invalid archive %s", name)
+        return None
+    return name
+
+def save_response(resp, file_path, chunk_size = FFDC_CHUNK_SIZE, cancelled = None):
+    '''
+    Write body of streamed response to file_path chunk by chunk, returns bytes written.
+    Body goes to a .part file renamed when complete, so file_path never holds part of it.
+    Download stops and .part file is removed when threading.Event cancelled is set.
+    '''
+    part_path = file_path + '.part'
+    size = 0
+    try:
+        with open(part_path, 'wb') as f:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                if cancelled is not None and cancelled.is_set():
+                    raise DeadlineExceeded("Download of %s was cancelled" %file_path)
+                if chunk:
+                    f.write(chunk)
+                    size += len(chunk)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        os.rename(part_path, file_path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    finally:
+        resp.close()
+    return size
+
+class _ffdc_pipeline(job_pipeline):
+    '''
+    Bulk FFDC run, see bulk_ffdc
+    '''
+
+    def __init__(self, con, uuids, directory, max_workers, timeout, chunk_size):
+        job_pipeline.__init__(self, con, 1, 1, timeout, FFDC_FIELDS)
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.workers = max(1, int(max_workers or getattr(con, 'pool_maxsize', None) or MAX_WORKERS))
+        self.futures = []
+        self.cancelled = threading.Event()
+        for uuid in uuids:
+            uuid = str(uuid).strip()
+            if uuid and uuid not in self.results:
+                self.results.add(uuid, uuid=uuid)
+
+    def _submit(self, executor, stage, uuid, fn, *args):
+        '''
+        Run fn in executor under what is left of deadline, its future is queued when done
+        '''
+        def _run():
+            left = self._left()
+            if left is not None and left <= 0:
+                raise DeadlineExceeded("Deadline exceeded for command ffdc")
+            with lxca_timeout.deadline(left):
+                return fn(*args)
+
+        def _done(future):
+            self.events.put((stage, uuid, future))
+        future = executor.submit(_run)
+        self.futures.append(future)
+        future.add_done_callback(_done)
+
+    def download(self, file_name):
+        file_path = os.path.join(self.directory, file_name)
+        resp = lxca_rest().get_ffdc_file(self.url, self.session, file_name)
+        return file_path, save_response(resp, file_path, self.chunk_size, self.cancelled)
+
+    def downloaded(self, uuid, value):
+        file_path, size = value
+        self.results.finish(uuid, 'downloaded', file=file_path, bytes=size)
+
+    def run(self):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        in_flight = 0
+        try:
+            # every endpoint starts collection at once, archives are fetched as their jobs finish
+            for uuid in self.results:
+                self._submit(executor, 'start', uuid, lxca_rest().get_ffdc, self.url, self.session, uuid)
+                in_flight += 1
+            while in_flight:
+                try:
+                    stage, uuid, future = self.events.get(timeout=self._left())
+                except queue.Empty:
+                    break
+                in_flight -= 1
+                try:
+                    value = future.result()
+                except (DeadlineExceeded, Timeout) as e:
+                    self.results.finish(uuid, 'timeout', "FFDC %s timed out: %s" %(stage, e))
+                    continue
+                except Exception as e:
+                    self.results.finish(uuid, 'failed', "FFDC %s failed: %s" %(stage, e))
+                    continue
+                if stage == 'start':
+                    if not hasattr(value, 'lower'):
+                        self.results.finish(uuid, 'failed', "FFDC request returned no job")
+                        continue
+                    self.results[uuid]['job'] = value
+                    self._watch(value, 'jobs', 'ffdc', uuid)
+                    in_flight += 1
+                elif stage == 'ffdc':
+                    file_name = get_ffdc_file_name(value)
+                    if is_failed(value) or not file_name:
+                        self.results.finish(uuid, 'failed', value.get('message') or "FFDC job gave no %s" %FFDC_FILE_KEY)
+                        continue
+                    self.results[uuid]['status'] = 'downloading'
+                    self._submit(executor, 'download', uuid, self.download, file_name)
+                    in_flight += 1
+                else:
+                    self.downloaded(uuid, value)
+        finally:
+            # downloads still running stop at next chunk and remove their .part files
+            stop_workers(executor, self.futures, self.cancelled)
+
+        # downloads which completed while workers were stopped
+        while True:
+            try:
+                stage, uuid, future = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if stage == 'download' and not future.cancelled() and future.exception() is None:
+                self.downloaded(uuid, future.result())
+
+        self.results.finish_pending('timeout', "FFDC was not downloaded before deadline", ('pending', 'downloading'))
+        return self.results.report("Bulk FFDC of %d endpoints" %len(self.results))
+
+@bulk_command('ffdc')
+def bulk_ffdc(con, uuids, directory = '.', max_workers = None, timeout = None, chunk_size = FFDC_CHUNK_SIZE):
+    '''
+    Collect FFDC of many endpoints and download their archives into directory.
+    Collection is started on all endpoints at once, their jobs are waited on together
+    by the job poller of con and each archive is streamed to disk in chunks of
+    chunk_size bytes as soon as its job is done. Requests of up to max_workers
+    endpoints (default pool size of con) run at once. A download cut by timeout
+    removes its partial archive, so directory holds only complete ones.
+
+    @param uuids: list or comma separated string of endpoint UUIDs
+    @return: list of per endpoint results with keys uuid, status (downloaded, failed
+             or timeout), message, job, file, bytes and seconds since start of the run
+
+    Example:
+
+        for result in bulk_ffdc(con, rack_uuids, '/var/tmp/ffdc', timeout=3600):
+            print(result['uuid'], result['status'], result['file'])
+    '''
+    if not isinstance(uuids, (list, tuple)):
+        uuids = str(uuids).split(',')
+    return _ffdc_pipeline(con, uuids, directory, max_workers, timeout, chunk_size).run()
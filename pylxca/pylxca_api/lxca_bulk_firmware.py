@@ -0,0 +1,282 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module rolls firmware of a fleet out in waves which update few devices
+of each chassis at a time. Failures are counted after each wave and stop the rollout
+when they exceed a threshold, before the next wave starts.
+'''
+
+import logging
+from collections import OrderedDict
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest
+from pylxca.pylxca_api.lxca_bulk import bulk_command, job_pipeline, read_records, get_endpoint_results, \
+    is_failed, get_update_job, DEVICE_LISTS
+from pylxca.pylxca_api import lxca_json
+from pylxca.pylxca_api import lxca_batch
+
+logger = logging.getLogger(__name__)
+
+# Devices updated by one firmware wave, at most PER_CHASSIS of them in one chassis
+WAVE_SIZE = 100
+PER_CHASSIS = 1
+
+# Devices per updatableComponents request
+UPDATE_BATCH_SIZE = 50
+
+# Failed devices (count, or fraction of devices done when below 1) which stop a rollout
+MAX_FAILURES = 0.05
+
+ROLLOUT_FIELDS = ('uuid', 'type', 'chassis', 'status', 'message', 'wave', 'job', 'seconds')
+
+def read_updates(source, component = None, fixid = None):
+    '''
+    Returns list of firmware updates, dicts with keys uuid, type (server, switch,
+    storage or cmm), components (list of Component / Fixid dicts) and chassis.
+
+    @param source: list, or path of CSV/JSON file, of dicts with keys uuid, type
+                   (default server), component, fixid and chassis, or of strings
+                   'uuid,fixid,component' / 'uuid,component' / 'uuid' like the server
+                   option of updatecomp command
+    @param component, fixid: defaults for updates which do not name their own
+    '''
+    updates = []
+    for record in read_records(source):
+        if not isinstance(record, dict):
+            data = [item.strip() for item in str(record).split(',')]
+            record = dict(zip(['uuid', 'fixid', 'component'] if len(data) == 3 else ['uuid', 'component'], data))
+        record = dict((key.strip(), value) for key, value in list(record.items()) if key and value not in (None, ''))
+        device_type = str(record.get('type', 'server')).lower()
+        if device_type not in DEVICE_LISTS:
+            raise ValueError("Invalid device type %s, expected one of %s" %(device_type, sorted(DEVICE_LISTS.keys())))
+        components = record.get('components')
+        if not components:
+            name = record.get('component', component)
+            if not name:
+                raise ValueError("Update of %s needs component" %record.get('uuid'))
+            entry = {"Component": name}
+            if record.get('fixid', fixid):
+                entry = {"Fixid": record.get('fixid', fixid), "Component": name}
+            components = [entry]
+        if not record.get('uuid'):
+            raise ValueError("Update needs uuid of device")
+        updates.append({'uuid': str(record['uuid']).strip(), 'type': device_type,
+                        'components': components, 'chassis': record.get('chassis')})
+    return updates
+
+def get_chassis_map(con):
+    '''
+    Returns dict uuid of node or switch -> uuid of chassis holding it
+    '''
+    resp = lxca_rest().get_chassis(con.get_url(), con.get_session(), None, None,
+                                   includeAttributes='uuid,nodes,switches')
+    chassis_map = dict()
+    for chassis in lxca_batch.get_records(lxca_json.load_response(resp)):
+        for member in (chassis.get('nodes') or []) + (chassis.get('switches') or []):
+            if isinstance(member, dict) and member.get('uuid'):
+                chassis_map[str(member['uuid']).upper()] = chassis.get('uuid')
+    return chassis_map
+
+class lxca_firmware_rollout(job_pipeline):
+    '''
+    Rolls firmware of many devices out in waves.
+
+    Each wave takes up to wave_size pending devices, at most per_chassis of them
+    from one chassis, and applies their updates with updatableComponents requests of
+    batch_size devices. Update jobs are tracked through tasks (or jobs) API by the job
+    poller of the connection and next wave starts when all jobs of a wave are done.
+    When failed devices exceed max_failures the rollout stops before next wave:
+    on_error 'pause' leaves remaining devices pending for resume(), 'abort' ends it.
+
+    Example:
+
+        rollout = lxca_firmware_rollout(con, 'fleet_updates.csv', wave_size=200, per_chassis=2)
+        results = rollout.run()
+        if rollout.state == 'paused':
+            # look at failed devices, then
+            results = rollout.resume()
+    '''
+
+    def __init__(self, con, updates, mode = 'immediate', wave_size = WAVE_SIZE, per_chassis = PER_CHASSIS,
+                 batch_size = UPDATE_BATCH_SIZE, max_failures = MAX_FAILURES, on_error = 'pause',
+                 job_kind = 'tasks', timeout = None, component = None, fixid = None):
+        job_pipeline.__init__(self, con, 1, batch_size, timeout, ROLLOUT_FIELDS)
+        if on_error not in ('pause', 'abort'):
+            raise ValueError("on_error must be pause or abort")
+        self.mode = mode
+        self.wave_size = max(1, int(wave_size))
+        self.per_chassis = max(1, int(per_chassis))
+        self.max_failures = float(max_failures)
+        self.on_error = on_error
+        self.job_kind = job_kind
+        self.timeout = timeout
+        self.wave = 0
+        # pending, running, paused, aborted, timeout or done
+        self.state = 'pending'
+        # failed and finished devices before last resume, not counted against max_failures
+        self.failed_before = 0
+        self.done_before = 0
+
+        self.updates = OrderedDict()
+        for update in read_updates(updates, component, fixid):
+            self.updates.setdefault(update['uuid'], update)
+        if any(update['chassis'] is None for update in list(self.updates.values())):
+            chassis_map = get_chassis_map(con)
+            for update in list(self.updates.values()):
+                if update['chassis'] is None:
+                    update['chassis'] = chassis_map.get(update['uuid'].upper())
+        for uuid, update in list(self.updates.items()):
+            self.results.add(uuid, uuid=uuid, type=update['type'], chassis=update['chassis'])
+
+    def get_counts(self):
+        return self.results.get_counts()
+
+    def is_over_threshold(self):
+        counts = self.get_counts()
+        failed = counts.get('failed', 0) - self.failed_before
+        if self.max_failures >= 1:
+            return failed >= self.max_failures
+        done = counts.get('failed', 0) + counts.get('updated', 0) - self.done_before
+        return done > 0 and failed > self.max_failures * done
+
+    def next_wave(self):
+        '''
+        Returns uuids of next wave, devices without chassis are not limited by per_chassis
+        '''
+        wave = []
+        per_chassis = dict()
+        for uuid, result in self.results.items():
+            if result['status'] != 'pending':
+                continue
+            chassis = result['chassis']
+            if chassis is not None:
+                if per_chassis.get(chassis, 0) >= self.per_chassis:
+                    continue
+                per_chassis[chassis] = per_chassis.get(chassis, 0) + 1
+            wave.append(uuid)
+            if len(wave) == self.wave_size:
+                break
+        return wave
+
+    def post_updates(self, batch):
+        device_lists = dict()
+        for uuid in batch:
+            update = self.updates[uuid]
+            device_lists.setdefault(DEVICE_LISTS[update['type']], []).append(
+                {"UUID": uuid, "Components": update['components']})
+        try:
+            resp = lxca_rest().put_updatable_components(self.url, self.session, 'apply', self.mode, device_lists)
+        except Exception as e:
+            for uuid in batch:
+                self.results.finish(uuid, 'failed', "Update request failed: %s" %e)
+            return False
+        job = get_update_job(resp)
+        if not job:
+            # LXCA took the request but gave no job to follow
+            for uuid in batch:
+                self.results.finish(uuid, 'untracked', "Update request returned no job")
+            return False
+        for uuid in batch:
+            self.results[uuid]['job'] = job
+        self._watch(job, self.job_kind, batch)
+        return True
+
+    def updated(self, batch, future):
+        try:
+            record = future.result()
+        except Exception as e:
+            for uuid in batch:
+                self.results.finish(uuid, 'failed', "Update job failed: %s" %e)
+            return
+        entries = get_endpoint_results(record)
+        for uuid in batch:
+            entry = entries.get(uuid.upper(), record)
+            if is_failed(entry):
+                self.results.finish(uuid, 'failed', entry.get('message') or "Update job failed")
+            else:
+                self.results.finish(uuid, 'updated', entry.get('message') if entry is not record else None)
+
+    def run_wave(self, wave):
+        '''
+        Apply updates of wave and wait for their jobs, returns False at deadline
+        '''
+        self.wave += 1
+        logger.info("Firmware wave %d updates %d devices", self.wave, len(wave))
+        in_flight = 0
+        for uuid in wave:
+            self.results[uuid].update(status='running', wave=self.wave)
+        for i in range(0, len(wave), self.batch_size):
+            in_flight += self.post_updates(wave[i:i + self.batch_size])
+        while in_flight:
+            try:
+                batch, future = self.events.get(timeout=self._left())
+            except queue.Empty:
+                self.results.finish_pending('timeout', "Update was not done before deadline", ('running',))
+                return False
+            in_flight -= 1
+            self.updated(batch, future)
+        return True
+
+    def run(self):
+        '''
+        Run waves until all devices are done or rollout is paused, aborted or times out,
+        returns list of per device results with keys uuid, type, chassis, status
+        (updated, failed, untracked, pending, aborted or timeout), message, wave, job
+        and seconds since start of the run
+        '''
+        self._set_deadline(self.timeout)
+        self.state = 'running'
+        while True:
+            if self.is_over_threshold():
+                self.state = 'paused' if self.on_error == 'pause' else 'aborted'
+                logger.warning("Firmware rollout %s after wave %d: %s", self.state, self.wave, self.get_counts())
+                break
+            wave = self.next_wave()
+            if not wave:
+                self.state = 'done'
+                break
+            if not self.run_wave(wave):
+                self.state = 'timeout'
+                break
+        if self.state in ('aborted', 'timeout'):
+            self.results.finish_pending(self.state, "Firmware rollout %s" %self.state)
+        return self.results.report("Firmware rollout %s after %d waves" %(self.state, self.wave))
+
+    def resume(self, max_failures = None):
+        '''
+        Continue paused rollout, only failures after resume count against max_failures
+        '''
+        if self.state != 'paused':
+            raise ValueError("Firmware rollout is %s, only paused rollout can be resumed" %self.state)
+        if max_failures is not None:
+            self.max_failures = float(max_failures)
+        counts = self.get_counts()
+        self.failed_before = counts.get('failed', 0)
+        self.done_before = counts.get('failed', 0) + counts.get('updated', 0)
+        return self.run()
+
+    def abort(self):
+        '''
+        End paused rollout, its pending devices are reported aborted
+        '''
+        self.results.finish_pending('aborted', "Firmware rollout aborted")
+        self.state = 'aborted'
+        return self.results.values()
+
+@bulk_command('updatecomp')
+def rollout_firmware(con, updates, mode = 'immediate', **kwargs):
+    '''
+    Run firmware rollout of updates, see lxca_firmware_rollout for keyword arguments.
+    Returns list of per device results. Rollout is aborted when failures exceed
+    max_failures, paused rollout can be resumed only on lxca_firmware_rollout object.
+    '''
+    on_error = kwargs.setdefault('on_error', 'abort')
+    if on_error != 'abort':
+        raise ValueError("on_error must be abort, use lxca_firmware_rollout to pause and resume rollout")
+    return lxca_firmware_rollout(con, updates, mode, **kwargs).run()
@@ -0,0 +1,199 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module imports management-server updates one package per request.
+Packages LXCA already has are skipped and only a package whose upload broke is sent
+again, to the import job created for it.
+'''
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from requests.exceptions import HTTPError, Timeout
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest, IMPORT_FILE_TYPES
+from pylxca.pylxca_api.lxca_timeout import DeadlineExceeded
+from pylxca.pylxca_api.lxca_bulk import bulk_command, bulk_results, run_workers, get_time_left, get_update_job
+from pylxca.pylxca_api import lxca_timeout
+from pylxca.pylxca_api import lxca_json
+
+logger = logging.getLogger(__name__)
+
+# Update packages uploaded at once, times upload of a package is tried again and
+# seconds waited before first retry (doubled for each next one)
+IMPORT_WORKERS = 1
+IMPORT_RETRIES = 2
+IMPORT_BACKOFF = 5.0
+
+# Lists of management-server updates and attribute of their entries naming imported file
+IMPORTED_LIST_KEYS = ('updateList', 'updates')
+IMPORTED_FILE_KEY = 'fileName'
+
+IMPORT_FIELDS = ('name', 'files', 'status', 'message', 'job', 'bytes', 'attempts', 'seconds', 'mbps')
+
+def get_import_packages(files):
+    '''
+    Returns OrderedDict package name -> paths of its files, files of an update package
+    share their name and differ in extension (e.g. .xml, .chg, .tgz and .txt)
+
+    @param files: list or comma separated string of file paths
+    '''
+    if not isinstance(files, (list, tuple)):
+        files = str(files).split(',')
+    packages = OrderedDict()
+    for file in files:
+        file = str(file).strip()
+        if not file:
+            continue
+        name, ext = os.path.splitext(os.path.basename(file))
+        if ext not in IMPORT_FILE_TYPES:
+            raise ValueError("Invalid file type %s of %s, expected one of %s" %(ext, file, sorted(IMPORT_FILE_TYPES.keys())))
+        if not os.path.isfile(file):
+            raise ValueError("File %s does not exist" %file)
+        paths = packages.setdefault(name, [])
+        if file not in paths:
+            paths.append(file)
+    return packages
+
+def get_imported_names(con):
+    '''
+    Returns set of file names in management-server updates LXCA already has, empty
+    set when they can not be read
+    '''
+    try:
+        resp = lxca_rest().get_managementserver(con.get_url(), con.get_session(), 'updates', None, None)
+        py_obj = lxca_json.decode_response(resp)
+    except Exception as e:
+        logger.warning("Imported updates could not be read, all files are uploaded: %s", e)
+        return set()
+    if not isinstance(py_obj, dict):
+        return set()
+    entries = next((py_obj.get(key) for key in IMPORTED_LIST_KEYS if isinstance(py_obj.get(key), list)), [])
+    # only file name of an entry counts, a file is skipped when its name matches exactly
+    return set(entry.get(IMPORTED_FILE_KEY) for entry in entries
+               if isinstance(entry, dict) and hasattr(entry.get(IMPORTED_FILE_KEY), 'lower'))
+
+def _is_transient(e):
+    '''
+    True for errors after which sending the package again may succeed
+    '''
+    if isinstance(e, HTTPError):
+        return e.response is None or e.response.status_code >= 500
+    return isinstance(e, (RequestsConnectionError, Timeout))
+
+def _upload_package(url, session, name, files, retries, expires, cancelled):
+    '''
+    Create import job of files and upload them, trying again on broken connection,
+    timeout or server error. Upload is sent again to the same job, job is created again
+    only when its creation failed. Returns (status, message, job, attempts, upload MB
+    per second).
+    '''
+    progress = {'next': 0.1, 'started': None, 'mbps': None}
+
+    def _progress(monitor):
+        if cancelled.is_set():
+            # run ended, request is aborted instead of sending rest of the files
+            raise DeadlineExceeded("Import of %s was cancelled" %name)
+        now = time.time()
+        if progress['started'] is None:
+            progress['started'] = now
+        elapsed = now - progress['started']
+        if elapsed > 0:
+            progress['mbps'] = monitor.bytes_read / elapsed / 1e6
+        # monitor calls back for every block read, log only at each tenth
+        if monitor.len and monitor.bytes_read >= progress['next'] * monitor.len:
+            logger.debug("Import of %s: %d of %d bytes (%.2f MB/s)", name, monitor.bytes_read, monitor.len,
+                         progress['mbps'] or 0)
+            progress['next'] += 0.1
+
+    message = None
+    job = None
+    for attempt in range(retries + 1):
+        if attempt:
+            wait_seconds = IMPORT_BACKOFF * (2 ** (attempt - 1))
+            if expires is not None and time.time() + wait_seconds >= expires:
+                return 'timeout', message, job, attempt, None
+            logger.info("Retrying import of %s in %.0f seconds: %s", name, wait_seconds, message)
+            if cancelled.wait(wait_seconds):
+                return 'timeout', message, job, attempt, None
+        left = None if expires is None else expires - time.time()
+        if cancelled.is_set() or (left is not None and left <= 0):
+            return 'timeout', message or "Import was not done before deadline", job, attempt, None
+        progress.update(next=0.1, started=None, mbps=None)
+        try:
+            with lxca_timeout.deadline(left):
+                if not job:
+                    resp = lxca_rest().set_managementserver(url, session, 'import', ','.join(files), None, None)
+                    resp.raise_for_status()
+                    job = get_update_job(resp)
+                    if not job:
+                        return 'failed', "Import request returned no job", None, attempt + 1, None
+                lxca_rest().upload_managementserver_files(url, session, job, files, _progress)
+        except DeadlineExceeded as e:
+            return 'timeout', "Import of %s timed out: %s" %(name, e), job, attempt + 1, None
+        except Exception as e:
+            message = "Import of %s failed: %s" %(name, e)
+            if not _is_transient(e):
+                # LXCA refused the package or it can not be read, sending it again does not help
+                return 'failed', message, job, attempt + 1, None
+            continue
+        return 'imported', None, job, attempt + 1, progress['mbps']
+    return 'failed', message, job, retries + 1, None
+
+@bulk_command('managementserver')
+def bulk_import_updates(con, files, max_workers = IMPORT_WORKERS, retries = IMPORT_RETRIES,
+                        skip_existing = True, timeout = None):
+    '''
+    Import management-server update files, one import job and streamed upload per
+    package so a broken connection sends only that package again (up to retries times).
+    Packages of up to max_workers run at once. Files LXCA already lists in its updates
+    are not sent, a package whose files are all there is skipped, so an interrupted
+    import resumes by running it again. Files are closed as each upload ends. Uploads
+    still running after timeout seconds, or at deadline of the command, are stopped
+    and their packages end as timeout along with packages never started.
+
+    @param files: list or comma separated string of file paths, see get_import_packages
+    @return: list of per package results with keys name, files, status (imported,
+             skipped, failed or timeout), message, job, bytes, attempts, seconds since
+             start of the run and mbps (upload throughput in MB per second)
+
+    Example:
+
+        results = bulk_import_updates(con, glob.glob('/srv/lxca_updates/*'), max_workers=2)
+    '''
+    packages = get_import_packages(files)
+    url = con.get_url()
+    session = con.get_session()
+    results = bulk_results(IMPORT_FIELDS)
+    left = get_time_left(timeout)
+    expires = None if left is None else results.start + left
+    cancelled = threading.Event()
+
+    imported = get_imported_names(con) if skip_existing else set()
+    uploads = OrderedDict()
+    for name, paths in list(packages.items()):
+        pending = [path for path in paths if os.path.basename(path) not in imported]
+        results.add(name, name=name, files=[os.path.basename(path) for path in paths],
+                    bytes=sum(os.path.getsize(path) for path in pending), attempts=0)
+        if pending:
+            uploads[name] = pending
+        else:
+            results.finish(name, 'skipped', "Already imported")
+
+    def _import(name):
+        status, message, job, attempts, mbps = _upload_package(url, session, name, uploads[name],
+                                                               max(0, int(retries)), expires, cancelled)
+        results.finish(name, status, message, job=job, attempts=attempts, mbps=mbps and round(mbps, 2))
+
+    # uploads still running are aborted by their progress callback
+    run_workers(_import, list(uploads), max_workers or IMPORT_WORKERS, left, cancelled)
+    results.finish_pending('timeout', "Import was not done before deadline")
+    sent = sum(result['bytes'] for result in results.values() if result['status'] == 'imported')
+    return results.report("Import of %d update packages sent %d bytes (%.2f MB/s)"
+                          %(len(results), sent, sent / max(results.elapsed(), 0.001) / 1e6))
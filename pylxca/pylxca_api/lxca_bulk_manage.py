@@ -0,0 +1,371 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module onboards and offboards many endpoints at once. Endpoints are
+discovered in batches and every batch is managed as soon as its discovery job is done,
+so discovery of later batches overlaps with management of earlier ones. Endpoints are
+unmanaged in chunks of which only failed ones are retried. Number of LXCA jobs in
+flight is capped and every endpoint gets its own result with timings.
+'''
+
+import logging
+import time
+from collections import deque
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest, manage_params, unmanage_entry
+from pylxca.pylxca_api.lxca_bulk import bulk_command, job_pipeline, read_records, get_endpoint_results, is_failed, MAX_JOBS
+from pylxca.pylxca_api.lxca_bulk_discovery import iter_devices, get_devices, post_discovery
+
+logger = logging.getLogger(__name__)
+
+# Endpoints per discoverRequest / manageRequest
+BATCH_SIZE = 50
+
+# Short keys of endpoint records, same as options of manage command
+ENDPOINT_KEYS = {'i': 'ip', 'u': 'user', 'p': 'pw', 'r': 'rpw', 'f': 'force'}
+
+# Endpoints per unmanageRequest and times endpoints of failed request are tried again
+UNMANAGE_BATCH_SIZE = 25
+UNMANAGE_RETRIES = 2
+
+MANAGE_FIELDS = ('ip', 'status', 'uuid', 'type', 'message', 'discovery', 'discover_job', 'manage_job',
+                 'discover_seconds', 'manage_seconds', 'seconds')
+
+UNMANAGE_FIELDS = ('uuid', 'ip', 'type', 'status', 'message', 'job', 'attempts', 'seconds')
+
+def read_endpoints(source, user = None, pw = None, rpw = None):
+    '''
+    Returns list of endpoint dicts with keys ip, user, pw and optional rpw, force.
+
+    @param source: list of such dicts, or path of CSV file with header row
+                   (e.g. ip,user,pw,rpw) or of JSON file holding the list
+    @param user, pw, rpw: defaults for endpoints which do not set their own
+    '''
+    endpoints = []
+    for record in read_records(source):
+        endpoint = {'user': user, 'pw': pw, 'rpw': rpw}
+        for key, value in list(record.items()):
+            if key is None or value is None or value == '':
+                continue
+            key = key.strip()
+            endpoint[ENDPOINT_KEYS.get(key, key)] = value.strip() if hasattr(value, 'strip') else value
+        if not (endpoint.get('ip') and endpoint.get('user') and endpoint.get('pw')):
+            raise ValueError("Endpoint %s needs ip, user and pw" %endpoint.get('ip'))
+        endpoints.append(endpoint)
+    return endpoints
+
+def read_unmanage_endpoints(source):
+    '''
+    Returns list of unmanageRequest entries of endpoints to unmanage.
+
+    @param source: list, or path of CSV/JSON file, of dicts with keys ip (list or '#'
+                   separated string of addresses), uuid and type (Chassis, Rackswitch,
+                   ThinkServer, Storage or Rack-Tower), or of strings 'ip;uuid;type'
+                   like the ip option of unmanage command
+    '''
+    entries = []
+    for record in read_records(source):
+        if not isinstance(record, dict):
+            record = dict(zip(['ip', 'uuid', 'type'], str(record).split(';')))
+        record = dict((key.strip(), value) for key, value in list(record.items()) if key)
+        ip = next((item for item in [record.get('i'), record.get('ip'), record.get('ipAddresses')] if item), None)
+        if not ip or not record.get('uuid') or not record.get('type'):
+            raise ValueError("Endpoint %s needs ip, uuid and type" %(ip or record.get('uuid')))
+        if not isinstance(ip, list):
+            ip = str(ip).strip().split('#')
+        entries.append(unmanage_entry(ip, str(record['uuid']).strip(), str(record['type']).strip()))
+    return entries
+
+class _manage_pipeline(job_pipeline):
+    '''
+    Bulk manage run, see bulk_manage
+    '''
+
+    def __init__(self, con, endpoints, force, max_jobs, batch_size, timeout, refresh_discovery = False):
+        job_pipeline.__init__(self, con, max_jobs, batch_size, timeout, MANAGE_FIELDS)
+        self.force = force
+        self.refresh_discovery = refresh_discovery
+
+        # duplicates of an IP address are managed once
+        self.endpoints = dict()
+        for endpoint in endpoints:
+            if endpoint['ip'] not in self.endpoints:
+                self.endpoints[endpoint['ip']] = endpoint
+                self.results.add(endpoint['ip'], ip=endpoint['ip'])
+
+    def start_discovery(self, batch):
+        started = time.time()
+        job, message = post_discovery(self.url, self.session, batch)
+        if not job:
+            for ip in batch:
+                self.results.finish(ip, 'failed', message)
+            return False
+        for ip in batch:
+            self.results[ip].update(discover_job=job, discovery='job')
+        self._watch(job, 'discover', 'discover', batch, started)
+        return True
+
+    def get_cached(self, ips):
+        '''
+        Returns list of (ip, device) of ips found in discovery cache
+        '''
+        if self.discovery_cache is None or self.refresh_discovery:
+            return []
+        cached = []
+        for ip in ips:
+            device = self.discovery_cache.get(ip)
+            if device is not None:
+                self.results[ip].update(uuid=device.get('uuid'), type=device.get('type'), discovery='cache')
+                cached.append((ip, device))
+        return cached
+
+    def discovered(self, batch, started, future):
+        '''
+        Returns list of (ip, device) of batch ready to be managed
+        '''
+        seconds = round(time.time() - started, 3)
+        try:
+            record = future.result()
+        except Exception as e:
+            for ip in batch:
+                self.results.finish(ip, 'failed', "Discovery failed: %s" %e)
+            return []
+        if self.discovery_cache is not None:
+            self.discovery_cache.store(iter_devices(record))
+        devices = get_devices(record)
+        ready = []
+        for ip in batch:
+            self.results[ip]['discover_seconds'] = seconds
+            device = devices.get(ip)
+            if device is None:
+                self.results.finish(ip, 'not_discovered', "Failed to discover given endpoint %s" %ip)
+                continue
+            self.results[ip].update(uuid=device.get('uuid'), type=device.get('type'))
+            ready.append((ip, device))
+        return ready
+
+    def start_manage(self, batch):
+        started = time.time()
+        payload = []
+        for ip, device in batch:
+            endpoint = self.endpoints[ip]
+            force = endpoint.get('force', self.force)
+            payload.append(manage_params(device, ip, endpoint['user'], endpoint['pw'], endpoint.get('rpw'), force))
+        ips = [ip for ip, _ in batch]
+        try:
+            job = lxca_rest().post_manage_request(self.url, self.session, payload)
+        except Exception as e:
+            job = None
+            message = "Manage request failed: %s" %e
+        else:
+            message = "Manage request was not accepted"
+        if not job:
+            for ip in ips:
+                self.results.finish(ip, 'failed', message)
+            return False
+        for ip in ips:
+            self.results[ip]['manage_job'] = job
+        self._watch(job, 'manage', 'manage', batch, started)
+        return True
+
+    def managed(self, batch, started, future):
+        seconds = round(time.time() - started, 3)
+        try:
+            record = future.result()
+        except Exception as e:
+            for ip, _ in batch:
+                self.results.finish(ip, 'failed', "Manage job failed: %s" %e)
+            return
+        entries = get_endpoint_results(record)
+        for ip, device in batch:
+            entry = entries.get(str(device.get('uuid')).upper()) or entries.get(ip.upper()) or record
+            if is_failed(entry):
+                self.results.finish(ip, 'failed', entry.get('message') or "Manage job failed",
+                                    manage_seconds=seconds)
+            else:
+                self.results.finish(ip, 'managed', entry.get('message') if entry is not record else None,
+                                    manage_seconds=seconds)
+
+    def run(self):
+        # endpoints discovered moments ago go straight to manage
+        cached = self.get_cached(list(self.results))
+        skipped = set(ip for ip, _ in cached)
+        ips = [ip for ip in self.results if ip not in skipped]
+        waiting = deque(ips[i:i + self.batch_size] for i in range(0, len(ips), self.batch_size))
+        ready = deque(cached[i:i + self.batch_size] for i in range(0, len(cached), self.batch_size))
+        if cached:
+            logger.debug("Discovery of %d endpoints taken from cache", len(cached))
+        in_flight = 0
+        while waiting or ready or in_flight:
+            while in_flight < self.max_jobs and (waiting or ready):
+                # managing discovered endpoints first finishes them sooner
+                if ready:
+                    in_flight += self.start_manage(ready.popleft())
+                else:
+                    in_flight += self.start_discovery(waiting.popleft())
+            if not in_flight:
+                continue
+            try:
+                stage, batch, started, future = self.events.get(timeout=self._left())
+            except queue.Empty:
+                break
+            in_flight -= 1
+            if stage == 'discover':
+                devices = self.discovered(batch, started, future)
+                if devices:
+                    ready.append(devices)
+            else:
+                self.managed(batch, started, future)
+
+        self.results.finish_pending('timeout', "Endpoint was not managed before deadline")
+        return self.results.report("Bulk manage of %d endpoints" %len(self.results))
+
+@bulk_command('manage')
+def bulk_manage(con, endpoints, force = None, max_jobs = MAX_JOBS, batch_size = BATCH_SIZE,
+                timeout = None, user = None, pw = None, rpw = None, refresh_discovery = False):
+    '''
+    Discover and manage many endpoints, each with its own credentials.
+
+    Endpoints are discovered batch_size at a time, a batch is managed as soon as its
+    discovery finishes while later batches are still being discovered. At most
+    max_jobs discovery and manage jobs run at once. Endpoints found in discovery
+    cache of con are managed without discovering them again unless refresh_discovery
+    is set. Endpoints whose manage job is not done within timeout seconds (or by the
+    deadline the command runs under) are reported as timeout; LXCA may still finish
+    managing them.
+
+    @param endpoints: list of endpoint dicts or path of CSV/JSON file, see read_endpoints
+    @return: list of per endpoint results with keys ip, status (managed, failed,
+             not_discovered or timeout), uuid, type, message, discovery (cache or job),
+             discover_job, manage_job, discover_seconds, manage_seconds and seconds
+             since start of the run
+
+    Example:
+
+        results = bulk_manage(con, [{'ip': '10.240.1.5', 'user': 'USERID', 'pw': 'Passw0rd'},
+                                    {'ip': '10.240.1.6', 'user': 'ADMIN', 'pw': 'Secret1'}])
+        results = bulk_manage(con, 'datacenter2.csv', max_jobs=8)
+    '''
+    endpoints = read_endpoints(endpoints, user, pw, rpw)
+    return _manage_pipeline(con, endpoints, force, max_jobs, batch_size, timeout, refresh_discovery).run()
+
+class _unmanage_pipeline(job_pipeline):
+    '''
+    Bulk unmanage run, see bulk_unmanage
+    '''
+
+    def __init__(self, con, entries, force, max_jobs, batch_size, retries, timeout):
+        job_pipeline.__init__(self, con, max_jobs, batch_size, timeout, UNMANAGE_FIELDS)
+        self.force = force
+        self.retries = max(0, int(retries))
+        # duplicates of a UUID are unmanaged once
+        self.entries = dict()
+        for entry in entries:
+            if entry['uuid'] not in self.entries:
+                self.entries[entry['uuid']] = entry
+                self.results.add(entry['uuid'], uuid=entry['uuid'], ip=entry['ipAddresses'],
+                                 type=entry['type'], attempts=0)
+
+    def _failed(self, chunk, attempt, message, waiting):
+        '''
+        Queue failed endpoints of chunk for another attempt or finish them as failed
+        '''
+        if attempt < self.retries:
+            logger.debug("Retrying unmanage of %d endpoints: %s", len(chunk), message)
+            for uuid in chunk:
+                self.results[uuid]['message'] = message
+            waiting.append((chunk, attempt + 1))
+        else:
+            for uuid in chunk:
+                self.results.finish(uuid, 'failed', message)
+
+    def post_chunk(self, chunk, attempt, waiting):
+        for uuid in chunk:
+            self.results[uuid]['attempts'] = attempt + 1
+        try:
+            job = lxca_rest().post_unmanage_request(self.url, self.session,
+                                                    [self.entries[uuid] for uuid in chunk], self.force)
+        except Exception as e:
+            job = None
+            message = "Unmanage request failed: %s" %e
+        else:
+            message = "Unmanage request was not accepted"
+        if not job:
+            self._failed(chunk, attempt, message, waiting)
+            return False
+        for uuid in chunk:
+            self.results[uuid]['job'] = job
+        self._watch(job, 'unmanage', chunk, attempt)
+        return True
+
+    def unmanaged(self, chunk, attempt, future, waiting):
+        try:
+            record = future.result()
+        except Exception as e:
+            self._failed(chunk, attempt, "Unmanage job failed: %s" %e, waiting)
+            return
+        entries = get_endpoint_results(record)
+        failed = []
+        message = None
+        for uuid in chunk:
+            entry = entries.get(uuid.upper())
+            if entry is None:
+                # job without per endpoint results tells state of all of them
+                entry = next((entries.get(str(ip).upper()) for ip in self.entries[uuid]['ipAddresses']
+                              if entries.get(str(ip).upper())), record)
+            if is_failed(entry):
+                failed.append(uuid)
+                message = entry.get('message') or "Unmanage job failed"
+            else:
+                self.results.finish(uuid, 'unmanaged', entry.get('message') if entry is not record else None)
+        if failed:
+            self._failed(failed, attempt, message, waiting)
+
+    def run(self):
+        uuids = list(self.results)
+        # chunk is (uuids, attempt)
+        waiting = deque((uuids[i:i + self.batch_size], 0) for i in range(0, len(uuids), self.batch_size))
+        in_flight = 0
+        while waiting or in_flight:
+            while in_flight < self.max_jobs and waiting:
+                chunk, attempt = waiting.popleft()
+                in_flight += self.post_chunk(chunk, attempt, waiting)
+            if not in_flight:
+                continue
+            try:
+                chunk, attempt, future = self.events.get(timeout=self._left())
+            except queue.Empty:
+                break
+            in_flight -= 1
+            self.unmanaged(chunk, attempt, future, waiting)
+
+        self.results.finish_pending('timeout', "Endpoint was not unmanaged before deadline")
+        return self.results.report("Bulk unmanage of %d endpoints" %len(self.results))
+
+@bulk_command('unmanage')
+def bulk_unmanage(con, endpoints, force = None, max_jobs = MAX_JOBS, batch_size = UNMANAGE_BATCH_SIZE,
+                  retries = UNMANAGE_RETRIES, timeout = None):
+    '''
+    Unmanage many endpoints in chunks of batch_size, at most max_jobs unmanage
+    requests run at once and their jobs are waited on by the job poller of con.
+    When request or job of a chunk fails, only its failed endpoints are tried again,
+    up to retries times. Endpoints whose chunk is still waiting for its job when
+    timeout seconds run out are reported as timeout.
+
+    @param endpoints: endpoint records or path of CSV/JSON file, see read_unmanage_endpoints
+    @return: list of per endpoint results with keys uuid, ip, type, status (unmanaged,
+             failed or timeout), message, job, attempts and seconds since start of the run
+
+    Example:
+
+        results = bulk_unmanage(con, [{'ip': '10.240.1.5', 'uuid': '8C0C...', 'type': 'Rack-Tower'},
+                                      '10.240.1.6;9D1A...;Rackswitch'], force=True)
+    '''
+    entries = read_unmanage_endpoints(endpoints)
+    return _unmanage_pipeline(con, entries, force, max_jobs, batch_size, retries, timeout).run()
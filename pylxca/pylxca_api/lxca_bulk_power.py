@@ -0,0 +1,205 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module changes power state of many devices with few powerState
+requests. A request LXCA rejects is split in halves so one bad device fails alone.
+'''
+
+import logging
+from collections import OrderedDict, deque
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from requests.exceptions import HTTPError
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest
+from pylxca.pylxca_api.lxca_bulk import bulk_command, job_pipeline, read_records, get_endpoint_results, \
+    is_failed, get_update_job, DEVICE_LISTS, MAX_JOBS
+from pylxca.pylxca_api import lxca_json
+
+logger = logging.getLogger(__name__)
+
+# Devices per powerState request, fewer when LXCA rejects request as too large
+POWER_BATCH_SIZE = 100
+
+# Power states each device type accepts
+POWER_STATES = {'server': ['powerOn', 'powerOff', 'powerCycleSoft', 'powerCycleSoftGraceful', 'powerOffHardGraceful'],
+                'switch': ['powerOn', 'powerOff', 'powerCycleSoft'],
+                'storage': ['powerOff', 'powerCycleSoft'],
+                'cmm': ['reset']}
+
+POWER_FIELDS = ('uuid', 'type', 'state', 'status', 'message', 'job', 'seconds')
+
+def read_power_actions(source, state = None):
+    '''
+    Returns list of power actions, dicts with keys uuid, type and state.
+
+    @param source: dict of device type (server, switch, storage or cmm) -> list of
+                   uuids or 'uuid,state' strings, or list, or path of CSV/JSON file,
+                   of dicts with keys uuid, type (default server) and state or of
+                   'uuid,state' strings like the server option of updatecomp command
+    @param state: power state of devices which do not name their own
+    '''
+    records = []
+    if isinstance(source, dict):
+        for device_type, devices in list(source.items()):
+            if not isinstance(devices, (list, tuple)):
+                devices = [devices]
+            for device in devices:
+                if not isinstance(device, dict):
+                    device = dict(zip(['uuid', 'state'], [item.strip() for item in str(device).split(',')]))
+                records.append(dict(device, type=device_type))
+    else:
+        records = read_records(source)
+
+    actions = []
+    for record in records:
+        if not isinstance(record, dict):
+            record = dict(zip(['uuid', 'state'], [item.strip() for item in str(record).split(',')]))
+        record = dict((key.strip(), value) for key, value in list(record.items()) if key and value not in (None, ''))
+        device_type = str(record.get('type', 'server')).lower()
+        if device_type not in POWER_STATES:
+            raise ValueError("Invalid device type %s, expected one of %s" %(device_type, sorted(POWER_STATES.keys())))
+        if not record.get('uuid'):
+            raise ValueError("Power action needs uuid of device")
+        power_state = record.get('state', state)
+        # power states are matched case insensitive, LXCA takes them as listed
+        power_state = next((item for item in POWER_STATES[device_type]
+                            if power_state and item.lower() == str(power_state).lower()), None)
+        if not power_state:
+            raise ValueError("Power state of %s %s must be one of %s" %(device_type, record['uuid'],
+                                                                      POWER_STATES[device_type]))
+        actions.append({'uuid': str(record['uuid']).strip(), 'type': device_type, 'state': power_state})
+    return actions
+
+class _power_pipeline(job_pipeline):
+    '''
+    Bulk power run, see bulk_power
+    '''
+
+    def __init__(self, con, actions, max_jobs, batch_size, timeout, job_kind = 'tasks'):
+        job_pipeline.__init__(self, con, max_jobs, batch_size, timeout, POWER_FIELDS)
+        self.job_kind = job_kind
+        self.requests = 0
+        # duplicates of a UUID get their first power state
+        self.actions = OrderedDict()
+        for action in actions:
+            if action['uuid'] not in self.actions:
+                self.actions[action['uuid']] = action
+                self.results.add(action['uuid'], uuid=action['uuid'], type=action['type'], state=action['state'])
+
+    def _finish_entries(self, batch, record):
+        '''
+        Finish devices of batch from per device entries of record, devices without
+        their own entry get state of record
+        '''
+        entries = get_endpoint_results(record) if isinstance(record, dict) else {}
+        for uuid in batch:
+            entry = entries.get(uuid.upper(), record if isinstance(record, dict) else {})
+            if is_failed(entry):
+                self.results.finish(uuid, 'failed', entry.get('message') or "Power action failed")
+            else:
+                self.results.finish(uuid, 'done', entry.get('message') if uuid.upper() in entries else None)
+
+    def post_batch(self, batch, waiting):
+        '''
+        Send powerState request of batch, returns True when its job is watched
+        '''
+        device_lists = dict()
+        for uuid in batch:
+            action = self.actions[uuid]
+            device_lists.setdefault(DEVICE_LISTS[action['type']], []).append(
+                {"UUID": uuid, "PowerState": action['state']})
+        self.requests += 1
+        try:
+            resp = lxca_rest().put_updatable_components(self.url, self.session, 'powerState', None, device_lists)
+        except HTTPError as e:
+            code = e.response.status_code if e.response is not None else None
+            if len(batch) > 1 and code is not None and code < 500 and code not in (401, 403):
+                # one bad device or too many of them fail the whole request, halves are sent again
+                if code == 413:
+                    self.batch_size = max(1, len(batch) // 2)
+                    logger.info("powerState request of %d devices too large, sending %d", len(batch), self.batch_size)
+                half = len(batch) // 2
+                waiting.appendleft(batch[half:])
+                waiting.appendleft(batch[:half])
+                return False
+            for uuid in batch:
+                self.results.finish(uuid, 'failed', "Power request failed: %s" %e)
+            return False
+        except Exception as e:
+            for uuid in batch:
+                self.results.finish(uuid, 'failed', "Power request failed: %s" %e)
+            return False
+        job = get_update_job(resp)
+        if not job:
+            # power actions are usually taken at once, body may hold per device results
+            try:
+                record = lxca_json.decode_response(resp)
+            except ValueError:
+                record = None
+            self._finish_entries(batch, record)
+            return False
+        for uuid in batch:
+            self.results[uuid]['job'] = job
+        self._watch(job, self.job_kind, batch)
+        return True
+
+    def powered(self, batch, future):
+        try:
+            record = future.result()
+        except Exception as e:
+            for uuid in batch:
+                self.results.finish(uuid, 'failed', "Power job failed: %s" %e)
+            return
+        self._finish_entries(batch, record)
+
+    def run(self):
+        uuids = list(self.actions.keys())
+        waiting = deque(uuids[i:i + self.batch_size] for i in range(0, len(uuids), self.batch_size))
+        in_flight = 0
+        while waiting or in_flight:
+            while in_flight < self.max_jobs and waiting:
+                batch = waiting.popleft()
+                if len(batch) > self.batch_size:
+                    # batch was made before LXCA told its request size limit
+                    waiting.extendleft(reversed([batch[i:i + self.batch_size]
+                                                 for i in range(0, len(batch), self.batch_size)]))
+                    continue
+                in_flight += self.post_batch(batch, waiting)
+            if not in_flight:
+                continue
+            try:
+                batch, future = self.events.get(timeout=self._left())
+            except queue.Empty:
+                break
+            in_flight -= 1
+            self.powered(batch, future)
+
+        self.results.finish_pending('timeout', "Power action was not done before deadline")
+        return self.results.report("Bulk power of %d devices in %d requests" %(len(self.results), self.requests))
+
+@bulk_command('updatecomp')
+def bulk_power(con, devices, state = None, max_jobs = MAX_JOBS, batch_size = POWER_BATCH_SIZE, timeout = None):
+    '''
+    Change power state of many devices with powerState requests of up to batch_size
+    devices of all types. A request LXCA rejects is split in halves, so one bad device
+    fails alone, and a request rejected as too large lowers batch_size of the rest.
+    At most max_jobs power jobs are waited on at once by the job poller of con.
+
+    @param devices: devices and their power states, see read_power_actions
+    @param state: power state of devices which do not name their own
+    @return: list of per device results with keys uuid, type, state, status (done,
+             failed or timeout), message, job and seconds since start of the run
+
+    Example:
+
+        results = bulk_power(con, {'server': rack_server_uuids, 'switch': ['A1B2...,powerOff']},
+                             state='powerCycleSoft')
+    '''
+    actions = read_power_actions(devices, state)
+    return _power_pipeline(con, actions, max_jobs, batch_size, timeout).run()
@@ -0,0 +1,111 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module enables or disables ports of many switches with one request per
+switch, requests of several switches are sent concurrently.
+'''
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from requests.exceptions import Timeout
+
+from pylxca.pylxca_api.lxca_rest import lxca_rest
+from pylxca.pylxca_api.lxca_timeout import DeadlineExceeded
+from pylxca.pylxca_api.lxca_bulk import bulk_command, bulk_results, run_workers, read_records, get_time_left, \
+    MAX_WORKERS
+from pylxca.pylxca_api import lxca_timeout
+from pylxca.pylxca_api import lxca_json
+
+logger = logging.getLogger(__name__)
+
+PORT_FIELDS = ('uuid', 'port', 'action', 'status', 'message', 'seconds')
+
+def read_port_map(source):
+    '''
+    Returns OrderedDict switch uuid -> list of its port names, each port once.
+
+    @param source: dict of switch uuid -> list or comma separated string of ports (or
+                   path of JSON file holding it), or list, or path of CSV/JSON file, of
+                   dicts with keys uuid and ports (or port), a switch may be in many of them
+    '''
+    records = source if isinstance(source, dict) else read_records(source)
+    if isinstance(records, dict):
+        records = [{'uuid': uuid, 'ports': ports} for uuid, ports in list(records.items())]
+    port_map = OrderedDict()
+    for record in records:
+        record = dict((key.strip(), value) for key, value in list(record.items()) if key and value not in (None, ''))
+        ports = next((item for item in [record.get('ports'), record.get('port')] if item is not None), None)
+        if not record.get('uuid') or not ports:
+            raise ValueError("Port action needs uuid of switch and ports")
+        if not isinstance(ports, (list, tuple)):
+            ports = str(ports).split(',')
+        switch_ports = port_map.setdefault(str(record['uuid']).strip(), [])
+        for port in ports:
+            port = str(port).strip()
+            if port and port not in switch_ports:
+                switch_ports.append(port)
+    return port_map
+
+@bulk_command('switches')
+def bulk_switch_ports(con, ports, action, max_workers = None, timeout = None):
+    '''
+    Enable or disable ports of many switches. Ports of a switch are changed by one
+    request, requests of up to max_workers switches (default pool size of con) run at
+    once. Requests not answered within timeout seconds are given up and switches
+    not reached by then keep their ports unchanged.
+
+    @param ports: switches and their ports, see read_port_map
+    @param action: enable or disable
+    @return: list of per port results with keys uuid (of switch), port, action, status
+             (done, failed or timeout), message and seconds since start of the run
+
+    Example:
+
+        results = bulk_switch_ports(con, {'7A1B...': ['1', '2', '3'], '8C2D...': 'A1,A2'}, 'disable')
+    '''
+    if action not in ['enable', 'disable']:
+        raise ValueError("Invalid argument action [enable/disable] is required %s" %action)
+    port_map = read_port_map(ports)
+    url = con.get_url()
+    session = con.get_session()
+    results = bulk_results(PORT_FIELDS)
+    for uuid, switch_ports in list(port_map.items()):
+        for port in switch_ports:
+            results.add((uuid, port), uuid=uuid, port=port, action=action)
+    left = get_time_left(timeout)
+    expires = None if left is None else results.start + left
+    cancelled = threading.Event()
+
+    def _finish(uuid, status, message):
+        for port in port_map[uuid]:
+            results.finish((uuid, port), status, message)
+
+    def _put(uuid):
+        seconds = None if expires is None else expires - time.time()
+        if cancelled.is_set() or (seconds is not None and seconds <= 0):
+            return
+        with lxca_timeout.deadline(seconds):
+            try:
+                resp = lxca_rest().put_switches_port(url, session, uuid, ','.join(port_map[uuid]), action)
+            except (DeadlineExceeded, Timeout) as e:
+                _finish(uuid, 'timeout', "Port request timed out: %s" %e)
+                return
+            except Exception as e:
+                _finish(uuid, 'failed', "Port request failed: %s" %e)
+                return
+            try:
+                py_obj = lxca_json.decode_response(resp)
+            except ValueError:
+                py_obj = None
+            _finish(uuid, 'done', py_obj.get('message') if isinstance(py_obj, dict) else None)
+
+    # requests still running end by the deadline, results are not changed after return
+    run_workers(_put, list(port_map), max_workers or getattr(con, 'pool_maxsize', None) or MAX_WORKERS,
+                left, cancelled)
+    results.finish_pending('timeout', "Ports were not changed before deadline")
+    return results.report("Bulk %s of %d ports on %d switches" %(action, len(results), len(port_map)))
@@ -0,0 +1,350 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides response cache for read-only inventory commands of
+lxca_api. Entries expire after per command TTL and least recently used entries are
+evicted when cache grows over its memory bound. Mutating commands invalidate the
+commands whose data they change. It also keeps HTTP validators used by lxca_rest
+for conditional requests.
+'''
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Seconds results of read-only commands stay valid, other commands are never cached
+TTLS = {'chassis': 60,
+        'nodes': 60,
+        'switches': 60,
+        'fans': 60,
+        'powersupplies': 60,
+        'fanmuxes': 60,
+        'cmms': 60,
+        'scalablesystem': 60,
+        'configtargets': 60,
+        'users': 300}
+
+INVENTORY = ['chassis', 'nodes', 'switches', 'fans', 'powersupplies', 'fanmuxes', 'cmms',
+             'scalablesystem', 'configtargets']
+
+# Commands changing state of the appliance and cached commands they make stale
+INVALIDATES = {'manage': INVENTORY,
+               'unmanage': INVENTORY,
+               'updatecomp': INVENTORY,
+               'configpatterns': ['nodes', 'configtargets'],
+               'configprofiles': ['nodes', 'configtargets'],
+               'switches': ['switches']}
+
+# dict_handler keys which make a call of the command a mutation, None means every call
+MUTATING_KEYS = {'manage': None,
+                 'unmanage': None,
+                 'updatecomp': ['a', 'action', 'updates'],
+                 'configpatterns': ['e', 'endpoint', 'pattern_update_dict'],
+                 'configprofiles': ['n', 'name', 'e', 'endpoint', 'd', 'delete', 'u', 'unassign'],
+                 'switches': ['action']}
+
+MAX_BYTES = 64 * 1024 * 1024
+
+# dict_handler flags handled by the cache, never passed to commands
+BYPASS_KEY = 'bypass_cache'
+REFRESH_KEY = 'refresh_cache'
+
+class lxca_response_cache(object):
+    '''
+    TTL + LRU cache of command results.
+
+    Results are kept serialized, so memory bound is exact and every hit returns
+    a fresh copy which the caller may modify.
+
+    Example:
+
+        lxca_api().set_response_cache(lxca_response_cache(ttls={'nodes': 30}))
+        nodes = lxca_api().api('nodes', None, con)                             # from LXCA
+        nodes = lxca_api().api('nodes', None, con)                             # from cache
+        nodes = lxca_api().api('nodes', {'refresh_cache': True}, con)          # from LXCA, cache updated
+        nodes = lxca_api().api('nodes', {'bypass_cache': True}, con)           # from LXCA, cache untouched
+    '''
+
+    def __init__(self, ttls = None, max_bytes = MAX_BYTES):
+        '''
+        @param ttls: dict command -> seconds, merged over TTLS, 0 disables caching of command
+        @param max_bytes: memory bound of serialized results
+        '''
+        self.ttls = dict(TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = int(max_bytes)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_mutation(object_name, dict_handler):
+        if object_name not in MUTATING_KEYS:
+            return False
+        keys = MUTATING_KEYS[object_name]
+        return keys is None or any((dict_handler or {}).get(key) is not None for key in keys)
+
+    def is_cacheable(self, object_name, dict_handler):
+        return bool(self.ttls.get(object_name)) and not self.is_mutation(object_name, dict_handler)
+
+    @staticmethod
+    def make_key(con, object_name, dict_handler):
+        args = json.dumps(dict_handler or {}, sort_keys=True, default=str)
+        return (con.get_url(), getattr(con, 'user', None), object_name, args)
+
+    def get(self, key):
+        '''
+        Returns cached result or None
+        '''
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.stats['misses'] += 1
+                return None
+            # mark as most recently used
+            self.entries[key] = self.entries.pop(key)
+            self.stats['hits'] += 1
+            text = entry[1]
+        return json.loads(text)
+
+    def put(self, key, result):
+        try:
+            text = json.dumps(result)
+        except (TypeError, ValueError):
+            # raw responses and other objects are not cached
+            return
+        size = len(text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.time() + self.ttls[key[2]], text, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.stats['evictions'] += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.size -= entry[2]
+
+    def invalidate(self, con = None, object_names = None):
+        '''
+        Drop entries of given commands (all when None) of given connection (all when None)
+        '''
+        with self._lock:
+            for key in list(self.entries.keys()):
+                if con is not None and key[:2] != (con.get_url(), getattr(con, 'user', None)):
+                    continue
+                if object_names is not None and key[2] not in object_names:
+                    continue
+                self._remove(key)
+                self.stats['invalidations'] += 1
+
+    def on_command(self, con, object_name, dict_handler):
+        '''
+        Invalidate entries made stale by a command which is not served from cache
+        '''
+        if not self.is_mutation(object_name, dict_handler):
+            return
+        stale = INVALIDATES.get(object_name, [])
+        logger.debug("Command %s invalidates cached %s", object_name, stale)
+        self.invalidate(con, stale)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+            stats['bytes'] = self.size
+        return stats
+
+    def clear(self):
+        self.invalidate()
+
+# Number of URLs whose validators and parsed objects are remembered per connection
+MAX_VALIDATED = 256
+
+# Memory bound of serialized objects remembered per connection, larger bodies are not revalidated
+MAX_VALIDATED_BYTES = 32 * 1024 * 1024
+
+class lxca_validator_cache(object):
+    '''
+    ETag / Last-Modified validators of inventory responses with their parsed objects.
+
+    lxca_rest sends them back as If-None-Match / If-Modified-Since, when LXCA
+    answers 304 Not Modified the remembered object is served and the size of
+    the body which was not transferred is counted in bytes_saved. Objects are kept
+    serialized up to max_bytes, objects larger than that are not remembered.
+    '''
+
+    def __init__(self, max_entries = MAX_VALIDATED, max_bytes = MAX_VALIDATED_BYTES):
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.stats = {'revalidations': 0, 'not_modified': 0, 'bytes_saved': 0, 'too_large': 0}
+        self._lock = threading.Lock()
+
+    def request_headers(self, url):
+        '''
+        Returns conditional headers for url, empty dict when nothing is remembered
+        '''
+        with self._lock:
+            entry = self.entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        with self._lock:
+            self.stats['revalidations'] += 1
+        return headers
+
+    def not_modified(self, url):
+        '''
+        Returns fresh copy of object remembered for url after 304, None when there is none
+        '''
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            self.entries[url] = self.entries.pop(url)
+            self.stats['not_modified'] += 1
+            self.stats['bytes_saved'] += entry['size']
+            text = entry['text']
+        return json.loads(text)
+
+    def store(self, url, headers, py_obj, size = None):
+        '''
+        Remember object parsed from response with validators in headers
+        '''
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        # size on wire is known before serializing, compressed body can only be smaller
+        if size and size > self.max_bytes:
+            self._too_large(url)
+            return
+        try:
+            text = json.dumps(py_obj)
+        except (TypeError, ValueError):
+            return
+        if len(text) > self.max_bytes:
+            self._too_large(url)
+            return
+        with self._lock:
+            self._remove(url)
+            self.entries[url] = {'etag': etag, 'last_modified': last_modified, 'text': text,
+                                 'size': size or len(text)}
+            self.size += len(text)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _too_large(self, url):
+        with self._lock:
+            # validators of older smaller body must not be sent any more
+            self._remove(url)
+            self.stats['too_large'] += 1
+
+    def _remove(self, url):
+        entry = self.entries.pop(url, None)
+        if entry is not None:
+            self.size -= len(entry['text'])
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+            stats['bytes'] = self.size
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+
+# Seconds devices found by discovery are reused by manage, connections keep them only
+# when discovery_ttl is given
+DISCOVERY_TTL = 300
+
+# Number of IP addresses whose discovered devices are remembered per connection
+MAX_DISCOVERED = 65536
+
+class lxca_discovery_cache(object):
+    '''
+    Devices found by discovery jobs, keyed by IP address.
+
+    Manage takes device of an address from here instead of discovering it again
+    while its entry is younger than ttl seconds.
+    '''
+
+    def __init__(self, ttl = DISCOVERY_TTL, max_entries = MAX_DISCOVERED):
+        self.ttl = float(ttl)
+        self.max_entries = int(max_entries)
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        self._lock = threading.Lock()
+
+    def get(self, ip):
+        '''
+        Returns fresh copy of device discovered at ip, None when there is none or it expired
+        '''
+        with self._lock:
+            entry = self.entries.get(ip)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self.entries[ip]
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            text = entry[1]
+        return json.loads(text)
+
+    def store(self, devices):
+        '''
+        Remember devices of finished discovery job under each of their IP addresses
+        '''
+        expires = time.time() + self.ttl
+        with self._lock:
+            for device in devices:
+                text = json.dumps(device)
+                for ip in device.get('ipAddresses') or []:
+                    self.entries.pop(ip, None)
+                    self.entries[ip] = (expires, text)
+                self.stats['stored'] += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+
+    def invalidate(self, ips = None):
+        '''
+        Forget devices of given addresses, all when None
+        '''
+        with self._lock:
+            if ips is None:
+                self.entries.clear()
+            for ip in ips or []:
+                self.entries.pop(ip, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self.entries)
+        return stats
+
+    def clear(self):
+        self.invalidate()
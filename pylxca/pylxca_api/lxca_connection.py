@@ -12,17 +12,124 @@ import requests
 import logging, json
 import os, platform
 import base64
+import threading
+import time
 import pkg_resources
 from _socket import timeout
 from requests.sessions import session
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.poolmanager import PoolManager
+from requests.packages.urllib3.exceptions import NewConnectionError
+
+from pylxca.pylxca_api.lxca_timeout import lxca_timeout_policy, remaining
+from pylxca.pylxca_api.lxca_retry import lxca_retry_policy, lxca_circuit_breaker
+from pylxca.pylxca_api.lxca_cache import lxca_validator_cache, lxca_discovery_cache
+from pylxca.pylxca_api import lxca_json
+from pylxca.pylxca_api import lxca_jobs
 
 logger = logging.getLogger(__name__)
 
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+# Inventory responses are large, LXCA compresses them when asked
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Session expiry is reported as 401, 403 is also seen when X-Csrf-Token is stale
+SESSION_EXPIRED_CODES = (401, 403)
+# Requests replayed after session renewal. PUT and DELETE of LXCA start jobs or change
+# state, they are replayed only when caller lists them in replay_methods of connection.
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Adapters shared between connection objects of the same appliance, keyed by
+# url, pool settings, retry policy and circuit breaker. Each entry is
+# [adapter, reference count]. Timeouts are kept on session of each connection.
+_shared_adapters = {}
+_shared_adapters_lock = threading.Lock()
+
 class lxcaAdapter(HTTPAdapter):
 
-    def init_poolmanager(self, connections, maxsize, block=False):
+    def __init__(self, retry_policy = None, circuit_breaker = None, **kwargs):
+        # retries are done by send() with backoff, urllib3 must not retry on its own
+        kwargs['max_retries'] = 0
+        self.retry_policy = retry_policy or lxca_retry_policy()
+        self.circuit_breaker = circuit_breaker or lxca_circuit_breaker()
+        self.retry_stats = {'requests': 0, 'retries': 0, 'gave_up': 0, 'rejected': 0}
+        self._stats_lock = threading.Lock()
+        super(lxcaAdapter, self).__init__(**kwargs)
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.retry_stats[key] += 1
+
+    def send(self, request, **kwargs):
+        '''
+        Sends request through circuit breaker of its path and retries failed
+        attempts allowed by retry policy, sleeps are bounded by command deadline
+        '''
+        breaker = self.circuit_breaker
+        path = breaker.path_key(request.url)
+        if not breaker.allow(path):
+            self._count('rejected')
+            raise CircuitOpenError("Circuit of %s is open, request %s %s not sent" %(path, request.method, request.url))
+
+        self._count('requests')
+        attempt = 0
+        while True:
+            error = None
+            resp = None
+            connect_error = False
+            try:
+                resp = super(lxcaAdapter, self).send(request, **kwargs)
+            except requests.exceptions.SSLError:
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                reason = getattr(e.args[0], 'reason', None) if e.args else None
+                connect_error = isinstance(e, requests.exceptions.ConnectTimeout) or \
+                                isinstance(reason, NewConnectionError)
+
+            if error is None and resp.status_code not in self.retry_policy.status_codes:
+                breaker.record_success(path)
+                return resp
+
+            delay = self.retry_policy.backoff(attempt)
+            left = remaining()
+            if not self.retry_policy.is_retryable(request.method, attempt, connect_error) or \
+                    (left is not None and left <= delay) or breaker.is_open(path):
+                # request counts as one failure of its path however many attempts it took
+                breaker.record_failure(path)
+                if attempt:
+                    self._count('gave_up')
+                if error is not None:
+                    raise error
+                return resp
+
+            logger.debug("Retry %d of %s %s in %.2f seconds after %s", attempt + 1, request.method,
+                         request.url, delay, error or resp.status_code)
+            if resp is not None:
+                # release connection of failed response back to the pool
+                resp.content
+                resp.close()
+            self._count('retries')
+            time.sleep(delay)
+            attempt += 1
+
+            timeout = kwargs.get('timeout')
+            left = remaining()
+            if left is not None and isinstance(timeout, tuple):
+                kwargs['timeout'] = tuple(min(value, left) if value is not None else left for value in timeout)
+
+    def get_retry_stats(self):
+        '''
+        Returns retry counters and circuit breaker state per REST path
+        '''
+        with self._stats_lock:
+            stats = dict(self.retry_stats)
+        stats['circuits'] = self.circuit_breaker.get_state()
+        return stats
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
 
         self.poolmanager = PoolManager(num_pools=connections,
 
@@ -30,7 +137,30 @@ class lxcaAdapter(HTTPAdapter):
 
                                        block=block,
 
-                                       assert_hostname='localhost')
+                                       assert_hostname='localhost',
+
+                                       **pool_kwargs)
+
+    def get_pool_stats(self):
+        '''
+        Returns hits and misses of every host pool held by this adapter.
+        A miss is a request which had to open a new connection, a hit is a
+        request served over an already open connection.
+        '''
+        stats = dict()
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = "%s://%s:%s" %(pool.scheme, pool.host, pool.port)
+            misses = pool.num_connections
+            stats[host] = {'requests': pool.num_requests,
+                           'hits': max(pool.num_requests - misses, 0),
+                           'misses': misses,
+                           'maxsize': self._pool_maxsize,
+                           'block': self._pool_block}
+        return stats
 
 
 class Error(Exception):
@@ -41,17 +171,47 @@ class ConnectionError(Error):
     """This exception is raised when a connection related problem occurs, where a retry might make sense."""
     pass
 
+class CircuitOpenError(Error):
+    """This exception is raised when circuit breaker of a REST path is open and request is not sent."""
+    pass
+
 class lxca_connection(object):
     '''
     C
     '''
-    def __init__(self, url, user = None,  passwd = None, verify_callback = True, retries = 3):
+    def __init__(self, url, user = None,  passwd = None, verify_callback = True, retries = 3,
+                 pool_connections = POOL_CONNECTIONS, pool_maxsize = POOL_MAXSIZE, pool_block = False,
+                 share_pool = False, timeout_policy = None, retry_policy = None, circuit_breaker = None,
+                 session_cache = None, conditional_get = True, discovery_ttl = 0,
+                 replay_methods = IDEMPOTENT_METHODS):
         self.url = url
         self.user = user
         self.passwd = base64.b16encode(passwd.encode())
         self.retires = retries
         self.debug = False
         self.session = None
+        self.pool_connections = int(pool_connections)
+        self.pool_maxsize = int(pool_maxsize)
+        self.pool_block = pool_block
+        self.share_pool = share_pool
+        self.adapter = None
+        self._adapter_key = None
+        self._login_lock = threading.Lock()
+        self.session_renewals = 0
+        self.replay_methods = tuple(method.upper() for method in replay_methods)
+        self.timeout_policy = timeout_policy or lxca_timeout_policy()
+        self.retry_policy = retry_policy or lxca_retry_policy(retries)
+        self.circuit_breaker = circuit_breaker
+        self.session_cache = session_cache
+        # 'cache' when session was restored from session_cache, 'login' otherwise
+        self.session_source = None
+        # ETag/Last-Modified of inventory responses, used by lxca_rest to revalidate
+        self.validators = lxca_validator_cache() if conditional_get else None
+        # devices found by discovery, reused by manage, None unless discovery_ttl is given
+        self.discovery_cache = lxca_discovery_cache(discovery_ttl) if discovery_ttl else None
+        # lxca_job_poller created on first use
+        self.job_poller = None
+        self._job_poller_lock = threading.Lock()
         #self.verify_callback = verify_callback
         #os.environ['REQUESTS_CA_BUNDLE'] = os.path.join('/etc/ssl/certs/','ca-certificates.crt')
         if verify_callback:
@@ -70,20 +230,23 @@ class lxca_connection(object):
             logger.debug("Establishing Connection")
             self.session = requests.session()
             self.session.verify = self.verify_callback
+            # lxca_rest picks per command timeouts from policy attached to session
+            self.session.timeout_policy = self.timeout_policy
+            self.session.validators = self.validators
+            self.session.discovery_cache = self.discovery_cache
 
             pylxca_version = pkg_resources.require("pylxca")[0].version
             # Update the headers with your custom ones
             # You don't have to worry about case-sensitivity with
             # the dictionary keys, because default_headers uses a custom
             # CaseInsensitiveDict implementation within requests' source code.
-            self.session.headers.update({'content-type': 'application/json; charset=utf-8','User-Agent': 'LXCA via Python Client / ' + pylxca_version})
-
+            self.session.headers.update({'content-type': 'application/json; charset=utf-8','User-Agent': 'LXCA via Python Client / ' + pylxca_version,
+                                         'Accept-Encoding': ACCEPT_ENCODING})
 
-            payload = dict(UserId= self.user, password=base64.b16decode(self.passwd).decode())
-            pURL = self.url + '/sessions'
-            self.session.mount(self.url, lxcaAdapter(max_retries=self.retires))
-            r = self.session.post(pURL,data = json.dumps(payload),headers=dict(Referer=pURL),verify=self.verify_callback, timeout = 3)
-            r.raise_for_status()
+            self.session.mount(self.url, self._get_adapter())
+            self.session.hooks['response'].append(self._check_session)
+            if not self._restore_session():
+                self._login()
         except ConnectionError as e:
             logger.debug("Connection Exception: Exception = %s", e)
             return False
@@ -94,6 +257,17 @@ class lxca_connection(object):
             logger.debug("Connection Exception: Exception = %s", e)
             return False
 
+        return  True
+
+    def _login(self):
+        '''
+        Creates LXCA session on self.session, also used to renew expired session in place
+        '''
+        payload = dict(UserId= self.user, password=base64.b16decode(self.passwd).decode())
+        pURL = self.url + '/sessions'
+        r = self.session.post(pURL,data = json.dumps(payload),headers=dict(Referer=pURL),verify=self.verify_callback, timeout = self.timeout_policy.get('sessions'))
+        r.raise_for_status()
+
         '''
         Even though the csrf-token cookie will be automatically sent with the request,
         the server will be still expecting a valid X-Csrf-Token header,
@@ -101,8 +275,189 @@ class lxca_connection(object):
         '''
         if r.status_code == requests.codes['ok']:
             self.session.headers.update({'X-Csrf-Token': self.session.cookies.get('csrf')})
+            self.session_source = 'login'
+            self._store_session()
 
-        return  True
+    def _restore_session(self):
+        '''
+        Puts cookies and csrf token of cached session on self.session, returns False
+        when there is nothing to reuse. Stale session is renewed by _check_session.
+        '''
+        if not self.session_cache:
+            return False
+        entry = self.session_cache.load(self.url, self.user, base64.b16decode(self.passwd).decode())
+        if not entry:
+            return False
+        for cookie in entry['cookies']:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain'), path=cookie.get('path'))
+        self.session.headers.update({'X-Csrf-Token': entry['csrf']})
+        self.session_source = 'cache'
+        logger.debug("Reusing cached LXCA session of %s", self.user)
+        return True
+
+    def _store_session(self):
+        if not self.session_cache:
+            return
+        cookies = [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path}
+                   for cookie in self.session.cookies]
+        self.session_cache.save(self.url, self.user, base64.b16decode(self.passwd).decode(),
+                                cookies, self.session.headers.get('X-Csrf-Token'))
+
+    def _check_session(self, resp, *args, **kwargs):
+        '''
+        Response hook of the session. It keeps X-Csrf-Token header in sync with a rotated
+        csrf cookie and on expired session logs in again in place, then replays
+        request once when its method is one of replay_methods.
+        '''
+        request = resp.request
+        if self.session is None or getattr(request, '_lxca_replayed', False):
+            return resp
+
+        # Server rotated the token, following requests must carry new one
+        rotated_csrf = resp.cookies.get('csrf')
+        if rotated_csrf and rotated_csrf != self.session.headers.get('X-Csrf-Token'):
+            logger.debug("X-Csrf-Token rotated by server")
+            self.session.cookies.update(resp.cookies)
+            self.session.headers.update({'X-Csrf-Token': rotated_csrf})
+
+        if resp.status_code not in SESSION_EXPIRED_CODES \
+                or request.method not in self.replay_methods \
+                or request.url == self.url + '/sessions':
+            return resp
+
+        sent_csrf = request.headers.get('X-Csrf-Token')
+        with self._login_lock:
+            if sent_csrf == self.session.headers.get('X-Csrf-Token'):
+                if resp.status_code != requests.codes['unauthorized']:
+                    # Forbidden with the current token, nothing to renew
+                    return resp
+                logger.debug("LXCA session expired, logging in again")
+                try:
+                    self._login()
+                except Exception as e:
+                    logger.error("Failed to renew LXCA session: %s", e)
+                    return resp
+                self.session_renewals += 1
+            # else session was already renewed by another request, just replay
+
+        logger.debug("Replaying %s %s with renewed session", request.method, request.url)
+        new_request = request.copy()
+        new_request.headers['X-Csrf-Token'] = self.session.headers.get('X-Csrf-Token')
+        new_request.headers.pop('Cookie', None)
+        new_request.prepare_cookies(self.session.cookies)
+        new_request._lxca_replayed = True
+
+        # release connection of expired response back to the pool
+        resp.content
+        resp.close()
+
+        new_resp = self.session.send(new_request, **kwargs)
+        new_resp.history.insert(0, resp)
+        return new_resp
+
+    def _get_adapter(self):
+        '''
+        Returns adapter to mount for this connection, shared adapter is reused
+        by all connection objects of the same appliance with same pool settings
+        and retry policy
+        '''
+        if self.adapter:
+            return self.adapter
+
+        if not self.share_pool:
+            self.adapter = lxcaAdapter(pool_connections=self.pool_connections,
+                                       pool_maxsize=self.pool_maxsize,
+                                       pool_block=self.pool_block,
+                                       retry_policy=self.retry_policy,
+                                       circuit_breaker=self.circuit_breaker)
+            return self.adapter
+
+        # adapter retries and breaks circuits, so connections with other policies get their own;
+        # breaker given by caller is shared only with connections given the same object
+        breaker = id(self.circuit_breaker) if self.circuit_breaker is not None else None
+        key = (self.url, self.pool_connections, self.pool_maxsize, self.pool_block,
+               self.retry_policy.get_key(), breaker)
+        with _shared_adapters_lock:
+            entry = _shared_adapters.get(key)
+            if entry is None:
+                logger.debug("Creating shared connection pool for %s", self.url)
+                entry = [lxcaAdapter(pool_connections=self.pool_connections,
+                                     pool_maxsize=self.pool_maxsize,
+                                     pool_block=self.pool_block,
+                                     retry_policy=self.retry_policy,
+                                     circuit_breaker=self.circuit_breaker), 0]
+                _shared_adapters[key] = entry
+            entry[1] += 1
+        self._adapter_key = key
+        self.adapter = entry[0]
+        return self.adapter
+
+    def _release_adapter(self):
+        '''
+        Detach adapter from session, shared adapter is closed only when
+        last connection object using it is released
+        '''
+        if not self._adapter_key:
+            self.adapter = None
+            return
+
+        # session.close() closes all mounted adapters, so shared one is removed first
+        if self.session:
+            for prefix, adapter in list(self.session.adapters.items()):
+                if adapter is self.adapter:
+                    del self.session.adapters[prefix]
+
+        with _shared_adapters_lock:
+            entry = _shared_adapters.get(self._adapter_key)
+            if entry:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del _shared_adapters[self._adapter_key]
+                    entry[0].close()
+        self._adapter_key = None
+        self.adapter = None
+
+    def get_pool_stats(self):
+        '''
+        Returns connection pool hits and misses for this connection
+        '''
+        if not self.adapter:
+            return {}
+        return self.adapter.get_pool_stats()
+
+    def get_retry_stats(self):
+        '''
+        Returns retry counters and circuit breaker state for this connection
+        '''
+        if not self.adapter:
+            return {}
+        return self.adapter.get_retry_stats()
+
+    def get_validator_stats(self):
+        '''
+        Returns conditional request counters, bytes_saved is size of bodies not transferred
+        '''
+        if not self.validators:
+            return {}
+        return self.validators.get_stats()
+
+    def get_discovery_stats(self):
+        '''
+        Returns hits and misses of discovery cache used by manage
+        '''
+        if not self.discovery_cache:
+            return {}
+        return self.discovery_cache.get_stats()
+
+    def get_job_poller(self):
+        '''
+        Returns lxca_job_poller waiting for jobs of this connection
+        '''
+        with self._job_poller_lock:
+            if self.job_poller is None:
+                self.job_poller = lxca_jobs.lxca_job_poller(self)
+            return self.job_poller
 
     def test_connection(self):
         '''
@@ -110,9 +465,9 @@ class lxca_connection(object):
         '''
         try:
             test_url = self.url + '/aicc'
-            resp = self.session.get(test_url,verify=self.session.verify, timeout=3)
+            resp = self.session.get(test_url,verify=self.session.verify, timeout=self.timeout_policy.get('aicc'))
             #If valid JSON object is parsed then the connection is successfull
-            py_obj = json.loads(resp.text)
+            py_obj = lxca_json.decode_response(resp)
         except Exception as e:
             raise ConnectionError("Invalid connection")
         return
@@ -127,10 +482,14 @@ class lxca_connection(object):
         '''
         session Disconnection
         '''
+        if self.job_poller is not None:
+            self.job_poller.close()
+            self.job_poller = None
         self.url = None
         self.user = None
         self.passwd = None
         self.debug = False
+        self._release_adapter()
         self.session.close()
         self.session = None
 
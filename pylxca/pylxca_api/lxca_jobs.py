@@ -0,0 +1,331 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module waits for LXCA jobs. One poller thread per connection checks
+every watched job in each poll cycle, jobs and tasks with batched requests like
+/jobs/id1,id2, and stretches the poll interval while nothing progresses. Waiters get
+concurrent.futures.Future objects resolved with final job record.
+'''
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from pylxca.pylxca_api import lxca_batch
+from pylxca.pylxca_api import lxca_json
+from pylxca.pylxca_api.lxca_timeout import get_timeout, check_deadline, remaining, bind, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Job resources: path of job status, attribute naming job in batched responses
+# (None when LXCA serves one job per request) and command of its timeouts
+KINDS = {'jobs': ('/jobs/', 'id', 'jobs'),
+         'tasks': ('/tasks/', 'jobUID', 'tasks'),
+         'discover': ('/discoverRequest/jobs/', None, 'discover'),
+         'manage': ('/manageRequest/jobs/', None, 'manage'),
+         'unmanage': ('/unmanageRequest/jobs/', None, 'unmanage')}
+
+# States after which job does not change any more
+FINAL_STATES = ['complete', 'completed', 'cancelled', 'canceled', 'stopped', 'failed',
+                'interrupted', 'stopped_with_error', 'cancelled_with_errors',
+                'complete_with_errors', 'completed_with_errors', 'finished']
+
+# Seconds between polls, interval grows by BACKOFF up to MAX_INTERVAL while no
+# watched job progresses and drops back to INTERVAL when one does
+INTERVAL = 0.5
+MAX_INTERVAL = 15.0
+BACKOFF = 1.5
+
+# Consecutive failed polls of a job after which its future fails
+MAX_ERRORS = 3
+
+# Job status requests sent at once for kinds which are not batched
+MAX_WORKERS = 4
+
+def get_state(record):
+    state = record.get('state')
+    if state is None:
+        state = record.get('status')
+    if isinstance(state, dict):
+        state = state.get('state')
+    return state
+
+def get_progress(record):
+    for source in [record, record.get('status')]:
+        if isinstance(source, dict):
+            for key in ['progress', 'percentage']:
+                if source.get(key) is not None:
+                    try:
+                        return float(source[key])
+                    except (TypeError, ValueError):
+                        pass
+    return None
+
+def is_done(record):
+    '''
+    True when job record is in final state, or reports 100% progress when it has no state.
+    Jobs of discover/manage/unmanage requests report only progress.
+    '''
+    if record.get('progress') is not None:
+        progress = get_progress(record)
+        # non-numeric progress falls back to state
+        if progress is not None:
+            return progress >= 100
+    state = get_state(record)
+    if state and hasattr(state, 'lower'):
+        return state.lower() in FINAL_STATES
+    progress = get_progress(record)
+    return progress is not None and progress >= 100
+
+def fetch_jobs(url, session, kind, job_ids, max_workers = MAX_WORKERS):
+    '''
+    Returns (dict job id -> status record, number of requests sent)
+    '''
+    path, key, command = KINDS[kind]
+    base = url + path
+
+    def _get(ids):
+        resp = session.get(base + ids, verify=False, timeout=get_timeout(session, command))
+        resp.raise_for_status()
+        return lxca_json.decode_response(resp)
+
+    job_ids = [str(job_id) for job_id in job_ids]
+    if key:
+        room = lxca_batch.url_room(base)
+        records = lxca_batch.fetch_by_uuid(_get, job_ids, room, max_workers, key=key)
+        return records, len(lxca_batch.chunk_uuids(job_ids, room))
+
+    records = OrderedDict()
+    if len(job_ids) == 1:
+        records[job_ids[0]] = _get(job_ids[0])
+        return records, 1
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(job_ids)))
+    try:
+        for job_id, record in zip(job_ids, executor.map(bind(_get), job_ids)):
+            records[job_id] = record
+    finally:
+        executor.shutdown(wait=True)
+    return records, len(job_ids)
+
+def wait_for_job(url, session, job_id, kind = 'jobs', interval = INTERVAL, max_interval = MAX_INTERVAL):
+    '''
+    Poll one job in calling thread until it is done and return its final record.
+    DeadlineExceeded is raised when the job outlives deadline of the command.
+    '''
+    progress = None
+    while True:
+        check_deadline("%s job %s" %(kind, job_id))
+        left = remaining()
+        time.sleep(interval if left is None else max(0, min(interval, left)))
+        record = fetch_jobs(url, session, kind, [job_id])[0].get(str(job_id))
+        if record is None:
+            raise LookupError("%s job %s was not found" %(kind, job_id))
+        if is_done(record):
+            return record
+        if get_progress(record) != progress:
+            progress = get_progress(record)
+            interval = INTERVAL
+        else:
+            interval = min(interval * BACKOFF, max_interval)
+
+class _watch(object):
+
+    def __init__(self, future, expires):
+        self.future = future
+        self.expires = expires
+        self.progress = None
+        self.errors = 0
+
+class lxca_job_poller(object):
+    '''
+    Waits for many jobs of one connection with few requests.
+
+    Example:
+
+        poller = con.get_job_poller()
+        futures = [poller.watch(job) for job in job_ids]
+        poller.watch(ffdc_job, callback=lambda future: print(future.result()['status']))
+        records = poller.wait(job_ids, timeout=3600)      # job id -> final record
+    '''
+
+    def __init__(self, con, interval = INTERVAL, max_interval = MAX_INTERVAL, backoff = BACKOFF,
+                 max_workers = None):
+        self.con = con
+        self.interval = float(interval)
+        self.max_interval = float(max_interval)
+        self.backoff = float(backoff)
+        self.max_workers = max_workers or getattr(con, 'pool_maxsize', None) or MAX_WORKERS
+        self.pending = OrderedDict()
+        self.stats = {'polls': 0, 'requests': 0, 'completed': 0, 'failed': 0}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._added = False
+
+    def watch(self, job_id, kind = 'jobs', callback = None, timeout = None):
+        '''
+        Returns Future resolved with final record of job, callback(future) is called
+        from poller thread when job is done. Watching job twice returns same future.
+        Poller thread does not share deadline of calling command, so timeout defaults
+        to what is left of it.
+        '''
+        if timeout is None:
+            timeout = remaining()
+        if kind not in KINDS:
+            raise ValueError("Unknown job kind %s, expected one of %s" %(kind, sorted(KINDS.keys())))
+        key = (kind, str(job_id))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Job poller is closed")
+            watch = self.pending.get(key)
+            if watch is None:
+                expires = time.time() + float(timeout) if timeout is not None else None
+                watch = self.pending[key] = _watch(Future(), expires)
+                self._added = True
+                self._start()
+                self._cond.notify()
+        if callback is not None:
+            watch.future.add_done_callback(callback)
+        return watch.future
+
+    def unwatch(self, job_id, kind = 'jobs'):
+        '''
+        Stop polling job, its future is cancelled for every caller watching it.
+        Returns False when job was not pending.
+        '''
+        with self._cond:
+            watch = self.pending.pop((kind, str(job_id)), None)
+        if watch is None:
+            return False
+        watch.future.cancel()
+        return True
+
+    def wait(self, job_ids, kind = 'jobs', timeout = None):
+        '''
+        Block until all jobs are done, returns OrderedDict job id -> final record.
+        Raises DeadlineExceeded when jobs are not done within timeout seconds, which
+        defaults to what is left of deadline of calling command.
+        '''
+        if timeout is None:
+            timeout = remaining()
+        futures = OrderedDict((str(job_id), self.watch(job_id, kind, timeout=timeout)) for job_id in job_ids)
+        expires = time.time() + float(timeout) if timeout is not None else None
+        result = OrderedDict()
+        for job_id, future in list(futures.items()):
+            left = None if expires is None else max(0, expires - time.time())
+            try:
+                result[job_id] = future.result(left)
+            except FutureTimeoutError:
+                raise DeadlineExceeded("%s job %s not done in %s seconds" %(kind, job_id, timeout))
+        return result
+
+    def poll(self):
+        '''
+        Check every pending job once, returns True when some job progressed or finished
+        '''
+        with self._cond:
+            items = list(self.pending.items())
+        by_kind = OrderedDict()
+        for (kind, job_id), watch in items:
+            by_kind.setdefault(kind, []).append((job_id, watch))
+
+        progressed = False
+        url = self.con.get_url()
+        session = self.con.get_session()
+        for kind, watches in list(by_kind.items()):
+            try:
+                records, requests = fetch_jobs(url, session, kind, [job_id for job_id, _ in watches], self.max_workers)
+            except Exception as e:
+                logger.debug("Polling %s jobs failed: %s", kind, e)
+                records, requests = {}, 0
+                error = e
+            else:
+                error = None
+            self.stats['requests'] += requests
+            for job_id, watch in watches:
+                record = records.get(job_id)
+                if record is None:
+                    watch.errors += 1
+                    if watch.errors >= MAX_ERRORS:
+                        self._finish(kind, job_id, exception=error or LookupError("%s job %s was not found" %(kind, job_id)))
+                        progressed = True
+                    continue
+                watch.errors = 0
+                if is_done(record):
+                    self._finish(kind, job_id, record=record)
+                    progressed = True
+                    continue
+                if watch.expires is not None and watch.expires < time.time():
+                    self._finish(kind, job_id, exception=DeadlineExceeded("%s job %s timed out" %(kind, job_id)))
+                    continue
+                if get_progress(record) != watch.progress:
+                    watch.progress = get_progress(record)
+                    progressed = True
+        self.stats['polls'] += 1
+        return progressed
+
+    def _finish(self, kind, job_id, record = None, exception = None):
+        with self._cond:
+            watch = self.pending.pop((kind, job_id), None)
+        if watch is None:
+            return
+        if exception is not None:
+            self.stats['failed'] += 1
+            watch.future.set_exception(exception)
+        else:
+            self.stats['completed'] += 1
+            watch.future.set_result(record)
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="lxca_job_poller")
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        interval = self.interval
+        while True:
+            with self._cond:
+                expires = time.time() + interval
+                while self.pending and not self._closed:
+                    if self._added:
+                        # new jobs are polled soon, jobs added meanwhile join the same poll
+                        self._added = False
+                        expires = min(expires, time.time() + self.interval)
+                        interval = self.interval
+                    left = expires - time.time()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                if not self.pending or self._closed:
+                    self._thread = None
+                    return
+            try:
+                progressed = self.poll()
+            except Exception as e:
+                logger.error("Job poller failed: %s", e)
+                progressed = False
+            interval = self.interval if progressed else min(interval * self.backoff, self.max_interval)
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats['pending'] = len(self.pending)
+        return stats
+
+    def close(self):
+        '''
+        Stop polling, futures of pending jobs are cancelled
+        '''
+        with self._cond:
+            self._closed = True
+            watches = list(self.pending.values())
+            self.pending.clear()
+            self._cond.notify()
+        for watch in watches:
+            watch.future.cancel()
@@ -0,0 +1,395 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module decodes JSON responses of LXCA. Streamed bodies are read in
+chunks (decompressed on the fly when LXCA sends gzip/deflate) and records of top level
+lists are decoded one by one, each once its end is found, so neither the whole body nor
+its decoded text is held in memory next to the resulting objects. Other bodies are decoded straight from their
+bytes, with orjson when it is installed.
+'''
+
+import codecs
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# PYLXCA_JSON=json forces standard json module even when orjson is installed
+BACKEND = 'orjson' if orjson is not None and os.getenv('PYLXCA_JSON', 'orjson') != 'json' else 'json'
+
+# orjson reads integers over 64 bits as floats, bodies with such digit runs are
+# decoded with json module to get the same objects
+_LONG_NUMBER = re.compile(b'[0-9]{19}')
+
+# Charsets whose bodies are decoded from bytes as they are
+_UTF8 = ('utf-8', 'utf8', 'ascii', 'us-ascii')
+
+CHUNK_SIZE = 64 * 1024
+
+# Containers up to this depth are walked by the stream parser, deeper values
+# (e.g. single node record) are decoded at once with json decoder
+STREAM_DEPTH = 2
+
+_WHITESPACE = ' \t\n\r'
+
+_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+
+# Characters which may continue a number cut by end of chunk, like 25 of 2500.0
+_NUMBER_CHARS = '0123456789.eE+-'
+
+# Brackets of containers and whole strings, string cut by end of chunk has no closing
+# quote group. Rest of string which continues in next chunk.
+_TOKEN = re.compile(r'[\[\]{}]|"[^"\\]*(?:\\.[^"\\]*)*(")?')
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*(")?')
+
+def _scan(text, start, state):
+    '''
+    Scan text from start for end of container or string, state [depth, in_string, escape]
+    carries over between chunks. Returns index after the value or -1 when text ends first.
+    '''
+    depth, in_string, escape = state
+    i = start
+    if escape:
+        # escaped character is first of this chunk
+        i += 1
+    if in_string:
+        match = _STRING_REST.match(text, i)
+        if match.group(1) is None:
+            # only backslash at end of chunk stops the match early
+            state[:] = [depth, True, match.end() < len(text)]
+            return -1
+        i = match.end()
+        if depth == 0:
+            return i
+    for match in _TOKEN.finditer(text, i):
+        char = match.group()[0]
+        if char == '"':
+            if match.group(1) is None:
+                state[:] = [depth, True, match.end() < len(text)]
+                return -1
+            if depth == 0:
+                return match.end()
+        elif char in '[{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    state[:] = [depth, False, False]
+    return -1
+
+class _stream_reader(object):
+
+    def __init__(self, chunks, encoding):
+        self.chunks = iter(chunks)
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        # records are decoded separately, so keys are shared between them here
+        # like json.loads shares keys of one document
+        self.keys = dict()
+        self.decoder = json.JSONDecoder(object_pairs_hook=self._make_object)
+
+    def _make_object(self, pairs):
+        share = self.keys.setdefault
+        return {share(key, key): value for key, value in pairs}
+
+    def next_text(self):
+        '''
+        Returns next non-empty text of stream, None at its end
+        '''
+        while not self.eof:
+            try:
+                chunk = next(self.chunks)
+            except StopIteration:
+                self.eof = True
+                return self.text_decoder.decode(b'', True) or None
+            text = self.text_decoder.decode(chunk)
+            if text:
+                return text
+        return None
+
+    def fill(self):
+        '''
+        Append next chunk to buffer, returns False at end of stream
+        '''
+        text = self.next_text()
+        if text is None:
+            return False
+        # drop consumed part of buffer so memory stays bounded by record size
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            match = _NON_WHITESPACE.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError("Expecting '%s' at position %d of JSON stream" %(char, self.pos))
+        self.pos += 1
+
+    def value(self):
+        '''
+        Decode one complete JSON value at current position
+        '''
+        if self.peek() not in '{["':
+            # numbers and literals are short, number at end of buffer may continue in next chunk
+            while True:
+                try:
+                    obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                    if self.eof or (end < len(self.buf) and self.buf[end] not in _NUMBER_CHARS):
+                        self.pos = end
+                        return obj
+                except ValueError:
+                    if self.eof:
+                        raise
+                self.fill()
+
+        # containers and strings are scanned chunk by chunk and decoded once complete
+        state = [0, False, False]
+        end = _scan(self.buf, self.pos, state)
+        if end >= 0:
+            obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            self.pos = end
+            return obj
+        pieces = [self.buf[self.pos:]]
+        while True:
+            text = self.next_text()
+            if text is None:
+                raise ValueError("Unexpected end of JSON stream")
+            end = _scan(text, 0, state)
+            if end >= 0:
+                break
+            pieces.append(text)
+        pieces.append(text[:end])
+        self.buf = text
+        self.pos = end
+        obj, end = self.decoder.raw_decode(''.join(pieces))
+        return obj
+
+def _parse(reader, depth):
+    char = reader.peek()
+    if depth >= STREAM_DEPTH or char not in '{[':
+        return reader.value()
+
+    reader.pos += 1
+    if char == '[':
+        result = []
+        if reader.peek() == ']':
+            reader.pos += 1
+            return result
+        while True:
+            result.append(_parse(reader, depth + 1))
+            if reader.peek() == ']':
+                reader.pos += 1
+                return result
+            reader.expect(',')
+
+    result = {}
+    if reader.peek() == '}':
+        reader.pos += 1
+        return result
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        result[key] = _parse(reader, depth + 1)
+        if reader.peek() == '}':
+            reader.pos += 1
+            return result
+        reader.expect(',')
+
+def load_stream(chunks, encoding = 'utf-8'):
+    '''
+    Decode JSON document from iterable of byte chunks
+    '''
+    reader = _stream_reader(chunks, encoding)
+    obj = _parse(reader, 0)
+    while True:
+        if reader.buf[reader.pos:].strip(_WHITESPACE):
+            raise ValueError("Extra data after JSON document")
+        reader.pos = len(reader.buf)
+        if not reader.fill():
+            return obj
+
+def _iter_records(reader, key):
+    char = reader.peek()
+    if char == '[':
+        reader.pos += 1
+        if reader.peek() == ']':
+            reader.pos += 1
+            return
+        while True:
+            yield reader.value()
+            if reader.peek() == ']':
+                reader.pos += 1
+                return
+            reader.expect(',')
+
+    if char != '{' or key is None:
+        yield _parse(reader, 0)
+        return
+
+    # object which is not a wrapper of key list (e.g. single node) is yielded whole
+    reader.pos += 1
+    result = {}
+    if reader.peek() == '}':
+        reader.pos += 1
+        yield result
+        return
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            for record in _iter_records(reader, None):
+                yield record
+            # other members of wrapper are skipped
+            result = None
+        else:
+            value = _parse(reader, 1)
+            if result is not None:
+                result[name] = value
+        if reader.peek() == '}':
+            reader.pos += 1
+            break
+        reader.expect(',')
+    if result is not None:
+        yield result
+
+def iter_stream(chunks, encoding = 'utf-8', key = None):
+    '''
+    Yield records of JSON document from iterable of byte chunks one at a time.
+    Records are items of top level list or of list named key in top level object,
+    any other document is yielded as one record.
+    '''
+    reader = _stream_reader(chunks, encoding)
+    for record in _iter_records(reader, key):
+        yield record
+    while True:
+        if reader.buf[reader.pos:].strip(_WHITESPACE):
+            raise ValueError("Extra data after JSON document")
+        reader.pos = len(reader.buf)
+        if not reader.fill():
+            return
+
+def iter_response(resp, key = None, chunk_size = CHUNK_SIZE):
+    '''
+    Yield records of JSON body of response requested with stream=True, see iter_stream.
+    Connection is released when iteration ends or generator is closed.
+    '''
+    try:
+        py_obj = getattr(resp, 'lxca_object', None)
+        if py_obj is not None:
+            if isinstance(py_obj, dict) and isinstance(py_obj.get(key), list):
+                py_obj = py_obj[key]
+            for record in (py_obj if isinstance(py_obj, list) else [py_obj]):
+                yield record
+            return
+        for record in iter_stream(resp.iter_content(chunk_size), resp.encoding or 'utf-8', key):
+            yield record
+    finally:
+        resp.close()
+
+def iter_request(request, key = None, chunk_size = CHUNK_SIZE):
+    '''
+    Like iter_response, but request() returning the streamed response is called on
+    first next(), so generator which is never iterated holds no connection
+    '''
+    for record in iter_response(request(), key, chunk_size):
+        yield record
+
+_stats = {'responses': 0, 'bytes': 0, 'seconds': 0.0, 'fallbacks': 0}
+_stats_lock = threading.Lock()
+
+def loads(content, encoding = None):
+    '''
+    Decode JSON document from bytes, encoding is needed only for charsets other than UTF-8
+    '''
+    if encoding is not None and encoding.lower() not in _UTF8:
+        try:
+            return json.loads(content.decode(encoding, 'replace'))
+        except LookupError:
+            pass
+    if BACKEND == 'orjson' and not _LONG_NUMBER.search(content):
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # e.g. NaN or integers over 64 bits, which json module accepts
+            with _stats_lock:
+                _stats['fallbacks'] += 1
+    try:
+        if sys.version_info < (3, 6) and not isinstance(content, str):
+            content = content.decode('utf-8')
+        return json.loads(content)
+    except UnicodeDecodeError:
+        # resp.text replaces undecodable bytes, so does this
+        return json.loads(content.decode('utf-8', 'replace'))
+
+def decode_response(resp):
+    '''
+    Decode JSON body of response from its bytes.
+
+    Unlike json.loads(resp.text) the body is not copied to text first and its charset
+    is not guessed when LXCA does not send one. Raises AttributeError when resp is not
+    a response and ValueError when body is not JSON, like json.loads(resp.text) does.
+    '''
+    content = resp.content
+    start = time.time()
+    py_obj = loads(content, resp.encoding)
+    elapsed = time.time() - start
+    with _stats_lock:
+        _stats['responses'] += 1
+        _stats['bytes'] += len(content)
+        _stats['seconds'] += elapsed
+    return py_obj
+
+def get_decode_stats():
+    '''
+    Returns number, size and total decode seconds of responses decoded by decode_response
+    '''
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['backend'] = BACKEND
+    return stats
+
+def reset_decode_stats():
+    with _stats_lock:
+        _stats.update({'responses': 0, 'bytes': 0, 'seconds': 0.0, 'fallbacks': 0})
+
+def load_response(resp, chunk_size = CHUNK_SIZE):
+    '''
+    Decode JSON body of response requested with stream=True and release its connection.
+    Object of 304 Not Modified response is taken from validator cache of lxca_rest.
+    '''
+    py_obj = getattr(resp, 'lxca_object', None)
+    if py_obj is not None:
+        resp.close()
+        return py_obj
+    try:
+        py_obj = load_stream(resp.iter_content(chunk_size), resp.encoding or 'utf-8')
+    finally:
+        resp.close()
+    store = getattr(resp, 'lxca_store', None)
+    if store is not None:
+        store(py_obj)
+    return py_obj
@@ -0,0 +1,181 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides connection manager which holds connections to many
+LXCA appliances and runs pylxca API commands on all of them in parallel.
+'''
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from pylxca.pylxca_api.lxca_api import lxca_api, get_connection_args
+from pylxca.pylxca_api.lxca_connection import lxca_connection
+from pylxca.pylxca_api.lxca_connection import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['lxca_connection_manager', 'SOURCE_KEY']
+
+# Key added to every merged record naming the appliance it came from
+SOURCE_KEY = 'lxcaSource'
+
+# Appliances handled at once by fan_out
+MAX_WORKERS = 16
+
+class lxca_connection_manager(object):
+    '''
+    Holds named lxca_connection objects and fans out commands to all of them.
+
+    Example:
+
+        mgr = lxca_connection_manager(timeout=120)
+        mgr.connect_all({'dc1': {'url': 'https://10.0.0.1', 'user': 'USERID', 'pw': 'Passw0rd'},
+                         'dc2': {'url': 'https://10.0.1.1', 'user': 'USERID', 'pw': 'Passw0rd'}})
+        all_nodes = mgr.run('nodes', {'status': 'managed'})
+        for node in all_nodes['nodeList']:
+            print(node[SOURCE_KEY], node['name'])
+        print(all_nodes['errors'])
+    '''
+
+    def __init__(self, timeout = None, max_workers = MAX_WORKERS):
+        '''
+        @param timeout: default seconds to wait for all appliances, None waits forever
+        @param max_workers: number of appliances handled at once
+        '''
+        self.timeout = timeout
+        self.max_workers = int(max_workers)
+        self.cons = dict()
+        self._lock = threading.Lock()
+
+    def add(self, name, con):
+        if not isinstance(con, lxca_connection):
+            raise ConnectionError("Invalid Connection Object")
+        with self._lock:
+            self.cons[name] = con
+
+    def remove(self, name):
+        with self._lock:
+            return self.cons.pop(name, None)
+
+    def get(self, name):
+        return self.cons.get(name)
+
+    def names(self):
+        return list(self.cons.keys())
+
+    def connect_all(self, appliances, timeout = None):
+        '''
+        Connect to many appliances in parallel.
+        @param appliances: dict name -> connect dict_handler (url, user, pw, noverify, pool options)
+        @return: dict name -> error message of appliances which failed to connect
+        '''
+        def _connect(dict_handler):
+            # connection of lxca_api singleton is left alone
+            url, user, passwd, verify, pool_args = get_connection_args(dict(dict_handler))
+            con = lxca_connection(url, user, passwd, verify, **pool_args)
+            if not con.connect():
+                raise ConnectionError("Failed to connect %s" %url)
+            con.test_connection()
+            return con
+
+        outcome = self.fan_out(_connect, list(appliances.items()), timeout)
+        errors = dict()
+        for name, (con, err) in list(outcome.items()):
+            if err is None:
+                self.add(name, con)
+            else:
+                errors[name] = err
+        return errors
+
+    def disconnect_all(self):
+        for name in self.names():
+            con = self.remove(name)
+            try:
+                con.disconnect()
+            except Exception as e:
+                logger.debug("Disconnect of %s failed: %s", name, e)
+
+    def fan_out(self, func, items, timeout = None):
+        '''
+        Run func(arg) for every (name, arg) of items in parallel, at most
+        max_workers at once.
+        @return: dict name -> (result, error message), slow or failing items
+                 only get error message and never block the others
+        '''
+        if timeout is None:
+            timeout = self.timeout
+        outcome = dict()
+        if not items:
+            return outcome
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(items)))
+        futures = dict((executor.submit(func, arg), name) for name, arg in items)
+        done, not_done = wait(list(futures.keys()), timeout=timeout)
+        # items still queued are not started, slow appliances finish on their own
+        for future in not_done:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+        for future in done:
+            name = futures[future]
+            err = future.exception()
+            if err is None:
+                outcome[name] = (future.result(), None)
+            else:
+                logger.error("Command on %s failed: %s", name, err)
+                outcome[name] = (None, str(err))
+        for future in not_done:
+            name = futures[future]
+            logger.error("Command on %s did not complete in %s seconds", name, timeout)
+            outcome[name] = (None, "Timed out after %s seconds" %timeout)
+        return outcome
+
+    def run_each(self, object_name, dict_handler = None, timeout = None, names = None):
+        '''
+        Run lxca_api command on every appliance.
+        @return: dict name -> (result, error message)
+        '''
+        if names is None:
+            names = self.names()
+
+        def _run(con):
+            return lxca_api().api(object_name, dict(dict_handler) if dict_handler else None, con)
+
+        return self.fan_out(_run, [(name, self.cons[name]) for name in names], timeout)
+
+    def run(self, object_name, dict_handler = None, timeout = None, names = None):
+        '''
+        Run lxca_api command on every appliance and merge results.
+
+        List results and list values of dict results (e.g. nodeList) are concatenated,
+        each record is tagged with SOURCE_KEY. Other values are returned per appliance
+        under key 'results'. Failed and timed out appliances are listed under 'errors'.
+        '''
+        outcome = self.run_each(object_name, dict_handler, timeout, names)
+        merged = {'errors': dict()}
+
+        for name in sorted(outcome.keys()):
+            result, err = outcome[name]
+            if err is not None:
+                merged['errors'][name] = err
+                continue
+
+            if isinstance(result, list):
+                result = {object_name + 'List': result}
+
+            if isinstance(result, dict) and result and \
+                    all(isinstance(value, list) for value in list(result.values())):
+                for key, records in list(result.items()):
+                    merged.setdefault(key, []).extend(_tag(record, name) for record in records)
+            else:
+                merged.setdefault('results', dict())[name] = result
+        return merged
+
+def _tag(record, name):
+    if isinstance(record, dict):
+        record = dict(record)
+        record[SOURCE_KEY] = name
+    return record
@@ -16,6 +16,14 @@ import ast, json, re
 import socket
 import time
 
+from pylxca.pylxca_api.lxca_timeout import get_timeout
+from pylxca.pylxca_api import lxca_json
+from pylxca.pylxca_api import lxca_jobs
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
 
 try:
     logging.captureWarnings(True)
@@ -28,17 +36,123 @@ pylxca_logger = os.path.join(os.getenv('PYLXCA_API_PATH'), logger_conf_file)
 logger = logging.getLogger(__name__)
 REST_TIMEOUT = 60
 
+# Content type of each file of a management-server update package
+IMPORT_FILE_TYPES = {'.txt': 'text/plain',
+                     '.xml': 'text/xml',
+                     '.chg': 'application/octet-stream',
+                     '.tgz': 'application/x-compressed'}
+
 
 def callback(encoder):
     # uncomment it to debug, spit lot of data in log file for big upload
     #logger.debug("Callback called with data length %d" % (encoder.bytes_read))
     pass
 
+def add_projection(url, includeAttributes = None, excludeAttributes = None):
+    '''
+    Append includeAttributes / excludeAttributes query parameters to inventory url,
+    values are comma separated attribute names
+    '''
+    for name, value in [('includeAttributes', includeAttributes), ('excludeAttributes', excludeAttributes)]:
+        if value:
+            url = url + ('&' if '?' in url else '?') + name + '=' + value
+    return url
+
+def manage_params(device, ip_addr, user, pw, rpw = None, force = None):
+    '''
+    Returns entry of manageRequest payload for device found by discovery
+    '''
+    param_dict = dict()
+    param_dict["username"] = user
+    param_dict["password"] = pw
+    if rpw:param_dict["recoveryPassword"] = rpw
+    #Fetch Management Port value from Response
+    param_dict["managementPorts"] = device["managementPorts"]
+    #Fetch Type value from Response
+    param_dict["type"] = device["type"]
+    #Fetch UUID value from  Response
+    param_dict["uuid"] = device["uuid"]
+    param_dict["ipAddresses"] = [ip_addr]
+    if param_dict["type"] == "Rackswitch":
+        param_dict["os"] = device["os"]
+
+    if force:
+        if isinstance(force, bool):
+            param_dict["forceManage"] = force
+        else:
+            if force.lower() == "true":
+                param_dict["forceManage"] = True
+            else:
+                param_dict["forceManage"] = False
+
+    security_Descriptor = { }
+    security_Descriptor['managedAuthEnabled'] = True
+    security_Descriptor['managedAuthSupported'] = False
+    param_dict['securityDescriptor'] = security_Descriptor
+    return param_dict
+
+def unmanage_entry(ip_addresses, uuid, type):
+    '''
+    Returns entry of unmanageRequest payload, type is one of Chassis, Rackswitch,
+    ThinkServer, Storage or Rack-Tower
+    '''
+    #Fetch type value from input
+    type_list = ["Chassis","Rackswitch","ThinkServer","Storage","Rack-Tower"]
+    if type not in type_list:
+        raise ValueError("Invalid Type Specified")
+    if type == "ThinkServer": type = "Lenovo ThinkServer"
+    elif type == "Storage": type = "Lenovo Storage"
+    elif type == "Rack-Tower": type = "Rack-Tower Server"
+    return {"ipAddresses":ip_addresses,"type":type,"uuid":uuid}
+
+def get_job_location(resp):
+    '''
+    Returns job id from location header of accepted request, None when there is none
+    '''
+    if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
+        if "location" in resp.headers._store:
+            return resp.headers._store["location"][-1].split("/")[-1]
+    return None
+
+class manage_job(str):
+    '''
+    Job id of manage request, discovery tells where device to manage came from,
+    'cache' (discovery cache of connection) or 'job' (new discovery job)
+    '''
+
+    def __new__(cls, job_id, discovery):
+        obj = str.__new__(cls, job_id)
+        obj.discovery = discovery
+        return obj
+
 class lxca_rest(object):
     '''
     classdocs
     '''
-    def get_chassis(self,url, session, uuid, status ):
+    def _get_validated(self, url, session, command, stream = False):
+        '''
+        GET of inventory url, revalidated with ETag/Last-Modified remembered by session.
+        On 304 Not Modified remembered object is attached to response as lxca_object.
+        '''
+        validators = getattr(session, 'validators', None)
+        headers = validators.request_headers(url) if validators else {}
+        resp = session.get(url, headers=headers, verify=False, timeout=get_timeout(session, command), stream=stream)
+        if not validators:
+            return resp
+
+        if resp.status_code == requests.codes['not_modified']:
+            py_obj = validators.not_modified(url)
+            if py_obj is not None:
+                resp.lxca_object = py_obj
+                return resp
+            # validators were dropped meanwhile, fetch whole body
+            return session.get(url, verify=False, timeout=get_timeout(session, command), stream=stream)
+
+        size = resp.headers.get('Content-Length')
+        resp.lxca_store = lambda py_obj: validators.store(url, resp.headers, py_obj, int(size) if size else None)
+        return resp
+
+    def get_chassis(self,url, session, uuid, status, includeAttributes=None, excludeAttributes=None):
         url = url + '/chassis'
 
         if uuid:
@@ -51,16 +165,17 @@ class lxca_rest(object):
                 raise Exception("Invalid argument 'status'")
         else:
             url = url + "?status=managed"
+        url = add_projection(url, includeAttributes, excludeAttributes)
 
         try:
-            resp = session.get(url,verify=False,timeout=3)
+            resp = self._get_validated(url, session, 'chassis', stream=True)
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
             raise re
         return resp    
     
-    def get_nodes(self,url, session, uuid, status):
+    def get_nodes(self,url, session, uuid, status, includeAttributes=None, excludeAttributes=None):
         url = url + '/nodes'
 
         if uuid:
@@ -71,23 +186,25 @@ class lxca_rest(object):
                 url = url + "?status=" + status
             else:
                 raise Exception("Invalid argument 'status'")
+        url = add_projection(url, includeAttributes, excludeAttributes)
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'nodes', stream=True)
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
             raise re
         return resp
 
-    def get_switches(self,url, session, uuid):
+    def get_switches(self,url, session, uuid, includeAttributes=None, excludeAttributes=None):
         url = url + '/switches'
 
         if uuid:
             url = url + '/' + uuid
+        url = add_projection(url, includeAttributes, excludeAttributes)
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'switches')
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -106,7 +223,7 @@ class lxca_rest(object):
             url = url + '/ports'
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'switches'))
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -138,7 +255,8 @@ class lxca_rest(object):
         payload["ports"] = uuid_list
 
         try:
-            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=5)
+            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'switches'))
+            resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
             raise re
@@ -151,7 +269,7 @@ class lxca_rest(object):
             url = url + '/' + uuid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'fans')
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -165,7 +283,7 @@ class lxca_rest(object):
             url = url + '/' + uuid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'powersupplies')
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -179,7 +297,7 @@ class lxca_rest(object):
             url = url + '/' + uuid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'fanmuxes')
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -193,7 +311,7 @@ class lxca_rest(object):
             url = url + '/' + uuid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'cmms')
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -212,7 +330,7 @@ class lxca_rest(object):
                 raise Exception("Invalid argument 'complexType': %s" %complextype)
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = self._get_validated(url, session, 'scalablesystem')
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -236,7 +354,7 @@ class lxca_rest(object):
             if ip_addr:
                 url = url + '/discoverRequest'
                 payload = [{"ipAddresses":ip_addr.split(",")}]
-                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
+                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=get_timeout(session, 'discover'))
                 resp.raise_for_status()
                 if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
                     if "location" in resp.headers._store:
@@ -246,11 +364,11 @@ class lxca_rest(object):
                         return None
             elif jobid:
                 url = url + '/discoverRequest/jobs/' + str(jobid)
-                resp = session.get(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url,verify=False, timeout=get_timeout(session, 'discover'))
                 resp.raise_for_status()
             else:
                 url = url + '/discovery'
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'discover'))
                 resp.raise_for_status()
 
         except HTTPError as re:
@@ -258,84 +376,50 @@ class lxca_rest(object):
             raise re
         return resp
 
-    def do_manage(self,url, session, ip_addr,user,pw,rpw,force,jobid):
+    def do_manage(self,url, session, ip_addr,user,pw,rpw,force,jobid, refresh_discovery = False):
         try:
             #All input arguments ip_add, user, pw, rpw and mp are mandatory
             # if ip_addr and user and pw and mp:
             if ip_addr and user and pw:
-                url = url + '/manageRequest'
-
-                payload = list()
-                param_dict = dict()
-
-                param_dict["ipAddresses"]=ip_addr.split(",")
-                param_dict["username"] = user
-                param_dict["password"] = pw
-                if rpw:param_dict["recoveryPassword"] = rpw
-
-                # do auto discovery
-                disc_job_id = self.do_discovery(url.rsplit('/',1)[0], session, ip_addr,None)
-                disc_progress = 0
+                param_dict = None
+                discovery_cache = getattr(session, 'discovery_cache', None)
+                if discovery_cache is not None and not refresh_discovery:
+                    for each_ip in ip_addr.split(","):
+                        device = discovery_cache.get(each_ip.strip())
+                        if device is not None:
+                            logger.info("Discovery of %s taken from cache", each_ip)
+                            param_dict = manage_params(device, device["ipAddresses"][0], user, pw, rpw, force)
+                            break
+
+                discovery = 'cache'
+                if param_dict is None:
+                    # do auto discovery
+                    discovery = 'job'
+                    disc_job_id = self.do_discovery(url, session, ip_addr,None)
+                    if not disc_job_id:
+                        logger.debug("Failed to discover given endpoint  %s" %ip_addr.split(","))
+                        raise Exception("Failed to discover given endpoint  %s" %ip_addr.split(","))
+
+                    # polling is bounded by deadline of manage command
+                    disc_resp_py_obj = lxca_jobs.wait_for_job(url, session, disc_job_id, 'discover')
+
+                    for key in list(disc_resp_py_obj.keys()):
+                        if isinstance(disc_resp_py_obj[key],list) and disc_resp_py_obj[key] != []: 
+                            if discovery_cache is not None:
+                                discovery_cache.store(disc_resp_py_obj[key])
+                            device = disc_resp_py_obj[key][0]
+                            param_dict = manage_params(device, device["ipAddresses"][0], user, pw, rpw, force)
                 
-                if disc_job_id:
-                    #TODO Check if dicovery succeed, if not throw Exception
-                    while disc_progress < 100:
-                        time.sleep(2) # delays for 5 seconds to allow discovery to complete
-                        disc_job_resp = self.do_discovery(url.rsplit('/',1)[0], session, None,disc_job_id)
-                        disc_resp_py_obj = json.loads(disc_job_resp.text)
-                        disc_progress = disc_resp_py_obj['progress']
-                
-                discovered_endpoint = False
-                for key in list(disc_resp_py_obj.keys()):
-                    if isinstance(disc_resp_py_obj[key],list) and disc_resp_py_obj[key] != []: 
-                        discovered_endpoint = True
-                        #Fetch Management Port value from Response
-                        param_dict["managementPorts"] = disc_resp_py_obj[key][0]["managementPorts"]
-                        #Fetch Type value from Response
-                        param_dict["type"] = disc_resp_py_obj[key][0]["type"]
-                        #Fetch UUID value from  Response
-                        param_dict["uuid"] = disc_resp_py_obj[key][0]["uuid"]
-                        
-                        disc_ip_addr = disc_resp_py_obj[key][0]["ipAddresses"][0]
-                        
-                        param_dict["ipAddresses"] = [disc_ip_addr]
-                        
-                        if param_dict["type"] == "Rackswitch":
-                            param_dict["os"] = disc_resp_py_obj[key][0]["os"]
-                
-                if not discovered_endpoint:
-                    logger.debug("Failed to discover given endpoint  %s" %param_dict["ipAddresses"])
-                    raise Exception("Failed to discover given endpoint  %s" %param_dict["ipAddresses"])
-                
-                if force:
-                    if isinstance(force, bool):
-                        param_dict["forceManage"] = force
-                    else:
-                        if force.lower() == "true":
-                            param_dict["forceManage"] = True
-                        else:
-                            param_dict["forceManage"] = False
-
-                security_Descriptor = { }
-                security_Descriptor['managedAuthEnabled'] = True
-                security_Descriptor['managedAuthSupported'] = False
-                param_dict['securityDescriptor'] = security_Descriptor
+                if param_dict is None:
+                    logger.debug("Failed to discover given endpoint  %s" %ip_addr.split(","))
+                    raise Exception("Failed to discover given endpoint  %s" %ip_addr.split(","))
 
-                payload = [param_dict]
-
-                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
-                resp.raise_for_status()
-
-                if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
-                    if "location" in resp.headers._store:
-                        job = resp.headers._store["location"][-1].split("/")[-1]
-                        return job
-                    else:
-                        return None
+                job = self.post_manage_request(url, session, [param_dict])
+                return manage_job(job, discovery) if job else job
                     
             elif jobid:
                 url = url + '/manageRequest/jobs/' + str(jobid)
-                resp = session.get(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url,verify=False, timeout=get_timeout(session, 'manage'))
                 resp.raise_for_status()
             else:
                 logger.error("Invalid execution of manage REST API")
@@ -346,54 +430,31 @@ class lxca_rest(object):
             raise re
         return resp
 
+    def post_manage_request(self, url, session, payload):
+        '''
+        Post list of manageRequest entries made by manage_params, returns job id
+        '''
+        resp = session.post(url + '/manageRequest', data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'manage'))
+        resp.raise_for_status()
+        return get_job_location(resp)
+
     def do_unmanage(self,url, session, endpoints,force,jobid):
 
         endpoints_list = list()
-        param_dict = dict()
 
         try:
             if endpoints:
-                url = url + '/unmanageRequest'
                 for each_ep in endpoints.split(","):
-                    ip_addr = None
-                    each_ep_dict = dict()
-
                     ep_data = each_ep.split(";")
                     ip_addr = ep_data[0]
                     uuid = ep_data[1]
                     type = ep_data[2]
-                    #Fetch type value from input
-                    type_list = ["Chassis","Rackswitch","ThinkServer","Storage","Rack-Tower"]
-                    if type not in type_list:
-                        raise Exception("Invalid Type Specified")
-                    if type == "ThinkServer": type = "Lenovo ThinkServer"
-                    elif type == "Storage": type = "Lenovo Storage"
-                    elif type == "Rack-Tower": type = "Rack-Tower Server"
-                    each_ep_dict = {"ipAddresses":ip_addr.split("#"),"type":type,"uuid":uuid}
-                    endpoints_list.append(each_ep_dict)
-                param_dict["endpoints"] = endpoints_list
-
-                if force:
-                    if isinstance(force, bool):
-                        param_dict["forceUnmanage"] = force
-                    else:
-                        if force.lower() == "true":
-                            param_dict["forceUnmanage"] = True
-                        else:
-                            param_dict["forceUnmanage"] = False
+                    endpoints_list.append(unmanage_entry(ip_addr.split("#"), uuid, type))
 
-                payload = param_dict
-                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
-                resp.raise_for_status()
-                if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
-                    if "location" in resp.headers._store:
-                        job = resp.headers._store["location"][-1].split("/")[-1]
-                        return job
-                    else:
-                        return None
+                return self.post_unmanage_request(url, session, endpoints_list, force)
             elif jobid:
                 url = url + '/unmanageRequest/jobs/' + str(jobid)
-                resp = session.get(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url,verify=False, timeout=get_timeout(session, 'unmanage'))
                 resp.raise_for_status()
             else:
                 logger.error("Invalid execution of unmanage REST API")
@@ -405,7 +466,27 @@ class lxca_rest(object):
 
         return resp
 
-    def get_jobs(self,url, session,jobid,uuid,state,canceljobid,deletejobid):
+    def post_unmanage_request(self, url, session, endpoints_list, force):
+        '''
+        Post list of unmanageRequest entries made by unmanage_entry, returns job id
+        '''
+        param_dict = dict()
+        param_dict["endpoints"] = endpoints_list
+
+        if force:
+            if isinstance(force, bool):
+                param_dict["forceUnmanage"] = force
+            else:
+                if force.lower() == "true":
+                    param_dict["forceUnmanage"] = True
+                else:
+                    param_dict["forceUnmanage"] = False
+
+        resp = session.post(url + '/unmanageRequest',data = json.dumps(param_dict),verify=False, timeout=get_timeout(session, 'unmanage'))
+        resp.raise_for_status()
+        return get_job_location(resp)
+
+    def get_jobs(self,url, session,jobid,uuid,state,canceljobid,deletejobid, stream=False):
         url = url + '/jobs'
         try:
             if jobid:
@@ -424,18 +505,18 @@ class lxca_rest(object):
                 if state == None and uuid:
                     url = url + '?uuid=' + uuid
 
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'jobs'))
                 resp.raise_for_status()
             elif canceljobid:
                 url = url + '/' + canceljobid
                 payload = {"cancelRequest":"true"}
-                resp = session.put(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
+                resp = session.put(url,data = json.dumps(payload),verify=False, timeout=get_timeout(session, 'jobs'))
                 if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
                     return True
                 resp.raise_for_status()
             elif deletejobid:
                 url = url + '/' + deletejobid
-                resp = session.delete(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.delete(url,verify=False, timeout=get_timeout(session, 'jobs'))
                 if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
                     return True
                 resp.raise_for_status()
@@ -453,7 +534,7 @@ class lxca_rest(object):
                 if state == None and uuid:
                     url = url + '?uuid=' + uuid
 
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'jobs'), stream=stream)
                 resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -467,7 +548,7 @@ class lxca_rest(object):
             url = url + '/' + userid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'users'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -480,7 +561,7 @@ class lxca_rest(object):
             url = url + '?filterWith=' + filter
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'lxcalog'), stream=True)
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -491,11 +572,11 @@ class lxca_rest(object):
         try:
             if uuid:
                 url = url + '/' + uuid
-                resp = session.get(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url,verify=False, timeout=get_timeout(session, 'ffdc'))
                 resp.raise_for_status()
                 if resp.status_code == requests.codes['ok'] or resp.status_code == requests.codes['created'] or resp.status_code == requests.codes['accepted']:
-                    job_info = ast.literal_eval(resp.content)
-                    if "jobURL" in job_info:
+                    job_info = lxca_json.decode_response(resp)
+                    if isinstance(job_info, dict) and "jobURL" in job_info:
                         job = job_info["jobURL"].split("/")[-1]
                         return job
                     else:
@@ -508,6 +589,19 @@ class lxca_rest(object):
             logger.error("Exception occured: %s",re)
             raise re
 
+    def get_ffdc_file(self, url, session, file_name):
+        '''
+        Returns streamed response of collected FFDC archive, body is read by caller in chunks
+        '''
+        url = url + '/ffdc/fileName/' + quote(file_name)
+        try:
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'ffdc'), stream=True)
+            resp.raise_for_status()
+        except HTTPError as re:
+            logger.error("Exception occured: %s",re)
+            raise re
+        return resp
+
     def get_updatepolicy(self, url, session, info,  jobid):
         url = url + '/compliancePolicies'
         try:
@@ -516,7 +610,7 @@ class lxca_rest(object):
                     url = url + "/applicableFirmware"
                 elif info == "RESULTS":
                     url = url + "/persistedResult"
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'updatepolicy'))
                 resp.raise_for_status()
                 return resp
             elif jobid:
@@ -524,12 +618,12 @@ class lxca_rest(object):
                 payload = dict()
                 payload["jobid"] = jobid
 
-                resp = session.get(url, data = json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'updatepolicy'))
                 resp.raise_for_status()
                 return resp
 
             url = url + "?basic_full=full"
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'updatepolicy'))
             resp.raise_for_status()
             return resp
 
@@ -570,7 +664,7 @@ class lxca_rest(object):
             payload['compliance'] = compliance_list
             logger.debug("Reached till before post call")
 
-            resp = session.post(url, data = json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.post(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'updatepolicy'))
             resp.raise_for_status()
             return resp
 
@@ -603,7 +697,7 @@ class lxca_rest(object):
                 else:
                     raise Exception("Invalid argument scope: " + scope)
 
-            resp = session.get(url,verify=False, timeout=3)
+            resp = session.get(url,verify=False, timeout=get_timeout(session, 'updaterepo'))
             resp.raise_for_status()
             return resp
 
@@ -669,7 +763,7 @@ class lxca_rest(object):
             if action == "acquire":
                 payload['type'] = "latest"
 
-            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=3)
+            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'updaterepo'))
             resp.raise_for_status()
             return resp
 
@@ -677,6 +771,33 @@ class lxca_rest(object):
             logger.error("Exception occured: %s",re)
             raise re
 
+    def upload_managementserver_files(self, url, session, jobid, files, progress = None):
+        '''
+        Upload files of import job jobid in one streamed multipart POST, progress(monitor)
+        is called as body is read. Files are closed when the request ends.
+        '''
+        url = url + '/managementServer/updates?action=import&jobid=' + str(jobid)
+        handles = []
+        try:
+            for file in files:
+                handles.append(open(file, 'rb'))
+            m = MultipartEncoder(
+                fields=[('uploadedfile[]', (os.path.basename(file), handle,
+                                            IMPORT_FILE_TYPES[os.path.splitext(os.path.basename(file))[-1]])
+                         ) for file, handle in zip(files, handles)]
+            )
+            monitor = MultipartEncoderMonitor(m, progress or callback)
+            resp = session.post(url, data = monitor, headers={'Content-Type': monitor.content_type}, verify=False,
+                                timeout=get_timeout(session, 'managementserver_import'))
+            resp.raise_for_status()
+        except HTTPError as re:
+            logger.error("Exception occured: %s",re)
+            raise re
+        finally:
+            for handle in handles:
+                handle.close()
+        return resp
+
     def get_managementserver(self, url, session, key, fixids, type):
         url = url + '/managementServer/updates'
         try:
@@ -701,7 +822,7 @@ class lxca_rest(object):
                     if key not in ['all']:
                         url = url + "?key=" + key
 
-            resp = session.get(url,verify=False, timeout=3)
+            resp = session.get(url,verify=False, timeout=get_timeout(session, 'managementserver'))
             resp.raise_for_status()
             return resp
 
@@ -710,6 +831,7 @@ class lxca_rest(object):
             raise re
 
     def set_managementserver(self, url, session, action, files, jobid, fixids):
+        base_url = url
         url = url + '/managementServer/updates'
         try:
             if not action  == None \
@@ -722,15 +844,12 @@ class lxca_rest(object):
                     payload['fixids'] = [fixids]
                 else:
                     raise Exception("Invalid argument apply requires fixids")
-                resp = session.put(url, data=json.dumps(payload), verify=False, timeout=3)
+                resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'managementserver'))
                 return resp
             # Creations of Import job POST
             if not action == None and action == "import":
                 file_list = files.strip().split(",")
-                file_type_dict = {'.txt': 'text/plain',
-                                  '.xml': 'text/xml',
-                                  '.chg': 'application/octet-stream',
-                                  '.tgz': 'application/x-compressed'}
+                file_type_dict = IMPORT_FILE_TYPES
 
                 if jobid == None:
                     url = url + "?action=import"
@@ -743,20 +862,11 @@ class lxca_rest(object):
                                      } for index, file in enumerate(file_list)]
                     payload = {'files' : payload_files}
 
-                    resp = session.post(url, data=json.dumps(payload), verify=False, timeout=120)
+                    resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'managementserver'))
                     return resp
 
                 else :
-                    url = url + "?action=import&jobid=" + jobid
-                    m = MultipartEncoder(
-                        fields=[('uploadedfile[]', (os.path.basename(file),
-                                                    open(file, 'rb'),
-                                                    file_type_dict[os.path.splitext(os.path.basename(file))[-1]])
-                                 ) for file in file_list]
-                    )
-                    monitor = MultipartEncoderMonitor(m, callback)
-                    resp = session.post(url, data = monitor, headers={'Content-Type': monitor.content_type}, verify=False, timeout=6000)
-                    return resp
+                    return self.upload_managementserver_files(base_url, session, jobid, file_list)
 
 
             if not action == None \
@@ -769,7 +879,7 @@ class lxca_rest(object):
                     payload['fixids'] = fixids_list
                 else:
                     raise Exception("Invalid argument key action: acquire requires fixids ")
-                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=3)
+                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'managementserver'))
                 return resp
 
             if not action == None \
@@ -778,7 +888,7 @@ class lxca_rest(object):
 
                 payload = {}
                 payload['mts'] = 'lxca'
-                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=3)
+                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'managementserver'))
                 return resp
 
             if not action == None \
@@ -791,7 +901,7 @@ class lxca_rest(object):
                     raise Exception("Invalid argument key action: delete requires fixids ")
 
                 #url = url + "&key=removeMetadata"
-                resp = session.delete(url,  verify=False, timeout=3)
+                resp = session.delete(url,  verify=False, timeout=get_timeout(session, 'managementserver'))
                 return resp
 
         except HTTPError as re:
@@ -810,7 +920,7 @@ class lxca_rest(object):
 
             # For Query Action
             if mode == None and action == None and server == None and  switch == None and storage == None and cmm == None :
-                resp = session.get(url,verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url,verify=False, timeout=get_timeout(session, 'updatecomp'))
                 resp.raise_for_status()
                 return resp
 
@@ -884,7 +994,7 @@ class lxca_rest(object):
             payload = dict()
             payload["DeviceList"] = [param_dict]
             logger.debug("Update Firmware payload: " + str(payload))
-            resp = session.put(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
+            resp = session.put(url,data = json.dumps(payload),verify=False, timeout=get_timeout(session, 'updatecomp'))
             resp.raise_for_status()
             return resp
 
@@ -892,6 +1002,26 @@ class lxca_rest(object):
             logger.error("Exception occured: %s",re)
             raise re
 
+    def put_updatable_components(self, url, session, action, mode, device_lists):
+        '''
+        PUT DeviceList of many devices, device_lists maps ServerList, SwitchList,
+        StorageList and CMMList to their entries, action is apply, cancelApply or powerState
+        '''
+        url = url + '/updatableComponents?action=' + action
+        if mode:
+            url = url + "&mode=" + mode
+
+        payload = dict()
+        payload["DeviceList"] = [device_lists]
+        logger.debug("Update Firmware payload of %d devices", sum(len(value) for value in list(device_lists.values())))
+        try:
+            resp = session.put(url,data = json.dumps(payload),verify=False, timeout=get_timeout(session, 'updatecomp'))
+            resp.raise_for_status()
+        except HTTPError as re:
+            logger.error("Exception occured: %s",re)
+            raise re
+        return resp
+
     def get_configprofiles(self,url, session, profileid):
         url = url + '/profiles'
         
@@ -899,7 +1029,7 @@ class lxca_rest(object):
             url = url + '/' + profileid
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'configprofiles'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -917,7 +1047,7 @@ class lxca_rest(object):
         try:
             payload = dict()
             payload['profileName'] = profilename
-            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'configprofiles'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -940,7 +1070,7 @@ class lxca_rest(object):
             else:
                 raise Exception("Invalid argument, restart and endpoint ")
 
-            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'configprofiles'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -954,7 +1084,7 @@ class lxca_rest(object):
             url = url + '/' + profileid
 
         try:
-            resp = session.delete(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.delete(url, verify=False, timeout=get_timeout(session, 'configprofiles'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -992,7 +1122,7 @@ class lxca_rest(object):
                         payload['force'] = False
 
         try:
-            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'configprofiles'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -1021,13 +1151,13 @@ class lxca_rest(object):
                 
                 payload = dict()
                 payload = param_dict
-                resp = session.post(url, data = json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+                resp = session.post(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'configpatterns'))
             elif pattern_update_dict:
                 payload = dict()
                 payload = pattern_update_dict
-                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'configpatterns'))
             else:
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'configpatterns'))
                 
             resp.raise_for_status()
         except HTTPError as re:
@@ -1046,7 +1176,7 @@ class lxca_rest(object):
             raise Exception("Invalid argument endpoint uuid is required for config status")
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'configpatterns'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -1061,25 +1191,25 @@ class lxca_rest(object):
         else:
             raise Exception("Invalid argument ID")
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'configtargets'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
     
         return resp  
 
-    def get_tasks(self,url, session):
+    def get_tasks(self,url, session, stream=False):
         url = url + '/tasks'
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'tasks'), stream=stream)
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
             raise re
         return resp
 
-    def get_tasks_list(self,url, session, job_uuid, includeChildren):
+    def get_tasks_list(self,url, session, job_uuid, includeChildren, stream=False):
         url = url + '/tasks'
 
         if job_uuid:
@@ -1087,7 +1217,7 @@ class lxca_rest(object):
             url = url + '?includeChildren=' + includeChildren
 
         try:
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'tasks'), stream=stream)
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1106,7 +1236,7 @@ class lxca_rest(object):
         payload = {'action':action, 'list':job_list}
 
         try:
-            resp = resp = session.put(url, data=json.dumps(payload), verify=False, timeout=5)
+            resp = resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'tasks'))
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1124,7 +1254,7 @@ class lxca_rest(object):
         payload = updated_dict
 
         try:
-            resp = resp = session.put(url, data=json.dumps(payload), verify=False, timeout=5)
+            resp = resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'tasks'))
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1148,9 +1278,9 @@ class lxca_rest(object):
                 
                 payload = dict()
                 payload = param_dict
-                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=REST_TIMEOUT)
+                resp = session.post(url,data = json.dumps(payload),verify=False, timeout=get_timeout(session, 'manifests'))
             else:
-                resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+                resp = session.get(url, verify=False, timeout=get_timeout(session, 'manifests'))
                 
             resp.raise_for_status()
         except HTTPError as re:
@@ -1177,7 +1307,7 @@ class lxca_rest(object):
                     payload = dict()
                     payload = param_dict
 
-                    resp = session.put(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+                    resp = session.put(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'resourcegroups'))
                     resp.raise_for_status()
                     return resp
 
@@ -1203,12 +1333,12 @@ class lxca_rest(object):
                 payload = dict()
                 payload = param_dict
                 
-                resp = session.post(url, data = json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+                resp = session.post(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'resourcegroups'))
                 resp.raise_for_status()
                 return resp
              
             # Default case for get operation   
-            resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'resourcegroups'))
             resp.raise_for_status()
         except HTTPError as re:
             raise re
@@ -1247,7 +1377,7 @@ class lxca_rest(object):
 
         try:
             # print "I'm in lxca_rest get_osimage, url=", url
-            resp = session.get(url, verify=False, timeout=3)    ## It raises HTTPError here
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'osimages'))    ## It raises HTTPError here
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1314,7 +1444,7 @@ class lxca_rest(object):
                     else:
                         url = url + "%s=%s&" %(k,v)
                 url = url.rstrip('&')
-                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=600)
+                resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'osimages_import'))
                 return resp
             else:    # local case
                 for k,v in  list(kwargs.items()):
@@ -1331,7 +1461,7 @@ class lxca_rest(object):
                     #'name':(None,'uploadedfile'),
                     'uploadedfile': ('trail.py', open('/home/naval/trail.py', 'rb'),'text/plain')}
                 #files = {'file': ('trail.py', open('/home/naval/trail.py', 'r'), 'text/plain')}
-                resp = session.post(url, files=files, verify=False, timeout=600)
+                resp = session.post(url, files=files, verify=False, timeout=get_timeout(session, 'osimages_import'))
                 return resp
         # postcall for remoteFileServers DONE
         if 'remoteFileServers' in osimages_info and 'putid' not in kwargs and 'deleteid' not in kwargs:
@@ -1489,7 +1619,7 @@ class lxca_rest(object):
     def get_method(self, url, session, **kwargs):
         resp = None
         try:
-            resp = session.get(url,verify=False, timeout=3)    ## It raises HTTPError here
+            resp = session.get(url,verify=False, timeout=get_timeout(session, 'osimages'))    ## It raises HTTPError here
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1499,7 +1629,7 @@ class lxca_rest(object):
     def put_method(self, url, session, payload, **kwargs):
         resp = None
         try:
-            resp = session.put(url, data = json.dumps(payload), verify=False, timeout=3)    ## It raises HTTPError here
+            resp = session.put(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'osimages'))    ## It raises HTTPError here
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1509,7 +1639,7 @@ class lxca_rest(object):
     def delete_method(self,url, session, payload, **kwargs):
         resp = None
         try:
-            resp = session.delete(url, data = json.dumps(payload), verify=False, timeout=3)    ## It raises HTTPError here
+            resp = session.delete(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'osimages'))    ## It raises HTTPError here
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1519,7 +1649,7 @@ class lxca_rest(object):
     def post_method(self,url, session, payload, **kwargs):
         resp = None
         try:
-            resp = session.post(url, data = json.dumps(payload), verify=False, timeout=3)    ## It raises HTTPError here
+            resp = session.post(url, data = json.dumps(payload), verify=False, timeout=get_timeout(session, 'osimages'))    ## It raises HTTPError here
             resp.raise_for_status()
         except HTTPError as re:
             logger.error("REST API Exception: Exception = %s", re)
@@ -1534,7 +1664,7 @@ class lxca_rest(object):
             url = url + '/' + id
 
         try:
-            resp = session.get(url, verify=False, timeout=3)
+            resp = session.get(url, verify=False, timeout=get_timeout(session, 'rules'))
             # resp = requests.get("http://localhost:8888/rules", headers={"content-type": "application/json"},
             #                      verify=False, timeout=REST_TIMEOUT)
 
@@ -1559,7 +1689,7 @@ class lxca_rest(object):
             payload['targetGroup'] = targetGroup
             payload['content'] = content
 
-            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'rules'))
             #resp = requests.post("http://localhost:8888/rules", headers={"content-type":"application/json"}, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
             resp.raise_for_status()
         except HTTPError as re:
@@ -1577,7 +1707,7 @@ class lxca_rest(object):
         try:
             #resp = session.get(url, verify=False, timeout=REST_TIMEOUT)
             resp = requests.get("http://localhost:8888/compositeResults", headers={"content-type": "application/json"},
-                                 verify=False, timeout=REST_TIMEOUT)
+                                 verify=False, timeout=get_timeout(session, 'compositeResults'))
 
             #resp = requests.get(url, headers={"content-type": "application/json"},
             #                    verify=False, timeout=3)
@@ -1597,7 +1727,7 @@ class lxca_rest(object):
             payload = dict()
             payload['solutionGroup'] = solutionGroup
 
-            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
+            resp = session.post(url, data=json.dumps(payload), verify=False, timeout=get_timeout(session, 'compositeResults'))
             #resp = requests.post("http://localhost:8888/compositeResults", headers={"content-type":"application/json"}, data=json.dumps(payload), verify=False, timeout=REST_TIMEOUT)
             resp.raise_for_status()
         except HTTPError as re:
@@ -0,0 +1,159 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides retry policy with jittered exponential backoff and
+circuit breaker per REST path used by lxcaAdapter.
+'''
+
+import logging
+import random
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+logger = logging.getLogger(__name__)
+
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+BACKOFF_MAX = 30
+
+# Responses worth retrying, appliance is restarting or overloaded
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+RETRY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 30
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class lxca_retry_policy(object):
+    '''
+    Retries of single request.
+
+    Connection failures, where request never reached appliance, are retried for
+    every method. Read timeouts and RETRY_STATUS_CODES are retried only for
+    idempotent methods. Sleep before retry n is random between 0 and
+    backoff_factor * 2 ** n, capped by backoff_max ("full jitter").
+    '''
+
+    def __init__(self, retries = RETRIES, backoff_factor = BACKOFF_FACTOR, backoff_max = BACKOFF_MAX,
+                 status_codes = RETRY_STATUS_CODES, methods = RETRY_METHODS):
+        self.retries = int(retries)
+        self.backoff_factor = float(backoff_factor)
+        self.backoff_max = float(backoff_max)
+        self.status_codes = tuple(status_codes)
+        self.methods = tuple(methods)
+
+    def __repr__(self):
+        return "%s(retries=%s, backoff_factor=%s, backoff_max=%s)" %(self.__class__.__name__,
+                self.retries, self.backoff_factor, self.backoff_max)
+
+    def get_key(self):
+        '''
+        Returns settings of policy, connections share adapter only with equal policies
+        '''
+        return (self.retries, self.backoff_factor, self.backoff_max, self.status_codes, self.methods)
+
+    def is_retryable(self, method, attempt, connect_error = False):
+        if attempt >= self.retries:
+            return False
+        return connect_error or method.upper() in self.methods
+
+    def backoff(self, attempt):
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+class lxca_circuit_breaker(object):
+    '''
+    Circuit breaker per REST path, e.g. /nodes or /updatableComponents.
+
+    After threshold consecutive failures of a path its circuit opens and
+    requests to it fail fast. After reset seconds one trial request is let
+    through (half open), its success closes the circuit, failure opens it again.
+    '''
+
+    def __init__(self, threshold = BREAKER_THRESHOLD, reset = BREAKER_RESET):
+        self.threshold = int(threshold)
+        self.reset = float(reset)
+        self.circuits = dict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_key(url):
+        segments = [segment for segment in urlparse(url).path.split('/') if segment]
+        return '/' + (segments[0] if segments else '')
+
+    def _circuit(self, path):
+        circuit = self.circuits.get(path)
+        if circuit is None:
+            circuit = {'state': CLOSED, 'failures': 0, 'opened': 0, 'rejected': 0,
+                       'opened_at': None, 'trial': False}
+            self.circuits[path] = circuit
+        return circuit
+
+    def allow(self, path):
+        '''
+        Returns True when request to path may be sent
+        '''
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            circuit = self._circuit(path)
+            if circuit['state'] == OPEN:
+                if time.time() - circuit['opened_at'] < self.reset:
+                    circuit['rejected'] += 1
+                    return False
+                circuit['state'] = HALF_OPEN
+                circuit['trial'] = False
+            if circuit['state'] == HALF_OPEN:
+                if circuit['trial']:
+                    circuit['rejected'] += 1
+                    return False
+                circuit['trial'] = True
+            return True
+
+    def is_open(self, path):
+        with self._lock:
+            circuit = self.circuits.get(path)
+            return circuit is not None and circuit['state'] == OPEN
+
+    def record_success(self, path):
+        with self._lock:
+            circuit = self._circuit(path)
+            if circuit['state'] != CLOSED:
+                logger.info("Circuit of %s closed", path)
+            circuit['state'] = CLOSED
+            circuit['failures'] = 0
+            circuit['trial'] = False
+
+    def record_failure(self, path):
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            circuit = self._circuit(path)
+            circuit['failures'] += 1
+            if circuit['state'] == HALF_OPEN or \
+                    (circuit['state'] == CLOSED and circuit['failures'] >= self.threshold):
+                logger.warning("Circuit of %s opened after %d failures", path, circuit['failures'])
+                circuit['state'] = OPEN
+                circuit['opened'] += 1
+                circuit['opened_at'] = time.time()
+                circuit['trial'] = False
+
+    def get_state(self):
+        '''
+        Returns state, consecutive failures, times opened and rejected requests per path
+        '''
+        with self._lock:
+            return dict((path, {'state': circuit['state'],
+                                'failures': circuit['failures'],
+                                'opened': circuit['opened'],
+                                'rejected': circuit['rejected']})
+                        for path, circuit in list(self.circuits.items()))
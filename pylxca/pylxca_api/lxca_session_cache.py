@@ -0,0 +1,115 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides opt-in on-disk cache of LXCA sessions, so short lived
+scripts can reuse session cookie and CSRF token instead of logging in on every run.
+Entries are encrypted with a key derived from the password of the user, cache needs
+optional package cryptography and is disabled without it.
+'''
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.pylxca', 'sessions')
+
+# LXCA drops idle sessions, older entries are not worth a round trip to validate
+SESSION_TTL = 1800
+
+KDF_ITERATIONS = 100000
+
+class lxca_session_cache(object):
+    '''
+    Encrypted session cache, one file per url and user.
+
+    Example:
+
+        cache = lxca_session_cache()
+        con = lxca_connection(url, user, pw, session_cache=cache)
+        con.connect()
+        print(con.session_source)   # 'cache' or 'login'
+    '''
+
+    def __init__(self, path = None, ttl = SESSION_TTL):
+        '''
+        @param path: directory of cache files, defaults to ~/.pylxca/sessions
+        @param ttl: seconds a cached session is reused
+        '''
+        self.path = path or os.getenv('PYLXCA_SESSION_CACHE') or CACHE_DIR
+        self.ttl = float(ttl)
+
+    @staticmethod
+    def available():
+        return Fernet is not None
+
+    def _file(self, url, user):
+        digest = hashlib.sha256(("%s\0%s" %(url, user)).encode('utf-8')).hexdigest()
+        return os.path.join(self.path, digest + '.session')
+
+    def _fernet(self, url, user, passwd):
+        salt = hashlib.sha256(("%s\0%s" %(url, user)).encode('utf-8')).digest()
+        key = hashlib.pbkdf2_hmac('sha256', passwd.encode('utf-8'), salt, KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self, url, user, passwd):
+        '''
+        Returns cached entry dict with 'cookies' and 'csrf', None when there is no valid entry
+        '''
+        if not self.available():
+            logger.warning("Session cache needs package cryptography, logging in")
+            return None
+        name = self._file(url, user)
+        try:
+            with open(name, 'rb') as f:
+                token = f.read()
+        except (IOError, OSError):
+            return None
+
+        try:
+            entry = json.loads(self._fernet(url, user, passwd).decrypt(token, ttl=int(self.ttl)).decode('utf-8'))
+        except (InvalidToken, ValueError):
+            # expired, written with other password or corrupted
+            logger.debug("Discarding cached session of %s at %s", user, url)
+            self.clear(url, user)
+            return None
+        return entry
+
+    def save(self, url, user, passwd, cookies, csrf):
+        '''
+        Stores session cookies (list of dicts) and csrf token, file is readable by owner only
+        '''
+        if not self.available():
+            return False
+        entry = {'cookies': cookies, 'csrf': csrf, 'saved': time.time()}
+        token = self._fernet(url, user, passwd).encrypt(json.dumps(entry).encode('utf-8'))
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(token)
+            os.chmod(tmp, 0o600)
+            os.rename(tmp, self._file(url, user))
+        except (IOError, OSError) as e:
+            logger.warning("Failed to store session cache: %s", e)
+            return False
+        return True
+
+    def clear(self, url, user):
+        try:
+            os.remove(self._file(url, user))
+        except (IOError, OSError):
+            pass
@@ -0,0 +1,163 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides timeout policy for LXCA REST calls. Policy holds separate
+connect and read timeouts per command and an overall deadline per command which bounds
+retries and job polling of that command.
+'''
+
+import copy
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+# Read timeouts of commands which differ from READ_TIMEOUT, keys are lxca_api command names
+# plus 'sessions' and 'aicc' used while connecting and '_import' variants for uploads
+READ_TIMEOUTS = {'sessions': 30,
+                 'aicc': 30,
+                 'managementserver': 120,
+                 'osimages_import': 600,
+                 'managementserver_import': 6000}
+
+# Overall deadline of commands, None means command is bounded only by its request timeouts.
+# Bulk runs of a command have their own deadline named command + '_bulk' (e.g. manage_bulk),
+# deadline of the single command does not bound them.
+DEADLINES = {'manage': 1800}
+
+BULK_SUFFIX = '_bulk'
+
+class DeadlineExceeded(Exception):
+    """This exception is raised when a command runs past its deadline."""
+    pass
+
+class lxca_timeout_policy(object):
+    '''
+    Connect/read timeouts and deadline per command.
+
+    Example:
+
+        policy = lxca_timeout_policy(connect=5, read=120)
+        policy.set('updaterepo', read=300)
+        policy.set('manage', deadline=600)
+        policy.set('manage_bulk', deadline=7200)
+        con = lxca_connection(url, user, pw, timeout_policy=policy)
+
+    or change policy of an existing connection
+
+        con.timeout_policy.set('nodes', connect=3, read=30)
+    '''
+
+    def __init__(self, connect = CONNECT_TIMEOUT, read = READ_TIMEOUT, deadline = None):
+        self.connect = connect
+        self.read = read
+        self.deadline = deadline
+        self.commands = dict()
+        for command, read_timeout in list(READ_TIMEOUTS.items()):
+            self.set(command, read=read_timeout)
+        for command, deadline_value in list(DEADLINES.items()):
+            self.set(command, deadline=deadline_value)
+
+    def __repr__(self):
+        return "%s(connect=%s, read=%s, deadline=%s, commands=%s)" %(self.__class__.__name__,
+                self.connect, self.read, self.deadline, self.commands)
+
+    def copy(self):
+        return copy.deepcopy(self)
+
+    def set(self, command, connect = None, read = None, deadline = None):
+        '''
+        Override timeouts of single command, arguments left None keep current value
+        '''
+        entry = self.commands.setdefault(command, dict())
+        if connect is not None: entry['connect'] = float(connect)
+        if read is not None: entry['read'] = float(read)
+        if deadline is not None: entry['deadline'] = float(deadline)
+
+    def get_deadline(self, command):
+        return self.commands.get(command, {}).get('deadline', self.deadline)
+
+    def get(self, command):
+        '''
+        Returns (connect, read) timeout tuple for command, clamped to remaining deadline
+        '''
+        entry = self.commands.get(command, {})
+        connect = entry.get('connect', self.connect)
+        read = entry.get('read', self.read)
+
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded("Deadline exceeded for command %s" %command)
+            connect = min(connect, left)
+            read = min(read, left)
+        return (connect, read)
+
+default_policy = lxca_timeout_policy()
+
+def get_timeout(session, command):
+    '''
+    Returns (connect, read) timeout for command using policy attached to session
+    '''
+    policy = getattr(session, 'timeout_policy', None) or default_policy
+    return policy.get(command)
+
+# Deadline of command running in current thread
+_local = threading.local()
+
+@contextmanager
+def deadline(seconds, replace = False):
+    '''
+    Bounds everything executed in the block by seconds, None leaves it unbounded.
+    Nested deadlines can only shorten the outer one, unless replace is True which
+    drops the outer one for the block.
+    '''
+    previous = getattr(_local, 'deadline', None)
+    outer = None if replace else previous
+    _local.deadline = outer
+    if seconds is not None:
+        expires = time.time() + float(seconds)
+        if outer is None or expires < outer:
+            _local.deadline = expires
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+def bind(fn):
+    '''
+    Returns fn which runs under deadline of current thread wherever it is called,
+    for work handed to worker threads. Deadline is taken when bind is called.
+    '''
+    expires = getattr(_local, 'deadline', None)
+
+    def _bound(*args, **kwargs):
+        previous = getattr(_local, 'deadline', None)
+        _local.deadline = expires
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.deadline = previous
+    return _bound
+
+def remaining():
+    '''
+    Returns seconds left before deadline of current command, None when there is no deadline
+    '''
+    expires = getattr(_local, 'deadline', None)
+    if expires is None:
+        return None
+    return expires - time.time()
+
+def check_deadline(what = "command"):
+    left = remaining()
+    if left is not None and left <= 0:
+        logger.error("Deadline exceeded while waiting for %s", what)
+        raise DeadlineExceeded("Deadline exceeded while waiting for %s" %what)
@@ -15,6 +15,7 @@ import pylxca.pylxca_api
 from pylxca.pylxca_api.lxca_rest import HTTPError
 from pylxca.pylxca_api.lxca_connection import ConnectionError
 from pylxca.pylxca_cmd.lxca_icommands import InteractiveCommand
+from pylxca.pylxca_cmd import lxca_daemon
 
 logger = logging.getLogger(__name__)
 
@@ -24,13 +25,30 @@ class connect(InteractiveCommand):
 
     USAGE:
         connect -h | --help
-        connect -l <URL> -u <USER> [--noverify]
+        connect -l <URL> -u <USER> [--noverify] [--pool_connections <count>] [--pool_maxsize <size>]
+                [--pool_block <True/False>] [--share_pool <True/False>] [<timeout, retry and cache options>]
     
     OPTIONS:
         -h        This option displays command usage information
         -l, --url    URL of LXCA
         -u, --user    Username to authenticate
         --noverify    Do not verify the server certificate for https URLs
+        --pool_connections    Number of host connection pools to cache (default 10)
+        --pool_maxsize    Maximum number of connections kept open per host (default 10)
+        --pool_block    Wait for a free connection when pool is full (True/False, default False)
+        --share_pool    Share connection pool with other connections to same LXCA and with same
+                        retry and breaker settings (True/False, default False)
+        --connect_timeout    Seconds to wait for TCP connection to LXCA (default 10)
+        --read_timeout    Seconds to wait for LXCA response (default 60)
+        --deadline    Overall seconds allowed for one command including retries and job polling
+        --retries    Number of retries of failed request (default 3)
+        --backoff_factor    Base seconds of jittered exponential backoff between retries (default 0.5)
+        --breaker_threshold    Consecutive failures of REST path which open its circuit (default 5, 0 disables)
+        --breaker_reset    Seconds before open circuit lets trial request through (default 30)
+        --session_cache    Reuse encrypted session stored on disk, True for ~/.pylxca/sessions or cache directory
+        --response_cache    Serve repeated inventory commands from memory for their TTL (True/False)
+        --conditional_get    Revalidate inventory with ETag/Last-Modified instead of full download (default True)
+        --discovery_ttl    Seconds manage reuses devices found by discovery (default 0, disabled)
 
     """
     def handle_command(self, opts, args):
@@ -78,7 +96,7 @@ class connect(InteractiveCommand):
         if out_obj == None:
             self.sprint("Failed to connect given LXCA " )
         else:
-            self.sprint("Connection to LXCA successful")
+            self.sprint("Connection to LXCA successful (session from %s)" %out_obj.session_source)
         return
     
 ###############################################################################
@@ -92,7 +110,7 @@ class disconnect(InteractiveCommand):
         disconnect
     """
     def handle_no_input(self):
-        api = pylxca.pylxca_api.lxca_api()
+        api = lxca_daemon.get_client() or pylxca.pylxca_api.lxca_api()
         if api.disconnect() == True:
             self.sprint("Connection with LXCA closed successfully " )
         else:
@@ -208,14 +226,19 @@ class chassis(InteractiveCommand):
     USAGE:
         chassis -h
         chassis [-u <chassis UUID>] [-v <view filter name>]
+                [--includeAttributes <attributes> | --excludeAttributes <attributes>]
     
     OPTIONS:
         -h        This option displays command usage information
         -u, --uuid    chassis uuid
         -s, --status    chassis manage status (managed/unmanaged)
         -v, --view    view filter name
+        --includeAttributes    comma separated attributes to fetch,
+                defaults to attributes printed by view filter
+        --excludeAttributes    comma separated attributes not to fetch
 
     """    
+    view_projection = True
     
 ###############################################################################
 
@@ -225,7 +248,8 @@ class nodes(InteractiveCommand):
     
     USAGE:
         nodes -h
-        nodes [-u <node UUID>] [-s <managed/unmanaged>] [-c <chassis UUID>] [-v <view filter name>]
+        nodes [-u <node UUID>] [-s <managed/unmanaged>] [-c <chassis UUID>] [-v <view filter name>] [--iterate]
+              [--includeAttributes <attributes> | --excludeAttributes <attributes>]
     
     OPTIONS:
         -h        This option displays command usage information
@@ -233,8 +257,13 @@ class nodes(InteractiveCommand):
         -s, --status    nodes manage status (managed/unmanaged)
         -c, --chassis    chassis uuid
         -v, --view    view filter name
+        --iterate    print nodes as they are received
+        --includeAttributes    comma separated attributes to fetch,
+                defaults to attributes printed by view filter
+        --excludeAttributes    comma separated attributes not to fetch
 
     """
+    view_projection = True
     
 ###############################################################################
 
@@ -246,6 +275,8 @@ class switches(InteractiveCommand):
         switches -h
         switches [-u <switch UUID>] [-c <chassis UUID>] [-v <view filter name>]
         switches  [-u <switch_UUID>] [--ports <port_name>] [--action <action>]
+        switches  --port_map <CSV or JSON file of switch ports> --action <action> [--max_workers <switches at once>]
+        switches [-u <switch UUID>] [--includeAttributes <attributes> | --excludeAttributes <attributes>]
     
     OPTIONS:
         -h            This option displays command usage information
@@ -253,9 +284,17 @@ class switches(InteractiveCommand):
         -c, --chassis    chassis uuid
         --ports        portnames if port is empty lists ports
         --action       enable/disable ports
+        --port_map     CSV file with header row uuid,ports or JSON object of switch uuid to ports.
+                       Ports of each switch are changed by one request, requests of many
+                       switches run at once and result of each port is printed.
+        --max_workers  number of switches changed at once with --port_map
         -v, --view    view filter name
+        --includeAttributes    comma separated attributes to fetch,
+                defaults to attributes printed by view filter
+        --excludeAttributes    comma separated attributes not to fetch
 
     """
+    view_projection = True
 
     def handle_command(self, opts, args):
 
@@ -279,6 +318,14 @@ class switches(InteractiveCommand):
 
         return InteractiveCommand.handle_command(self, opts, args)
 
+    def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # results of bulk port change, one line per port
+            for result in out_obj:
+                self.sprint("%-34s %-10s %-8s %-10s %s" %(result['uuid'], result['port'], result['action'],
+                                                          result['status'], result['message'] or ''))
+        return
+
 
 ###############################################################################
 
@@ -381,7 +428,7 @@ class jobs(InteractiveCommand):
 
     USAGE:
         jobs -h | --help
-        jobs [-i <job id>][-u <uuid of endpoint>][-s <jobs state>]
+        jobs [-i <job id>][-u <uuid of endpoint>][-s <jobs state>][--iterate]
         jobs [-c <cancels the job with specified id>]
         jobs [-d <delete the job with specified id>]
     
@@ -400,6 +447,7 @@ class jobs(InteractiveCommand):
                 Interrupted
         -c, --cancel=    cancel job of specified id
         -d, --delete=    delete job of specified id
+        --iterate    print jobs as they are received
 
     """
     def handle_output(self, out_obj):
@@ -419,14 +467,25 @@ class discover(InteractiveCommand):
     
     USAGE:
         discover [-i <IP Address of endpoint>][-j <job ID>]
+        discover -s <address ranges> [--max_jobs <discovery jobs running at once>]
+                 [--rate <discovery requests started per second>]
     
     OPTIONS:
         -i, --ip       One or more IP addresses for each endpoint to be discovered.
         -j, --job      Job ID of discover request
+        -s, --sweep    Comma separated addresses, CIDR networks (10.240.0.0/22) and
+                       address spans (10.240.0.10-99) to sweep with discovery requests
+        --max_jobs     Number of discovery jobs running at once with --sweep
+        --rate         Discovery requests started per second with --sweep
     
 
     """
     def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # devices found by sweep
+            for device in out_obj:
+                self.sprint("%-16s %-12s %s" %(','.join(device.get('ipAddresses') or []), device.get('type'), device.get('uuid')))
+            return
         if out_obj == None:
             self.sprint("Failed to start Discovery job for selected endpoint " )
         else:
@@ -442,6 +501,10 @@ class manage(InteractiveCommand):
         manage  -i <IP Address of endpoint> -u <user ID to access the endpoint>
                 -p <current password to access the endpoint> [-r <recovery password for the endpoint>]
                 [-f <Force Manage (True/False)>]
+        manage  -e <CSV or JSON file of endpoints> [-u <default user ID>] [-p <default password>]
+                [-r <default recovery password>] [-f <Force Manage (True/False)>]
+                [--max_jobs <discovery and manage jobs running at once>]
+                [--refresh_discovery <True/False>]
         manage  -j <job ID> [-v <view filter name>]
 
     OPTIONS:
@@ -451,13 +514,27 @@ class manage(InteractiveCommand):
         -r, --rpw       The recovery password to be used for the endpoint.
         -j, --job       Job ID of existing manage request
         -f, --force     Force Manage Boolean flag
+        -e, --endpoints CSV file with header row (ip,user,pw,rpw,force) or JSON list of
+                        endpoints, each with its own credentials. Endpoints are discovered
+                        and managed in overlapping batches, result of each is printed.
+        --max_jobs      Number of discovery and manage jobs running at once with --endpoints
+        --refresh_discovery  Discover endpoints again even when they were discovered
+                        within discovery_ttl of connection (True/False)
         -v, --view      view filter name
     """
     def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # results of bulk manage, one line per endpoint
+            for result in out_obj:
+                cached = " (cached discovery)" if result.get('discovery') == 'cache' else ""
+                self.sprint("%-16s %-15s %s%s" %(result['ip'], result['status'], result['message'] or result['uuid'] or '', cached))
+            return
         if out_obj == None:
             self.sprint("Failed to start manage job for selected endpoint " )
         else:
-            self.sprint("Manage job started, jobId = " + out_obj)
+            discovery = getattr(out_obj, 'discovery', None)
+            source = " (discovery from %s)" %discovery if discovery else ""
+            self.sprint("Manage job started, jobId = " + out_obj + source)
         return
     
 class unmanage(InteractiveCommand):
@@ -467,10 +544,12 @@ class unmanage(InteractiveCommand):
     USAGE:
         unmanage -h | --help
         unmanage -i <endpoint information> [--force]
+        unmanage -e <CSV or JSON file of endpoints> [--force] [--max_jobs <requests running at once>]
+                 [--retries <attempts of failed endpoints>]
         unmanage -j <job ID> [-v <view filter name>]
     
     OPTIONS:
-        -e, --ep    one or more endpoints to be unmanaged.
+        -i, --ip    one or more endpoints to be unmanaged.
                 This is comma separated list of multiple endpoints, each endpoint should
                 contain endpoint information separated by semicolon.
                 endpoint's IP Address(multiple addresses should be separated by #), UUID of the endpoint and
@@ -482,10 +561,20 @@ class unmanage(InteractiveCommand):
                     Rack-Tower
         -f, --force     Indicates whether to force the unmanagement of an endpoint (True/False)
         -j, --job       Job ID of unmanage request
+        -e, --endpoints CSV file with header row ip,uuid,type or JSON list of endpoints.
+                        Endpoints are unmanaged in chunks and failed ones are tried
+                        again, result of each is printed.
+        --max_jobs      Number of unmanage requests running at once with --endpoints
+        --retries       Times endpoints of failed request are tried again (default 2)
         -v, --view      View filter name
 
     """
     def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # results of bulk unmanage, one line per endpoint
+            for result in out_obj:
+                self.sprint("%-34s %-10s %s" %(result['uuid'], result['status'], result['message'] or ''))
+            return
         if out_obj == None:
             self.sprint("Failed to start unmanage job for selected endpoint " )
         else:
@@ -499,7 +588,11 @@ class lxcalog(InteractiveCommand):
     Retrieve and Manage information about LXCA Event log.
 
     USAGE:
-        lxcalog [-f < events that apply to the specified filters >]
+        lxcalog [-f < events that apply to the specified filters >] [--iterate]
+
+    OPTIONS:
+        -f, --filter    events that apply to the specified filters
+        --iterate    print events as they are received
 
     """
 ###############################################################################
@@ -510,11 +603,20 @@ class ffdc(InteractiveCommand):
 
     USAGE:
         ffdc [-u <UUID of the target endpoint>]
+        ffdc -u <comma separated UUIDs of endpoints> --directory <directory of archives> [--max_workers <endpoints at once>]
     
     OPTIONS:
         -u, --uuid    <UUID of the target endpoint>
+        --directory   Collect FFDC of all given endpoints at once and download their archives
+                      into this directory, result of each endpoint is printed
+        --max_workers Number of endpoints whose requests run at once with --directory
     """
     def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # results of bulk ffdc, one line per endpoint
+            for result in out_obj:
+                self.sprint("%-34s %-10s %s" %(result['uuid'], result['status'], result['file'] or result['message'] or ''))
+            return
         if out_obj == None:
             self.sprint("Failed to start ffdc job for selected endpoint " )
         else:
@@ -608,6 +710,10 @@ class updatecomp(InteractiveCommand):
         updatecomp [-q <The data to return>] [-v <view filter name>]
         updatecomp  [-m <activate mode>] [-a <action to take>] [-c <information of cmms>] [-w <information of switches>] [-s <information of servers>] [-t <information of storages>]
         updatecomp  -a power [-c <cmms UUID and desired state>] [-w <switches UUID and desired state>]  [-s <servers UUID and desired state>]
+        updatecomp  --updates <CSV or JSON file of updates> [-m <activate mode>] [--component <component name>] [--fixid <Fixid>]
+                    [--wave_size <devices per wave>] [--per_chassis <devices per chassis in a wave>]
+                    [--max_failures <failures before stopping>]
+        updatecomp  -a power --devices <CSV or JSON file of devices> [--state <power state>] [--max_jobs <jobs waited on at once>]
     
     OPTIONS:
         -q, --query     The data to return. This can be one of the following values.
@@ -638,9 +744,31 @@ class updatecomp(InteractiveCommand):
                     CMM: reset
                     Storage:powerOff,powerCycleSoft
 
+        --updates       CSV file with header row uuid,type,component,fixid,chassis or JSON list of updates.
+                        Firmware is applied in waves, each wave is started when updates of previous
+                        one are done, result of each device is printed.
+        --component     Component name for updates which do not name their own
+        --fixid         Fixid for updates which do not name their own
+        --wave_size     Number of devices updated in one wave (default 100)
+        --per_chassis   Number of devices of one chassis updated in one wave (default 1)
+        --max_failures  Failed devices which stop the rollout, fraction of finished devices
+                        when below 1 (default 0.05)
+                        Rollout is aborted when failures exceed it, devices not updated
+                        yet are reported aborted.
+        --devices       CSV file with header row uuid,type,state or JSON list of devices for action = power.
+                        Devices of all types are sent in few powerState requests, result of each is printed.
+        --state         Power state of devices which do not name their own
+        --max_jobs      Number of power jobs waited on at once with --devices
         -v, --view      View filter name
 
     """
+    def handle_output(self, out_obj):
+        if isinstance(out_obj, list):
+            # results of firmware rollout (with wave) or bulk power (with state), one line per device
+            for result in out_obj:
+                self.sprint("%-34s %-22s %-10s %s" %(result['uuid'], result.get('wave') or result.get('state') or '',
+                                                     result['status'], result['message'] or ''))
+        return
 
     
 ###############################################################################
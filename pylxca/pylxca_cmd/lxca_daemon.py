@@ -0,0 +1,382 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: This module provides long running pylxca daemon on a local Unix socket and
+its client. Daemon keeps warm LXCA connections (and everything cached by them) between
+runs of lxca_shell and pyshell scripts, which forward their commands to it when
+PYLXCA_DAEMON_SOCKET is set.
+'''
+
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import types
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+import requests
+
+from pylxca.pylxca_api import lxca_api
+from pylxca.pylxca_api.lxca_rest import HTTPError
+from pylxca.pylxca_api.lxca_connection import Error, ConnectionError
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = 'PYLXCA_DAEMON_SOCKET'
+SOCKET_PATH = os.path.join(os.path.expanduser('~'), '.pylxca', 'pylxcad.sock')
+
+# Warm connections unused for this long are disconnected
+IDLE_TIMEOUT = 900
+
+# Keys of connect which do not change identity of a connection
+_SECRET_KEYS = ('p', 'pw')
+
+# Arguments which name files or directories when given as string, daemon runs in its
+# own working directory so client sends them as absolute paths
+_PATH_KEYS = ('e', 'endpoints', 'updates', 'devices', 'port_map', 'directory')
+
+def _encode(obj):
+    '''
+    JSON encoder for results which are not plain data, e.g. raw Response
+    '''
+    if isinstance(obj, requests.Response):
+        try:
+            return obj.json()
+        except ValueError:
+            return obj.text
+    return str(obj)
+
+def _absolute_paths(dict_handler):
+    '''
+    Returns copy of dict_handler with file and directory arguments made absolute
+    in working directory of the client
+    '''
+    if not isinstance(dict_handler, dict):
+        return dict_handler
+    dict_handler = dict(dict_handler)
+    for key in _PATH_KEYS:
+        if isinstance(dict_handler.get(key), str):
+            dict_handler[key] = os.path.abspath(dict_handler[key])
+    files = dict_handler.get('files')
+    if isinstance(files, str):
+        dict_handler['files'] = ','.join(os.path.abspath(name.strip()) for name in files.split(','))
+    elif isinstance(files, (list, tuple)):
+        dict_handler['files'] = [os.path.abspath(name) for name in files]
+    session_cache = dict_handler.get('session_cache')
+    if isinstance(session_cache, str) and session_cache.lower() not in ("true", "false"):
+        dict_handler['session_cache'] = os.path.abspath(session_cache)
+    return dict_handler
+
+def _is_listening(path):
+    '''
+    True when a process accepts connections on Unix socket at path
+    '''
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except (IOError, OSError, socket.error):
+        return False
+    finally:
+        sock.close()
+    return True
+
+class _connection_entry(object):
+
+    def __init__(self, key, con, secret):
+        self.key = key
+        self.con = con
+        self.secret = secret
+        self.used = time.time()
+
+class lxca_daemon(object):
+    '''
+    Holds warm connections by connect arguments and runs forwarded commands on them.
+
+    Example:
+
+        lxca_shell --daemon [socket path]
+    '''
+
+    def __init__(self, path = None, idle_timeout = IDLE_TIMEOUT):
+        self.path = path or os.getenv(SOCKET_ENV) or SOCKET_PATH
+        self.idle_timeout = idle_timeout
+        self.cons = dict()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _connect(self, dict_handler):
+        dict_handler = dict(dict_handler or {})
+        password = next((item for item in [dict_handler.get('p'), dict_handler.get('pw')] if item is not None), '')
+        identity = dict((k, v) for k, v in list(dict_handler.items()) if k not in _SECRET_KEYS)
+        key = hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+        secret = hashlib.sha256((key + password).encode('utf-8')).hexdigest()
+
+        with self._lock:
+            entry = self.cons.get(key)
+        if entry is None or entry.secret != secret:
+            con = lxca_api().api('connect', dict_handler)
+            if con is None:
+                raise ConnectionError("Failed to connect %s" %identity.get('url', identity.get('l')))
+            entry = _connection_entry(key, con, secret)
+            with self._lock:
+                old = self.cons.get(key)
+                self.cons[key] = entry
+            if old is not None:
+                old.con.disconnect()
+            source = con.session_source
+        else:
+            source = 'daemon'
+        entry.used = time.time()
+        return {'key': key, 'url': entry.con.get_url(), 'user': entry.con.user, 'session_source': source}
+
+    def run_command(self, request, client = None):
+        '''
+        Runs one forwarded request and returns response dict. client is dict kept per
+        client socket, its 'con' is key of last connection the client connected, used
+        when request names no connection.
+        '''
+        if client is None:
+            client = dict()
+        command = request.get('command')
+        try:
+            if command == 'ping':
+                return {'result': True}
+            if command == 'connect':
+                info = self._connect(request.get('args'))
+                client['con'] = info['key']
+                return {'result': info}
+
+            key = request.get('con') or client.get('con')
+            with self._lock:
+                entry = self.cons.get(key)
+            if entry is None:
+                raise ConnectionError("Connection is not Initialized.")
+            entry.used = time.time()
+            try:
+                result = lxca_api().api(command, request.get('args'), entry.con)
+                if isinstance(result, types.GeneratorType):
+                    # records of iterating command are sent as one list
+                    return {'result': list(result), 'records': True}
+                return {'result': result}
+            except ConnectionError:
+                # lxca_api disconnected it, next connect logs in again
+                with self._lock:
+                    if self.cons.get(key) is entry:
+                        del self.cons[key]
+                raise
+        except HTTPError as e:
+            response = getattr(e, 'response', None)
+            return {'error': {'type': 'HTTPError', 'message': str(e),
+                              'status': getattr(response, 'status_code', None),
+                              'content': getattr(response, 'text', None)}}
+        except Exception as e:
+            logger.error("Forwarded command %s failed: %s", command, e)
+            return {'error': {'type': e.__class__.__name__, 'message': str(e)}}
+
+    def reap(self):
+        '''
+        Disconnect connections idle for more than idle_timeout
+        '''
+        now = time.time()
+        with self._lock:
+            idle = [key for key, entry in list(self.cons.items()) if now - entry.used > self.idle_timeout]
+            entries = [self.cons.pop(key) for key in idle]
+        for entry in entries:
+            logger.debug("Disconnecting idle connection %s", entry.key)
+            try:
+                entry.con.disconnect()
+            except Exception as e:
+                logger.debug("Disconnect failed: %s", e)
+
+    def _reaper(self):
+        while self._server is not None:
+            time.sleep(min(60, self.idle_timeout))
+            self.reap()
+
+    def serve_forever(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        if os.path.exists(self.path):
+            if _is_listening(self.path):
+                raise Error("pylxca daemon is already listening on %s" %self.path)
+            # left behind by daemon which did not shut down cleanly
+            os.remove(self.path)
+
+        daemon = self
+
+        class handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                client = dict()
+                for line in iter(self.rfile.readline, b''):
+                    try:
+                        request = json.loads(line.decode('utf-8'))
+                    except ValueError:
+                        break
+                    response = daemon.run_command(request, client)
+                    self.wfile.write(json.dumps(response, default=_encode).encode('utf-8') + b'\n')
+                    self.wfile.flush()
+
+        class server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        old_umask = os.umask(0o177)
+        try:
+            self._server = server(self.path, handler)
+        finally:
+            os.umask(old_umask)
+        reaper = threading.Thread(target=self._reaper)
+        reaper.daemon = True
+        reaper.start()
+        logger.info("pylxca daemon listening on %s", self.path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.server_close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        with self._lock:
+            entries = list(self.cons.values())
+            self.cons.clear()
+        for entry in entries:
+            try:
+                entry.con.disconnect()
+            except Exception:
+                pass
+
+class lxca_daemon_connection(object):
+    '''
+    Client side handle of a connection held by daemon
+    '''
+
+    def __init__(self, key, url, user, session_source):
+        self.key = key
+        self.url = url
+        self.user = user
+        self.session_source = session_source
+
+    def __repr__(self):
+        return "%s(%s, %s)" %(self.__class__.__name__, repr(self.url), self.user)
+
+    def get_url(self):
+        return self.url
+
+class lxca_daemon_client(object):
+    '''
+    Forwards commands to daemon over one persistent socket connection
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.con = None
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _open(self):
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(self.path)
+            self._file = self._sock.makefile('rb')
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+
+    def request(self, command, dict_handler = None, con = None):
+        message = {'command': command, 'args': _absolute_paths(dict_handler),
+                   'con': con.key if isinstance(con, lxca_daemon_connection) else None}
+        with self._lock:
+            try:
+                self._open()
+                self._sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+                line = self._file.readline()
+            except (IOError, OSError, socket.error):
+                self.close()
+                raise
+            if not line:
+                self.close()
+                raise ConnectionError("pylxca daemon closed connection")
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            _raise(response['error'])
+        if response.get('records'):
+            return (record for record in response['result'])
+        return response['result']
+
+    def api(self, object_name, dict_handler = None, con = None):
+        if object_name == 'connect':
+            info = self.request('connect', dict_handler)
+            self.con = lxca_daemon_connection(info['key'], info['url'], info['user'], info['session_source'])
+            return self.con
+        return self.request(object_name, dict_handler, con or self.con)
+
+    def disconnect(self):
+        # connection stays warm in daemon, client only forgets it
+        self.con = None
+        return True
+
+def _raise(error):
+    if error['type'] == 'HTTPError':
+        response = requests.Response()
+        response.status_code = error.get('status')
+        response._content = (error.get('content') or '').encode('utf-8')
+        raise HTTPError(error['message'], response=response)
+    if error['type'] == 'ConnectionError':
+        raise ConnectionError(error['message'])
+    raise Error("%s: %s" %(error['type'], error['message']))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    '''
+    Returns client of daemon named by PYLXCA_DAEMON_SOCKET, None when commands run in process
+    '''
+    global _client
+    path = os.getenv(SOCKET_ENV)
+    if not path or not hasattr(socket, 'AF_UNIX'):
+        return None
+    with _client_lock:
+        if _client is None or _client.path != path:
+            client = lxca_daemon_client(path)
+            try:
+                client.request('ping')
+            except Exception as e:
+                logger.warning("pylxca daemon at %s is not reachable, running commands in process: %s", path, e)
+                return None
+            _client = client
+    return _client
+
+def main(path = None):
+    daemon = lxca_daemon(path)
+    # SIGTERM ends serve_forever the same way as ctrl+c, socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Error as e:
+        logger.error("%s", e)
+        sys.exit(e)
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -9,20 +9,43 @@ implementation for all command classes
 '''
 
 import sys,getopt,os,json,logging, traceback
+import types
 
 from pylxca.pylxca_api import lxca_api
 from pylxca.pylxca_api.lxca_rest import HTTPError
 from pylxca.pylxca_api.lxca_connection import ConnectionError
 from pylxca.pylxca_cmd import lxca_view
+from pylxca.pylxca_cmd import lxca_daemon
 
 cmd_data_json_file   = "lxca_cmd_data.json"
 pylxca_cmd_data   = os.path.join(os.getenv('PYLXCA_CMD_PATH'), cmd_data_json_file)
 
+# Command data is read once and shared by all command objects
+_command_data = None
+
+def load_command_data():
+    global _command_data
+    if _command_data is None:
+        with open(pylxca_cmd_data, 'r') as fp:
+            _command_data = json.load(fp)
+    return _command_data
+
+def call_api(object_name, dict_handler = None, con = None):
+    '''
+    Runs command in pylxca daemon when PYLXCA_DAEMON_SOCKET names one, in process otherwise
+    '''
+    client = lxca_daemon.get_client()
+    if client:
+        return client.api(object_name, dict_handler, con)
+    return lxca_api().api(object_name, dict_handler, con)
+
 class InteractiveCommand(object):
+    # inventory commands which fetch only attributes printed by their view filter
+    view_projection = False
+
     def __init__(self, shell=None ):
         self.shell = shell
-        fp = open(pylxca_cmd_data, 'r')
-        self.command_data = json.load(fp)
+        self.command_data = load_command_data()
 
     def get_options(self):
         return {}
@@ -59,8 +82,8 @@ class InteractiveCommand(object):
         #no_opt action can differ command to command so override this function if required
         obj = None
         try:
-            api = lxca_api()
-            obj = api.api(self.get_name(), None,con_obj)
+            # commands with view projection fetch only attributes of default view
+            obj = call_api(self.get_name(), self.add_view_projection(dict()) or None, con_obj)
         except ConnectionError:
             self.sprint("Connection is not Initialized, Try connect")
         except RuntimeError:
@@ -71,10 +94,23 @@ class InteractiveCommand(object):
     
     def handle_input(self, dict_handler,con_obj = None):
         obj = None
-        api = lxca_api()
-        obj = api.api(self.get_name(),dict_handler,con_obj)
+        obj = call_api(self.get_name(), dict_handler, con_obj)
         return obj
     
+    def add_view_projection(self, dict_handler, view_filter = "default"):
+        '''
+        Add includeAttributes derived from view filter unless projection was given explicitly
+        '''
+        if not self.view_projection or 'includeAttributes' in dict_handler or 'excludeAttributes' in dict_handler:
+            return dict_handler
+        attributes = lxca_view.lxca_view().get_view_attributes(self.get_name(), view_filter)
+        if attributes:
+            # objects are told apart by uuid, e.g. single node response from list response
+            if 'uuid' not in attributes:
+                attributes.append('uuid')
+            dict_handler['includeAttributes'] = ','.join(attributes)
+        return dict_handler
+
     def show_output(self, py_obj,view_filter = "default"):
 
         ostream = sys.__stdout__
@@ -118,12 +154,13 @@ class InteractiveCommand(object):
                 out_obj = self.handle_no_input(con_obj)
             else:
                 opt_dict = self.parse_args(opts, argv)
-                out_obj = self.handle_input(opt_dict,con_obj)
                 if opt_dict:
                     view_filter = next((item for item in [opt_dict.get('v') , opt_dict.get('view')] if item is not None),'default')
+                opt_dict = self.add_view_projection(opt_dict, view_filter)
+                out_obj = self.handle_input(opt_dict,con_obj)
         
             if out_obj:
-                if isinstance(out_obj, dict):
+                if isinstance(out_obj, (dict, types.GeneratorType)):
                     self.show_output(out_obj,view_filter)
                 else:
                     self.handle_output(out_obj)
@@ -88,8 +88,55 @@ def connect(*args, **kwargs):
         pw           Password to Authenticate Lenovo XClarity Administrator
         noverify     flag to indicate to not verify server certificate
 
+    Optional connection pool parameters
+
+        pool_connections   number of host pools to cache (default 10)
+        pool_maxsize       maximum connections kept open per host (default 10)
+        pool_block         "True" to wait for a free connection instead of opening extra ones
+        share_pool         "True" to share one pool with other connections to same LXCA
+
+    Optional timeout parameters
+
+        connect_timeout    seconds to wait for TCP connection (default 10)
+        read_timeout       seconds to wait for response (default 60)
+        deadline           overall seconds allowed for one command including job polling
+                           (default none, manage 1800), con.timeout_policy.set() tunes single commands
+
+    Optional retry parameters
+
+        retries            retries of failed request, GETs are retried on 5xx and timeouts (default 3)
+        backoff_factor     base seconds of jittered exponential backoff (default 0.5)
+        breaker_threshold  consecutive failures of REST path opening its circuit (default 5)
+        breaker_reset      seconds before open circuit lets trial request through (default 30)
+
+    Optional session cache parameter
+
+        session_cache      "True" to reuse encrypted session stored in ~/.pylxca/sessions
+                           or cache directory, needs package cryptography,
+                           con.session_source tells if session came from 'cache' or 'login'
+
+    Optional response cache parameter
+
+        response_cache     "True" to serve repeated inventory commands (nodes, chassis,
+                           switches, ...) from memory for 60 seconds, mutating commands
+                           invalidate what they change
+
+        conditional_get    "False" to always download whole inventory, by default repeated
+                           inventory commands send If-None-Match/If-Modified-Since and reuse
+                           remembered object on 304, con.get_validator_stats() shows bytes saved
+
+        discovery_ttl      seconds manage reuses devices found by discovery instead of
+                           discovering them again, e.g. "300" (default "0", disabled),
+                           con.get_discovery_stats() shows cache hits
+
 @example 
     con1 = connect( con = "https://10.243.12.142",user = "USERID", pw = "Password", noverify = "True")
+    con2 = connect("https://10.243.12.142", "USERID", "Password", "True", pool_maxsize = "32", share_pool = "True")
+    print(con2.get_pool_stats())
+    con3 = connect("https://10.243.12.142", "USERID", "Password", "True", read_timeout = "120", deadline = "600")
+    print(con3.get_retry_stats())
+    con4 = connect("https://10.243.12.142", "USERID", "Password", "True", session_cache = "True")
+    print(con4.session_source)
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
@@ -152,7 +199,7 @@ def cmms(*args, **kwargs):
     The parameters for this command are as follows 
     
     con       Connection Object to Lenovo XClarity Administrator
-    uuid      cmm uuid
+    uuid      cmm uuid, list of uuids returns dict uuid -> object
     chassis   chassis uuid  
 
 @example 
@@ -187,14 +234,16 @@ def chassis(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','uuid','status']
+        keylist = ['con','uuid','status','includeAttributes','excludeAttributes']
 
 @param
     The parameters for this command are as follows 
     
     con        Connection Object to Lenovo XClarity Administrator
-    uuid       chassis uuid
+    uuid       chassis uuid, list of uuids returns dict uuid -> object
     status     chassis manage status (managed/unmanaged)
+    includeAttributes   attributes to fetch, comma separated string or list
+    excludeAttributes   attributes not to fetch, comma separated string or list
     
 
 @example 
@@ -206,8 +255,8 @@ def chassis(*args, **kwargs):
     con = None
 
     long_short_key_map = {'uuid': 'u', 'status': 's'}
-    keylist = ['con','uuid','status']
-    optional_keylist = ['con', 'uuid','status']
+    keylist = ['con','uuid','status','includeAttributes','excludeAttributes']
+    optional_keylist = ['con', 'uuid','status','includeAttributes','excludeAttributes']
     mutually_exclusive_keys = []
     mandatory_options_list = {}
 
@@ -234,7 +283,7 @@ def fans(*args, **kwargs):
     The parameters for this command are as follows 
     
     con           Connection Object to Lenovo XClarity Administrator
-    uuid          uuid of fan
+    uuid          uuid of fan, list of uuids returns dict uuid -> object
     chassis       chassis uuid
     
 @example 
@@ -274,7 +323,7 @@ def fanmuxes(*args, **kwargs):
     The parameters for this command are as follows 
     
     con           Connection Object to Lenovo XClarity Administrator
-    uuid          uuid of fanmux
+    uuid          uuid of fanmux, list of uuids returns dict uuid -> object
     chassis       chassis uuid
     
 @example 
@@ -309,17 +358,26 @@ def nodes(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','uuid','chassis','status']
+        keylist = ['con','uuid','chassis','status','iterate','includeAttributes','excludeAttributes']
 
 @param
     The parameters for this command are as follows 
     
     con           Connection Object to Lenovo XClarity Administrator
-    uuid          uuid of node
+    uuid          uuid of node, list of uuids returns dict uuid -> object
     chassis       chassis uuid
     status        nodes manage status (managed/unmanaged)
+    iterate       True returns generator yielding one node at a time
+    includeAttributes   attributes to fetch, comma separated string or list
+    excludeAttributes   attributes not to fetch, comma separated string or list
     
 @example 
+    for node in nodes(con, iterate=True):
+        print(node['uuid'])
+
+    nodes(con, includeAttributes=['uuid', 'name', 'machineType', 'status'])
+
+    by_uuid = nodes(con, uuid=uuid_list)
     
     '''
     global shell_obj
@@ -328,8 +386,8 @@ def nodes(*args, **kwargs):
     con = None
 
     long_short_key_map = {'uuid':'u' , 'chassis':'c', 'status':'s'}
-    keylist = ['con','uuid','chassis','status']
-    optional_keylist = ['con', 'uuid', 'chassis','status']
+    keylist = ['con','uuid','chassis','status','iterate','includeAttributes','excludeAttributes']
+    optional_keylist = ['con', 'uuid', 'chassis','status','iterate','includeAttributes','excludeAttributes']
     mutually_exclusive_keys = ['uuid', 'chassis']
     mandatory_options_list = {}
 
@@ -350,18 +408,26 @@ def switches(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','uuid','chassis','ports','action']
+        keylist = ['con','uuid','chassis','ports','action','port_map','max_workers','includeAttributes','excludeAttributes']
 
 @param
     The parameters for this command are as follows 
     
     con      Connection Object to Lenovo XClarity Administrator
-    uuid          uuid of switch
+    uuid          uuid of switch, list of uuids returns dict uuid -> object
     chassis       chassis uuid
     ports         empty ports string list all ports for uuid, comma separated ports
     action        enable/disable ports
+    port_map      dict of switch uuid to list or comma separated string of ports, or path
+                  of CSV/JSON file of them. Ports of each switch are changed by one request,
+                  requests of many switches run at once and list of per port results is returned.
+    max_workers   number of switches changed at once with port_map
+    includeAttributes   attributes to fetch, comma separated string or list
+    excludeAttributes   attributes not to fetch, comma separated string or list
     
 @example 
+
+        results = switches(con=con1,port_map={'7A1B...': ['1','2'], '8C2D...': 'A1,A2'},action='disable')
     
     '''
     global shell_obj
@@ -371,9 +437,9 @@ def switches(*args, **kwargs):
     con = None
 
     long_short_key_map = {'uuid': 'u', 'chassis': 'c'}  # other parameter don't have short option
-    keylist = ['con', 'uuid', 'chassis', 'ports', 'action']
-    optional_keylist = ['con', 'uuid', 'chassis', 'ports', 'action']
-    mutually_exclusive_keys = ['uuid', 'chassis']
+    keylist = ['con', 'uuid', 'chassis', 'ports', 'action', 'port_map', 'max_workers', 'includeAttributes', 'excludeAttributes']
+    optional_keylist = ['con', 'uuid', 'chassis', 'ports', 'action', 'port_map', 'max_workers', 'includeAttributes', 'excludeAttributes']
+    mutually_exclusive_keys = ['uuid', 'chassis', 'port_map']
     mandatory_options_list = {}
 
     con = _validate_param(keylist, long_short_key_map, mandatory_options_list, optional_keylist, mutually_exclusive_keys,
@@ -399,7 +465,7 @@ def powersupplies(*args, **kwargs):
     The parameters for this command are as follows 
     
     con      Connection Object to Lenovo XClarity Administrator
-    uuid          uuid of power supply
+    uuid          uuid of power supply, list of uuids returns dict uuid -> object
     chassis       chassis uuid
     
 @example 
@@ -473,7 +539,7 @@ def discover(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','ip','job']
+        keylist = ['con','ip','job','sweep','max_jobs','rate','iterate']
 
 @param
     The parameters for this command are as follows 
@@ -481,6 +547,12 @@ def discover(*args, **kwargs):
     con    Connection Object to Lenovo XClarity Administrator
     ip     One or more IP addresses for each endpoint to be discovered.
     job    Job ID of discover request
+    sweep  Addresses, CIDR networks (10.240.0.0/22) and address spans
+           (10.240.0.10-99) to sweep, comma separated string or list.
+           Returns list of discovered devices.
+    max_jobs  number of discovery jobs running at once with sweep
+    rate      discovery requests started per second with sweep
+    iterate   True with sweep returns generator yielding devices as they are discovered
 
 
 @example
@@ -488,6 +560,11 @@ def discover(*args, **kwargs):
     For Getting Maangement job status
         
         job_data = discover(con=con1,job=jobid)
+
+    For sweeping address ranges
+
+        for device in discover(con=con1,sweep='10.240.0.0/22,10.241.5.10-90',iterate=True):
+            print(device['ipAddresses'])
             
     '''
     global shell_obj
@@ -495,10 +572,10 @@ def discover(*args, **kwargs):
     param_dict = {}
     con = None
 
-    long_short_key_map = {'ip': 'i', 'job': 'j'}
-    keylist = ['con','ip','job']
-    optional_keylist = ['con', 'ip','job']
-    mutually_exclusive_keys = ['ip','job']
+    long_short_key_map = {'ip': 'i', 'job': 'j', 'sweep': 's'}
+    keylist = ['con','ip','job','sweep','max_jobs','rate','iterate']
+    optional_keylist = ['con', 'ip','job','sweep','max_jobs','rate','iterate']
+    mutually_exclusive_keys = ['ip','job','sweep']
     mandatory_options_list = {}
 
     con = _validate_param(keylist, long_short_key_map, mandatory_options_list, optional_keylist, mutually_exclusive_keys,
@@ -517,7 +594,7 @@ def manage(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','ip','user','pw','rpw','job','force']
+        keylist = ['con','ip','user','pw','rpw','job','force','endpoints','max_jobs','refresh_discovery']
 
 @param
     The parameters for this command are as follows 
@@ -529,6 +606,15 @@ def manage(*args, **kwargs):
         rpw      The recovery password to be used for the endpoint.
         force     force manage
         job       Job ID of existing manage request
+        endpoints list of endpoint dicts (keys ip, user, pw and optional rpw, force) or
+                  path of CSV/JSON file of them. Endpoints are discovered and managed in
+                  overlapping batches, user, pw and rpw are defaults for endpoints
+                  without their own. Returns list of results per endpoint.
+        max_jobs  number of discovery and manage jobs running at once with endpoints
+        refresh_discovery  True to discover endpoints again even when they were
+                  discovered within discovery_ttl of connection. Result of each
+                  endpoint tells in discovery if it came from 'cache' or 'job', so
+                  does attribute discovery of job id returned for single endpoint.
         
         Note : mp, type and epuuid parameters are dedpriciated and only kept for backword compatibility. 
 
@@ -543,6 +629,12 @@ def manage(*args, **kwargs):
     For Getting Maangement job status
         
         manage_data = manage(con=con1,job=jobid)
+
+    For managing many endpoints
+
+        results = manage(con=con1,endpoints=[{'ip':'10.243.6.68','user':'USERID','pw':'PASSW0RD'},
+                                             {'ip':'10.243.6.69','user':'ADMIN','pw':'Secret1'}])
+        results = manage(con=con1,endpoints='datacenter2.csv',max_jobs=8)
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
@@ -550,11 +642,11 @@ def manage(*args, **kwargs):
     param_dict = {}
     con = None
 
-    long_short_key_map = {'ip': 'i', 'user':'u', 'pw':'p', 'rpw':'r', 'job': 'j', 'force':'f'}
-    keylist = ['con','ip','user','pw','rpw','job','force']
-    optional_keylist = ['con', 'ip','user','pw','rpw','job','force']
-    mutually_exclusive_keys = ['ip', 'job']
-    mandatory_options_list = {'ip':['user','pw'], 'job':[]}
+    long_short_key_map = {'ip': 'i', 'user':'u', 'pw':'p', 'rpw':'r', 'job': 'j', 'force':'f', 'endpoints':'e'}
+    keylist = ['con','ip','user','pw','rpw','job','force','endpoints','max_jobs','refresh_discovery']
+    optional_keylist = ['con', 'ip','user','pw','rpw','job','force','endpoints','max_jobs','refresh_discovery']
+    mutually_exclusive_keys = ['ip', 'job', 'endpoints']
+    mandatory_options_list = {'ip':['user','pw'], 'job':[], 'endpoints':[]}
 
     con = _validate_param(keylist, long_short_key_map, mandatory_options_list, optional_keylist, mutually_exclusive_keys,
                           param_dict, *args, **kwargs)
@@ -574,7 +666,7 @@ def unmanage(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','ip','force','job']
+        keylist = ['con','ip','force','job','endpoints','max_jobs','retries']
 
 @param
     The parameters for this command are as follows 
@@ -591,19 +683,27 @@ def unmanage(*args, **kwargs):
                           Rack-Tower
         force       Indicates whether to force the unmanagement of an endpoint (True/False)
         job         Job ID of unmanage request
+        endpoints   list of endpoint dicts with keys ip, uuid and type (or 'ip;uuid;type'
+                    strings), or path of CSV/JSON file of them. Endpoints are unmanaged in
+                    chunks and only endpoints of failed chunks are tried again.
+                    Returns list of results per endpoint.
+        max_jobs    number of unmanage requests running at once with endpoints
+        retries     times endpoints of failed request are tried again (default 2)
 
 @example 
 
+        results = unmanage(con=con1,endpoints=[{'ip':'10.243.6.68','uuid':'8C0C...','type':'Rack-Tower'}],force=True)
+
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
     param_dict = {}
     con = None
 
-    long_short_key_map = {'ip': 'i', 'job': 'j', 'force': 'f'}
-    keylist = ['con','ip','force','job']
-    optional_keylist = ['con', 'ip','force','job']
-    mutually_exclusive_keys = ['ip', 'job']
+    long_short_key_map = {'ip': 'i', 'job': 'j', 'force': 'f', 'endpoints': 'e'}
+    keylist = ['con','ip','force','job','endpoints','max_jobs','retries']
+    optional_keylist = ['con', 'ip','force','job','endpoints','max_jobs','retries']
+    mutually_exclusive_keys = ['ip', 'job', 'endpoints']
     mandatory_options_list = {}
 
     con = _validate_param(keylist, long_short_key_map, mandatory_options_list, optional_keylist, mutually_exclusive_keys,
@@ -889,7 +989,9 @@ def updatecomp(*args, **kwargs):
     
     USAGE:
 
-        keylist = ['con','query','mode','action','cmm','switch','server','storage']
+        keylist = ['con','query','mode','action','cmm','switch','server','storage',
+                   'updates','component','fixid','wave_size','per_chassis','max_failures','on_error',
+                   'devices','state','max_jobs']
 
 @param
     The parameters for this command are as follows 
@@ -925,10 +1027,32 @@ def updatecomp(*args, **kwargs):
                     CMM: reset
                     Storage:powerOff,powerCycleSoft
 
-
+    updates         list of update dicts with keys uuid, type, component, fixid and chassis
+                    (or 'uuid,fixid,component' strings), or path of CSV/JSON file of them.
+                    Firmware is applied in waves and list of per device results is returned.
+    component       component name for updates which do not name their own
+    fixid           fixid for updates which do not name their own
+    wave_size       number of devices updated in one wave (default 100)
+    per_chassis     number of devices of one chassis updated in one wave (default 1)
+    max_failures    failed devices which stop the rollout, fraction of finished devices
+                    when below 1 (default 0.05)
+    on_error        abort (default), rollout stops when failures exceed max_failures and devices
+                    not updated yet are reported aborted. To pause and resume a rollout use
+                    lxca_firmware_rollout of pylxca.pylxca_api.lxca_bulk_firmware.
+
+    devices         for action = power, dict of device type (server, switch, storage, cmm) to list of
+                    UUIDs or 'UUID,powerState' strings, or list of dicts with keys uuid, type and state,
+                    or path of CSV/JSON file of them. Lists given as server, switch, storage or cmm
+                    are taken the same way. Devices are sent in few powerState requests and list
+                    of per device results is returned.
+    state           power state of devices which do not name their own
+    max_jobs        number of power jobs waited on at once
 
 @example 
 
+        results = updatecomp(con=con1,updates='fleet_updates.csv',mode='delayed',wave_size=200,per_chassis=2)
+        results = updatecomp(con=con1,action='power',server=rack_uuids,state='powerCycleSoft')
+
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
@@ -937,9 +1061,13 @@ def updatecomp(*args, **kwargs):
     con = None
     long_short_key_map = {'query': 'q', 'mode': 'm', 'action': 'a', 'cmm': 'c', 'switch': 'w','server':'s',
                           'storage':'t'}
-    keylist = ['con', 'query','mode','action','cmm','switch','server','storage']
-    optional_keylist = ['con', 'query','mode','action','cmm','switch','server','storage']
-    mutually_exclusive_keys = []
+    keylist = ['con', 'query','mode','action','cmm','switch','server','storage',
+               'updates','component','fixid','wave_size','per_chassis','max_failures','on_error',
+               'devices','state','max_jobs']
+    optional_keylist = ['con', 'query','mode','action','cmm','switch','server','storage',
+                        'updates','component','fixid','wave_size','per_chassis','max_failures','on_error',
+                        'devices','state','max_jobs']
+    mutually_exclusive_keys = ['query','updates','devices']
     mandatory_options_list = {}
 
     con = _validate_param(keylist, long_short_key_map, mandatory_options_list, optional_keylist, mutually_exclusive_keys,
@@ -1001,15 +1129,20 @@ def ffdc(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','uuid']
+        keylist = ['con','uuid','directory','max_workers']
 
 @param
     The parameters for this command are as follows 
     
-        uuid    UUID of the target endpoint
+        uuid        UUID of the target endpoint, list of UUIDs collects from all of them
+        directory   collect FFDC of all given endpoints at once and stream their archives
+                    into this directory, list of per endpoint results is returned
+        max_workers number of endpoints whose requests run at once with directory
 
 @example 
 
+        results = ffdc(con=con1,uuid=['7A1B...','8C2D...'],directory='/var/tmp/ffdc')
+
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
@@ -1017,8 +1150,8 @@ def ffdc(*args, **kwargs):
     param_dict = {}
     con = None
     long_short_key_map = {'uuid':'u'}
-    keylist = ['con','uuid']
-    optional_keylist = ['con', 'uuid']
+    keylist = ['con','uuid','directory','max_workers']
+    optional_keylist = ['con', 'uuid','directory','max_workers']
     mutually_exclusive_keys = []
     mandatory_options_list = {}
 
@@ -1071,14 +1204,17 @@ def lxcalog(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','filter']
+        keylist = ['con','filter','iterate']
 
 @param
     The parameters for this command are as follows 
     
         filter  filter for the event
+        iterate True returns generator yielding one event at a time
 
 @example 
+    for event in lxcalog(con, iterate=True):
+        print(event['msg'])
 
     '''
     global shell_obj
@@ -1088,8 +1224,8 @@ def lxcalog(*args, **kwargs):
     con = None
 
     long_short_key_map = {'filter':'f'}
-    keylist = ['con','filter']
-    optional_keylist = ['con', 'filter']
+    keylist = ['con','filter','iterate']
+    optional_keylist = ['con', 'filter','iterate']
     mutually_exclusive_keys = []
     mandatory_options_list = {}
 
@@ -1110,7 +1246,7 @@ def jobs(*args, **kwargs):
     
     Where KeyList is as follows
         
-        keylist = ['con','id','uuid','state','cancel','delete']
+        keylist = ['con','id','uuid','state','cancel','delete','iterate']
 
 @param
     The parameters for this command are as follows 
@@ -1129,8 +1265,11 @@ def jobs(*args, **kwargs):
                       Interrupted
         cancel=     cancel job of specified id
         delete=     delete job of specified id
+        iterate=    True returns generator yielding one job at a time
 
 @example 
+    for job in jobs(con, iterate=True):
+        print(job['id'])
 
     '''
     global shell_obj
@@ -1140,8 +1279,8 @@ def jobs(*args, **kwargs):
     con = None
 
     long_short_key_map = {'id': 'i', 'uuid':'u', 'state':'s','cancel':'c', 'delete':'d'}
-    keylist = ['con','id','uuid','state','cancel','delete']
-    optional_keylist = ['con', 'id','uuid','state','cancel','delete']
+    keylist = ['con','id','uuid','state','cancel','delete','iterate']
+    optional_keylist = ['con', 'id','uuid','state','cancel','delete','iterate']
     mutually_exclusive_keys = ['id','cancel','delete']
     mandatory_options_list = {}
 
@@ -1205,7 +1344,7 @@ def tasks(*args, **kwargs):
 
     Where data_dictionary contain input arguments as follows
 
-        keylist = ['jobUID','children','action', 'updateList']
+        keylist = ['jobUID','children','action', 'updateList', 'iterate']
 
 @param
     The parameters for this command are as follows
@@ -1215,8 +1354,11 @@ def tasks(*args, **kwargs):
     children        result will include children if True
     action          cancel/update
     updateList      required for update action
+    iterate         True returns generator yielding one task at a time
 
 @example
+    for task in tasks(con, iterate=True):
+        print(task['jobUID'])
 
     '''
     global shell_obj
@@ -1229,8 +1371,8 @@ def tasks(*args, **kwargs):
     con = None
 
     long_short_key_map = {'jobUID':'j','children':'c','action':'a', 'updateList':'u'}
-    keylist = ['con','jobUID','children','action', 'updateList']
-    optional_keylist = ['con', 'jobUID','children','action', 'updateList']
+    keylist = ['con','jobUID','children','action', 'updateList', 'iterate']
+    optional_keylist = ['con', 'jobUID','children','action', 'updateList', 'iterate']
     mutually_exclusive_keys = []
     mandatory_options_list = {}
 
@@ -1442,7 +1584,7 @@ def managementserver(*args, **kwargs):
 
     Where KeyList is as follows
 
-        keylist = ['con', 'key', 'fixids', 'type', 'action', 'files','jobid']
+        keylist = ['con', 'key', 'fixids', 'type', 'action', 'files','jobid','stream','max_workers','retries','skip_existing']
 
 @param
     The parameters for this command are as follows
@@ -1469,8 +1611,17 @@ def managementserver(*args, **kwargs):
                 readme. Returns the readme file for the specified management-server update
      jobid     jobid for import
      files     files to be imported with fullpath and comma separated
+     stream    True to import files of each update package with its own streamed upload,
+               list of per package results with upload throughput is returned (also
+               when files is a list). Packages LXCA already has are skipped, so running
+               an interrupted import again sends only what is missing.
+     max_workers   number of packages uploaded at once with stream (default 1)
+     retries       times upload of a package is tried again when connection breaks (default 2)
+     skip_existing False to upload files LXCA already has with stream
 @example
 
+        results = managementserver(con=con1,action='import',files=glob.glob('/srv/lxca_updates/*'),max_workers=2)
+
     '''
     global shell_obj
     command_name = sys._getframe().f_code.co_name
@@ -1480,8 +1631,8 @@ def managementserver(*args, **kwargs):
     # some paramters don't have short options
     long_short_key_map = {'key':'k', 'fixids':'f', 'type':'t', 'action':'a','jobid':'j'}
 
-    keylist = ['con', 'key', 'fixids', 'type', 'action', 'files','jobid']
-    optional_keylist = ['con', 'key', 'fixids', 'type', 'action', 'files', 'jobid']
+    keylist = ['con', 'key', 'fixids', 'type', 'action', 'files','jobid','stream','max_workers','retries','skip_existing']
+    optional_keylist = ['con', 'key', 'fixids', 'type', 'action', 'files', 'jobid','stream','max_workers','retries','skip_existing']
     mutually_exclusive_keys = ['key','action']
     mandatory_options_list = {}
 
@@ -100,6 +100,20 @@ class lxca_view(object):
             if vf.attrib['name']==filter_tag:
                 return vf
 
+    def get_view_attributes(self, cmd_name, filter_tag):
+        '''
+        Returns top level attributes printed by view filter, None when there is no such filter
+        '''
+        vf = self.get_view_filter(cmd_name, filter_tag)
+        if vf is None:
+            return None
+        names = []
+        for elem in list(vf):
+            name = elem.attrib.get('name', (elem.text or '').strip())
+            if name and name not in names:
+                names.append(name)
+        return names
+
     def print_recur(self,py_obj,view_filter):
         """Recursively prints the python object content as per view filter"""
         global indent
@@ -130,7 +144,16 @@ class lxca_view(object):
         vf = self.get_view_filter(cmd_name,filter_tag)
         self.ostream.write("Printing "+ cmd_name + " Output:"+ "\n")
 
-        if len(list(cmd_reponse.keys())) == 0:
+        if not isinstance(cmd_reponse, dict):
+            # records yielded by iterating command are printed as they arrive
+            count = 0
+            for cmd_resp_item in cmd_reponse:
+                self.print_cmd_resp_object(cmd_resp_item, vf)
+                self.ostream.write('\n-----------------------------------------------------')
+                count += 1
+            if count == 0:
+                self.ostream.write("No "+ filter_tag + " returned."+ "\n")
+        elif len(list(cmd_reponse.keys())) == 0:
             self.ostream.write("No "+ filter_tag + " returned."+ "\n")
         elif len(list(cmd_reponse.keys())) > 1:
             self.print_cmd_resp_object(cmd_reponse, vf)
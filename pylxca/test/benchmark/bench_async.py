@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: Benchmark of lxca_async_api against blocking lxca_api. Both paths fetch the
+same node records one by one from a local LXCA stand-in with simulated latency.
+'''
+
+import argparse
+import asyncio
+import time
+
+import lxca_standin
+from pylxca.pylxca_api.lxca_api import lxca_api
+from pylxca.pylxca_api.lxca_async import lxca_async_api
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description='lxca_async_api benchmark')
+    parser.add_argument('-n', dest='requests', type=int, default=200, help='number of node requests')
+    parser.add_argument('-c', dest='concurrency', type=int, default=16, help='requests in flight for async path')
+    parser.add_argument('-l', dest='latency', type=float, default=0.02, help='stand-in latency per request in seconds')
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    server = lxca_standin.start(node_count=args.requests, latency=args.latency)
+    uuids = [node['uuid'] for node in server.state.nodes]
+
+    api = lxca_api()
+    con = api.api('connect', {'url': server.url, 'user': 'USERID', 'pw': 'Passw0rd', 'noverify': True,
+                              'pool_maxsize': args.concurrency})
+
+    start = time.time()
+    sync_result = [api.api('nodes', {'uuid': uuid}, con) for uuid in uuids]
+    sync_time = time.time() - start
+
+    aapi = lxca_async_api(con, max_workers=args.concurrency)
+    loop = asyncio.new_event_loop()
+    start = time.time()
+    async_result = loop.run_until_complete(aapi.gather([('nodes', {'uuid': uuid}) for uuid in uuids]))
+    async_time = time.time() - start
+    aapi.close()
+    loop.close()
+
+    assert sync_result == async_result, "async results differ from sync results"
+
+    print("requests       : %d (latency %.0f ms)" % (args.requests, args.latency * 1000))
+    print("sync lxca_api  : %.2f s, %.1f req/s" % (sync_time, args.requests / sync_time))
+    print("lxca_async_api : %.2f s, %.1f req/s (concurrency %d)" % (async_time, args.requests / async_time, args.concurrency))
+    print("speedup        : %.1fx" % (sync_time / async_time))
+    print("pool stats     : %s" % con.get_pool_stats())
+    api.disconnect()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
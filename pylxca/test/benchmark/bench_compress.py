@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: Benchmark of bytes on wire and peak RSS of nodes command for a large fleet.
+Every mode fetches the same node list from a local LXCA stand-in in its own child
+process, so peak RSS of one mode does not hide the other.
+'''
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import lxca_standin
+
+MODES = ['plain', 'gzip', 'gzip+stream']
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description='compressed and streamed response benchmark')
+    parser.add_argument('-n', dest='nodes', type=int, default=5000, help='number of nodes served')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'URL'), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode, url):
+    from pylxca.pylxca_api.lxca_api import lxca_api
+
+    api = lxca_api()
+    con = api.api('connect', {'url': url, 'user': 'USERID', 'pw': 'Passw0rd', 'noverify': True})
+    base = peak_rss_kb()
+    start = time.time()
+    if mode == 'gzip+stream':
+        result = api.api('nodes', None, con)
+    else:
+        # how nodes were fetched before: whole body, then its text, then objects
+        encoding = 'identity' if mode == 'plain' else 'gzip, deflate'
+        resp = con.get_session().get(url + '/nodes', headers={'Accept-Encoding': encoding}, timeout=60)
+        result = json.loads(resp.text)
+    elapsed = time.time() - start
+    peak = peak_rss_kb()
+    print(json.dumps({'count': len(result['nodeList']), 'seconds': elapsed, 'base_kb': base, 'peak_kb': peak}))
+
+
+def main():
+    args = get_args()
+    if args.child:
+        return child(*args.child)
+
+    server = lxca_standin.start(node_count=args.nodes)
+    print("nodes: %d" % args.nodes)
+    print("%-12s %14s %14s %14s %10s" % ('mode', 'bytes on wire', 'RSS before KB', 'peak RSS KB', 'seconds'))
+    for mode in MODES:
+        sent = server.state.bytes_sent
+        out = subprocess.check_output([sys.executable, __file__, '--child', mode, server.url])
+        stats = json.loads(out.decode('utf-8').strip().splitlines()[-1])
+        assert stats['count'] == args.nodes, "%s returned %d nodes" % (mode, stats['count'])
+        print("%-12s %14d %14d %14d %10.2f" % (mode, server.state.bytes_sent - sent, stats['base_kb'],
+                                                stats['peak_kb'], stats['seconds']))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
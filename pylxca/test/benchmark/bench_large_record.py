@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: Benchmark of stream decoding of one large record, e.g. a node with big
+inventory. Decode time of streamed body should grow linearly with record size and stay
+close to json.loads of the whole body.
+'''
+
+import argparse
+import json
+import time
+
+from pylxca.pylxca_api import lxca_json
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description='large single record stream decode benchmark')
+    parser.add_argument('-s', dest='sizes', default='1,4,16,32', help='comma separated record sizes in MB')
+    parser.add_argument('-c', dest='chunk', type=int, default=lxca_json.CHUNK_SIZE, help='chunk size in bytes')
+    return parser.parse_args()
+
+
+def make_record(size):
+    '''
+    Returns body of nodeList with one node whose inventory is about size bytes
+    '''
+    slot = {'name': 'DIMM "slot"', 'serial': '\\u00e9 12345', 'capacity': 32768, 'healthy': True}
+    entry = json.dumps(slot)
+    count = max(1, size // (len(entry) + 2))
+    node = {'uuid': 'A' * 32, 'name': 'node', 'memoryModules': [slot] * count}
+    return json.dumps({'nodeList': [node]}).encode('utf-8')
+
+
+def main():
+    args = get_args()
+    print("%-10s %12s %14s %14s" % ('MB', 'chunks', 'json.loads s', 'iter_stream s'))
+    for size in [int(item) for item in args.sizes.split(',')]:
+        body = make_record(size * 1024 * 1024)
+        chunks = [body[i:i + args.chunk] for i in range(0, len(body), args.chunk)]
+
+        start = time.time()
+        expected = json.loads(body.decode('utf-8'))['nodeList']
+        loads_seconds = time.time() - start
+
+        start = time.time()
+        records = list(lxca_json.iter_stream(chunks, key='nodeList'))
+        stream_seconds = time.time() - start
+
+        assert records == expected, "streamed record differs for %d MB" % size
+        print("%-10d %12d %14.3f %14.3f" % (size, len(chunks), loads_seconds, stream_seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+'''
+@since: 18 Oct 2026
+@license: Lenovo License
+@copyright: Copyright 2026, Lenovo
+@organization: Lenovo
+@summary: Local stand-in for LXCA REST server used by pylxca benchmarks. It serves
+canned inventory over plain http with a configurable per request latency.
+'''
+
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+
+def make_node(index):
+    return {'uuid': '%032X' % index,
+            'name': 'node-%05d' % index,
+            'machineType': '7X%02d' % (index % 100),
+            'model': 'CTO1WW',
+            'serialNumber': 'J%07d' % index,
+            'status': {'name': 'MANAGED', 'message': 'managed'},
+            'overallHealthState': 'Normal',
+            'ipv4Addresses': ['10.%d.%d.%d' % ((index >> 16) & 255, (index >> 8) & 255, index & 255)],
+            'firmware': [{'name': 'UEFI', 'version': '2.%d' % (index % 10), 'build': 'TEE%03d' % (index % 1000)},
+                         {'name': 'IMM2', 'version': '4.%d' % (index % 10), 'build': 'TCOO%03d' % (index % 1000)}],
+            'location': {'location': 'DC1', 'rack': 'R%02d' % (index % 40), 'room': '1'}}
+
+
+def project(obj, query):
+    '''
+    Apply includeAttributes / excludeAttributes of query to record or records of list wrapper
+    '''
+    params = parse_qs(query)
+    include = params.get('includeAttributes', [''])[0].split(',')
+    exclude = params.get('excludeAttributes', [''])[0].split(',')
+    if include == [''] and exclude == ['']:
+        return obj
+
+    def record(item):
+        if include != ['']:
+            return dict((k, v) for k, v in item.items() if k in include)
+        return dict((k, v) for k, v in item.items() if k not in exclude)
+
+    if isinstance(obj, list):
+        return [record(item) for item in obj]
+    if len(obj) == 1 and isinstance(list(obj.values())[0], list):
+        key = list(obj.keys())[0]
+        return {key: [record(item) for item in obj[key]]}
+    return record(obj)
+
+
+class standin_state(object):
+    def __init__(self, node_count = 100, latency = 0.0, compress = True):
+        self.latency = latency
+        # gzip responses of clients which accept it
+        self.compress = compress
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        # path -> number of following GETs answered with 503
+        self.faults = dict()
+        self.nodes = [make_node(i) for i in range(node_count)]
+        self.routes = {'/aicc': {'appliance': 'standin'},
+                       '/nodes': {'nodeList': self.nodes},
+                       '/chassis': {'chassisList': []},
+                       '/switches': {'switchList': []},
+                       '/fans': {'fanList': []},
+                       '/cmms': {'cmmList': []},
+                       '/events': [],
+                       '/jobs': []}
+        # job id -> (kind, start, seconds to complete, fields of finished record), see add_job
+        self.jobs = dict()
+        self.next_job = 1
+        # seconds discoverRequest / manageRequest jobs posted by clients take
+        self.discover_seconds = 1.0
+        self.manage_seconds = 1.0
+        # IP addresses discovery does not find and passwords manage rejects
+        self.undiscoverable = set()
+        self.bad_passwords = set(['bad'])
+        self.unmanage_seconds = 1.0
+        # uuid -> number of following unmanage jobs which fail for it
+        self.unmanage_failures = dict()
+        # number of following unmanageRequests answered with 500
+        self.unmanage_rejects = 0
+        self.update_seconds = 1.0
+        # uuids whose firmware updates fail, and payloads of updatableComponents requests
+        self.update_failures = set()
+        self.updates = []
+        # uuids whose power actions fail, and largest powerState request taken
+        self.power_failures = set()
+        self.power_max_devices = None
+        # seconds a switch takes to change ports, switches which refuse it and port requests taken
+        self.port_seconds = 0.0
+        self.port_failures = set()
+        self.port_requests = []
+        # seconds FFDC collection takes, archive size, endpoints whose collection fails
+        self.ffdc_seconds = 1.0
+        self.ffdc_size = 1 << 20
+        # seconds slept after each 64 KB of archive, for downloads cut by deadline
+        self.ffdc_delay = 0
+        self.ffdc_failures = set()
+        # file name -> uploads of it broken off half way, names of accepted update files
+        self.import_breaks = {}
+        self.imported = []
+        self.import_bytes = 0
+        # most request jobs running at once
+        self.max_running = 0
+
+    def add_job(self, job_id, seconds, kind = 'jobs', result = None):
+        '''
+        Register job completing seconds from now, kind is jobs, tasks or a request
+        job resource like discoverRequest. result is merged into its finished record.
+        '''
+        self.jobs[str(job_id)] = (kind, time.time(), seconds, result or {})
+
+    def get_percentage(self, job_id):
+        kind, start, seconds, result = self.jobs[job_id]
+        return 100 if seconds <= 0 else min(100, int(100 * (time.time() - start) / seconds))
+
+    def job_record(self, job_id):
+        kind, start, seconds, result = self.jobs[job_id]
+        percentage = self.get_percentage(job_id)
+        if kind == 'jobs':
+            record = {'id': job_id, 'status': 'Complete' if percentage == 100 else 'Running', 'percentage': percentage}
+            if percentage == 100:
+                record.update(result)
+            return record
+        if kind == 'tasks':
+            record = {'jobUID': job_id, 'state': 'Complete' if percentage == 100 else 'InProgress', 'percentage': percentage}
+            if percentage == 100:
+                record.update(result)
+            return record
+        record = {'progress': percentage}
+        if percentage == 100:
+            record.update(result)
+        return record
+
+    def post_request_job(self, kind, payload):
+        '''
+        Start job of discoverRequest, manageRequest or unmanageRequest payload, returns its id
+        '''
+        if kind == 'discoverRequest':
+            ips = [ip for entry in payload for ip in entry['ipAddresses']]
+            devices = [{'ipAddresses': [ip], 'type': 'Server', 'os': '',
+                        'uuid': hashlib.md5(ip.encode('utf-8')).hexdigest().upper(),
+                        'managementPorts': [{'port': 443, 'type': 'https', 'enabled': True}]}
+                       for ip in ips if ip not in self.undiscoverable]
+            seconds, result = self.discover_seconds, {'serverList': devices}
+        elif kind == 'unmanageRequest':
+            results = []
+            with self.lock:
+                for entry in payload['endpoints']:
+                    failures = self.unmanage_failures.get(entry['uuid'], 0)
+                    if failures:
+                        self.unmanage_failures[entry['uuid']] = failures - 1
+                    results.append({'uuid': entry['uuid'], 'ipAddresses': entry['ipAddresses'],
+                                    'status': 'failed' if failures else 'success',
+                                    'message': 'Endpoint is busy' if failures else None})
+            seconds, result = self.unmanage_seconds, {'results': results}
+        else:
+            results = [{'uuid': entry['uuid'], 'ipAddresses': entry['ipAddresses'],
+                        'status': 'failed' if entry['password'] in self.bad_passwords else 'success',
+                        'message': 'Authentication failed' if entry['password'] in self.bad_passwords else None}
+                       for entry in payload]
+            seconds, result = self.manage_seconds, {'results': results}
+        with self.lock:
+            job_id = str(self.next_job)
+            self.next_job += 1
+            running = [other for other in self.jobs if self.jobs[other][0].endswith('Request')
+                       and self.get_percentage(other) < 100]
+            self.max_running = max(self.max_running, len(running) + 1)
+            self.add_job(job_id, seconds, kind, result)
+        return job_id
+
+
+class standin_handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, code, body, headers = None):
+        state = self.server.state
+        with state.lock:
+            state.requests += 1
+            state.bytes_sent += len(body)
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def lookup(self, path):
+        routes = self.server.state.routes
+        path = path.split('?')[0]
+        if path in routes:
+            return routes[path]
+        base, _, uuid = path.rpartition('/')
+        state = self.server.state
+        if base in ('/jobs', '/tasks') or base.endswith('Request/jobs'):
+            ids = [job_id for job_id in uuid.split(',') if job_id in state.jobs]
+            if not ids:
+                return None
+            records = [state.job_record(job_id) for job_id in ids]
+            return records if ',' in uuid else records[0]
+        if base == '/nodes' and ',' in uuid:
+            # /nodes/uuid1,uuid2 answers with list of the nodes found
+            uuids = set(uuid.split(','))
+            return {'nodeList': [node for node in self.server.state.nodes if node['uuid'] in uuids]}
+        if base == '/nodes':
+            return next((node for node in self.server.state.nodes if node['uuid'] == uuid), None)
+        return None
+
+    def receive_import(self):
+        '''
+        Read multipart upload of update files in blocks, as LXCA would not hold it in memory
+        '''
+        state = self.server.state
+        length = int(self.headers.get('Content-Length', 0))
+        names = []
+        tail = b''
+        read = 0
+        while read < length:
+            block = self.rfile.read(min(1 << 16, length - read))
+            if not block:
+                break
+            read += len(block)
+            # file names are looked for across block boundaries
+            names.extend(re.findall(br'filename="([^"]+)"', tail + block))
+            tail = block[-256:]
+            if read >= length // 2:
+                with state.lock:
+                    breaks = [name for name in set(names) if state.import_breaks.get(name.decode('utf-8'))]
+                    for name in breaks:
+                        state.import_breaks[name.decode('utf-8')] -= 1
+                if breaks:
+                    # connection drops half way through the upload
+                    self.close_connection = True
+                    return
+        with state.lock:
+            state.import_bytes += read
+            for name in names:
+                if name.decode('utf-8') not in state.imported:
+                    state.imported.append(name.decode('utf-8'))
+            state.routes['/managementServer/updates'] = {'updateList': [{'fileName': name} for name in state.imported]}
+        try:
+            self.send_body(200, b'{}')
+        except (IOError, OSError):
+            # client aborted upload
+            pass
+
+    def do_POST(self):
+        if self.path.startswith('/managementServer/updates') and 'jobid=' in self.path:
+            return self.receive_import()
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path == '/sessions':
+            return self.send_body(200, b'{}', {'Set-Cookie': 'csrf=standin; Path=/'})
+        if self.path in ('/discoverRequest', '/manageRequest', '/unmanageRequest'):
+            kind = self.path.strip('/')
+            state = self.server.state
+            if kind == 'unmanageRequest' and state.unmanage_rejects:
+                with state.lock:
+                    state.unmanage_rejects -= 1
+                return self.send_body(500, b'{}')
+            job_id = self.server.state.post_request_job(kind, json.loads(body.decode('utf-8')))
+            return self.send_body(202, b'{}', {'Location': '/%s/jobs/%s' % (kind, job_id)})
+        if self.path.startswith('/managementServer/updates') and 'action=import' in self.path:
+            state = self.server.state
+            with state.lock:
+                job_id = 'I%d' % state.next_job
+                state.next_job += 1
+            return self.send_body(200, json.dumps({'jobid': job_id}).encode('utf-8'))
+        self.send_body(200, b'{}')
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        state = self.server.state
+        match = re.match(r'^/switches/([^/?]+)/ports$', self.path)
+        if match:
+            payload = json.loads(body.decode('utf-8'))
+            with state.lock:
+                state.port_requests.append((time.time(), match.group(1), payload['action'], payload['ports']))
+            time.sleep(state.port_seconds)
+            if match.group(1) in state.port_failures:
+                return self.send_body(404, b'{"message": "Switch is not managed"}')
+            return self.send_body(200, json.dumps({'message': 'Ports %s %sd' %(','.join(payload['ports']), payload['action'])}).encode('utf-8'))
+        if self.path.split('?')[0] != '/updatableComponents':
+            return self.send_body(200, b'{}')
+        payload = json.loads(body.decode('utf-8'))
+        devices = [device for device_list in payload['DeviceList'] for entries in device_list.values() for device in entries]
+        if 'action=powerState' in self.path:
+            with state.lock:
+                state.updates.append((time.time(), self.path, [device['UUID'] for device in devices]))
+            if state.power_max_devices and len(devices) > state.power_max_devices:
+                return self.send_body(413, b'{"message": "Too many devices"}')
+            if [device for device in devices if device['UUID'] in state.power_failures]:
+                return self.send_body(400, b'{"message": "Device is not managed"}')
+            return self.send_body(200, b'{}')
+        results = [{'uuid': device['UUID'],
+                    'status': 'failed' if device['UUID'] in state.update_failures else 'success',
+                    'message': 'Flash failed' if device['UUID'] in state.update_failures else None}
+                   for device in devices]
+        with state.lock:
+            state.updates.append((time.time(), self.path, [device['UUID'] for device in devices]))
+            job_id = 'U%d' % state.next_job
+            state.next_job += 1
+            state.add_job(job_id, state.update_seconds, 'tasks', {'results': results})
+        self.send_body(200, b'{}', {'Location': '/tasks/%s' % job_id})
+
+    def do_GET(self):
+        if self.server.state.latency:
+            time.sleep(self.server.state.latency)
+        state = self.server.state
+        path = self.path.split('?')[0]
+        with state.lock:
+            fault = state.faults.get(path, 0)
+            if fault:
+                state.faults[path] = fault - 1
+        if fault:
+            return self.send_body(503, b'{}')
+        if path.startswith('/ffdc/'):
+            return self.send_ffdc(path)
+        obj = self.lookup(self.path)
+        if obj is None:
+            return self.send_body(404, b'{}')
+        body = json.dumps(project(obj, urlparse(self.path).query)).encode('utf-8')
+        headers = {'ETag': '"%s"' % hashlib.md5(body).hexdigest()}
+        if self.headers.get('If-None-Match') == headers['ETag']:
+            return self.send_body(304, b'', headers)
+        accept = self.headers.get('Accept-Encoding', '')
+        if self.server.state.compress and 'gzip' in accept:
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            body = compressor.compress(body) + compressor.flush()
+            headers['Content-Encoding'] = 'gzip'
+        self.send_body(200, body, headers)
+
+
+    def send_ffdc(self, path):
+        state = self.server.state
+        parts = path.split('/')
+        if parts[2] == 'endpoint':
+            # start collection, archive is named in finished job
+            uuid = parts[3]
+            with state.lock:
+                job_id = 'F%d' % state.next_job
+                state.next_job += 1
+                if uuid in state.ffdc_failures:
+                    result = {'status': 'Failed', 'message': 'Endpoint did not respond'}
+                else:
+                    result = {'fileName': 'FFDC_%s.tar.gz' % uuid}
+                state.add_job(job_id, state.ffdc_seconds, 'jobs', result)
+            return self.send_body(200, json.dumps({'jobURL': '/jobs/%s' % job_id}).encode('utf-8'))
+        # archive of ffdc_size bytes, sent in chunks so the stand-in does not hold it either
+        chunk = (parts[3] * 1024).encode('utf-8')[:1 << 16]
+        with state.lock:
+            state.requests += 1
+            state.bytes_sent += state.ffdc_size
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(state.ffdc_size))
+        self.end_headers()
+        left = state.ffdc_size
+        try:
+            while left:
+                self.wfile.write(chunk[:left])
+                left -= min(left, len(chunk))
+                if state.ffdc_delay:
+                    time.sleep(state.ffdc_delay)
+        except (IOError, OSError):
+            # client stopped download
+            pass
+
+
+class standin_server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, state, port = 0):
+        HTTPServer.__init__(self, ('127.0.0.1', port), standin_handler)
+        self.state = state
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d' % self.server_port
+
+
+def start(node_count = 100, latency = 0.0, compress = True):
+    '''
+    Starts stand-in in background thread and returns the server, use server.url to connect
+    '''
+    server = standin_server(standin_state(node_count, latency, compress))
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
@@ -0,0 +1,102 @@
+import threading
+
+import requests
+from requests.exceptions import HTTPError
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_true
+
+from pylxca.pylxca_api import lxca_batch
+
+UUIDS = ['%032X' % i for i in range(200)]
+
+
+def http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return HTTPError("%d Error" % status_code, response=response)
+
+
+class TestChunks:
+    '''
+    UUIDs are joined into as few chunks as fit in room left in URL
+    '''
+
+    def test_url_room_leaves_room_for_path_and_query(self):
+        base = 'https://lxca.example.com'
+        room = lxca_batch.url_room(base)
+        assert_equals(room, lxca_batch.MAX_URL_LENGTH - len(base) - lxca_batch.PATH_RESERVE)
+        assert_equals(lxca_batch.url_room(base, 'name,uuid'), room - len('name,uuid') - len('&excludeAttributes='))
+        assert_equals(lxca_batch.url_room(base, None, ''), room)
+
+    def test_chunks_stay_within_room(self):
+        room = lxca_batch.url_room('https://lxca.example.com')
+        chunks = lxca_batch.chunk_uuids(UUIDS, room)
+        assert_true(len(chunks) > 1)
+        assert_true(all(len(chunk) <= room for chunk in chunks))
+        assert_equals(','.join(chunks).split(','), UUIDS)
+        # chunks are full, one more UUID would not fit
+        assert_true(all(len(chunk) + 33 > room for chunk in chunks[:-1]))
+
+    def test_uuid_longer_than_room_gets_own_chunk(self):
+        assert_equals(lxca_batch.chunk_uuids(['A' * 40, 'B', 'C'], 10), ['A' * 40, 'B,C'])
+        assert_equals(lxca_batch.chunk_uuids([], 10), [])
+
+    def test_get_records(self):
+        assert_equals(lxca_batch.get_records({'nodeList': [{'uuid': 'A'}]}), [{'uuid': 'A'}])
+        assert_equals(lxca_batch.get_records([{'uuid': 'A'}]), [{'uuid': 'A'}])
+        assert_equals(lxca_batch.get_records({'uuid': 'A'}), [{'uuid': 'A'}])
+        assert_equals(lxca_batch.get_records({'uuid': 'A', 'nodeList': []}), [{'uuid': 'A', 'nodeList': []}])
+
+
+class TestFetchByUuid:
+    '''
+    Chunks are fetched concurrently and records are matched back to UUIDs
+    '''
+
+    def test_fetch_keeps_order_and_matches_case(self):
+        requested = []
+        lock = threading.Lock()
+
+        def fetch(chunk):
+            with lock:
+                requested.append(chunk)
+            # LXCA answers in its own order, with UUIDs in upper case
+            return {'nodeList': [{'uuid': uuid.upper()} for uuid in reversed(chunk.split(','))
+                                 if uuid != UUIDS[5].lower()]}
+
+        uuids = [uuid.lower() for uuid in UUIDS] + [UUIDS[0].lower()]
+        missing = []
+        result = lxca_batch.fetch_by_uuid(fetch, uuids, 33 * 20, max_workers=4, missing=missing)
+        assert_equals(list(result.keys()), [uuid.lower() for uuid in UUIDS if uuid != UUIDS[5]])
+        assert_equals(result[UUIDS[0].lower()], {'uuid': UUIDS[0]})
+        assert_equals(missing, [UUIDS[5].lower()])
+        # duplicates are requested once, in chunks fitting room
+        assert_equals(len(requested), 10)
+        assert_equals(sorted(','.join(requested).split(',')), sorted(uuid.lower() for uuid in UUIDS))
+
+    def test_fetch_matches_other_key(self):
+        result = lxca_batch.fetch_by_uuid(lambda chunk: [{'id': job_id} for job_id in chunk.split(',')],
+                                          ['1', '2'], 100, key='id')
+        assert_equals(result, {'1': {'id': '1'}, '2': {'id': '2'}})
+
+    def test_chunk_with_unknown_uuids_is_split(self):
+        requested = []
+        unknown = set([UUIDS[3], UUIDS[17]])
+
+        def fetch(chunk):
+            requested.append(chunk)
+            if unknown.intersection(chunk.split(',')):
+                raise http_error(404)
+            return [{'uuid': uuid} for uuid in chunk.split(',')]
+
+        missing = []
+        result = lxca_batch.fetch_by_uuid(fetch, UUIDS[:20], 33 * 20, missing=missing)
+        assert_equals(list(result.keys()), [uuid for uuid in UUIDS[:20] if uuid not in unknown])
+        assert_equals(missing, [UUIDS[3], UUIDS[17]])
+        assert_true(len(requested) < 20)
+
+    def test_other_errors_are_raised(self):
+        def fetch(chunk):
+            raise http_error(500)
+        assert_raises(HTTPError, lxca_batch.fetch_by_uuid, fetch, UUIDS[:4], 1000)
@@ -0,0 +1,309 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import mock
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_true
+from nose.tools import assert_is_none
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmark'))
+
+import lxca_standin
+
+from pylxca.pylxca_api import lxca_bulk_discovery
+from pylxca.pylxca_api import lxca_bulk_manage
+from pylxca.pylxca_api import lxca_bulk_firmware
+from pylxca.pylxca_api import lxca_bulk_power
+from pylxca.pylxca_api import lxca_bulk_switches
+from pylxca.pylxca_api import lxca_bulk_ffdc
+from pylxca.pylxca_api import lxca_bulk_import
+from pylxca.pylxca_api.lxca_bulk import bulk_results
+from pylxca.pylxca_api.lxca_connection import lxca_connection
+from pylxca.pylxca_api.lxca_jobs import lxca_job_poller
+
+server = None
+con = None
+pollers = []
+package_dir = None
+
+
+def setup_module():
+    global server, con, package_dir
+    package_dir = tempfile.mkdtemp()
+    server = lxca_standin.start(10)
+    con = lxca_connection(server.url, 'USERID', 'Passw0rd', verify_callback=False)
+    con.connect()
+
+
+def teardown_module():
+    for poller in pollers:
+        poller.close()
+    con.disconnect()
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(package_dir)
+
+
+def reset_standin():
+    '''
+    Returns fresh stand-in state whose jobs finish quickly, polled as often as they need
+    '''
+    state = server.state = lxca_standin.standin_state(10)
+    state.discover_seconds = state.manage_seconds = state.unmanage_seconds = 0.2
+    state.update_seconds = state.ffdc_seconds = 0.2
+    con.job_poller = lxca_job_poller(con, interval=0.05, max_interval=0.2)
+    pollers.append(con.job_poller)
+    return state
+
+
+def statuses(results, key):
+    return dict((result[key], result['status']) for result in results)
+
+
+class TestBulkResults:
+
+    def test_results_keep_order_and_count_statuses(self):
+        results = bulk_results(('uuid', 'status', 'message', 'job', 'seconds'), start=time.time())
+        for uuid in ('C', 'A', 'B'):
+            results.add(uuid, uuid=uuid)
+        results.finish('A', 'done', job='J1')
+        results.finish('B', 'failed', "Flash failed")
+        results.finish_pending('timeout', "Not done before deadline")
+        rows = results.report("Test run")
+        assert_equals([row['uuid'] for row in rows], ['C', 'A', 'B'])
+        assert_equals(list(rows[1].keys()), ['uuid', 'status', 'message', 'job', 'seconds'])
+        assert_equals(rows[1]['job'], 'J1')
+        assert_true(rows[1]['seconds'] >= 0)
+        assert_equals(rows[0]['message'], "Not done before deadline")
+        assert_equals(results.get_counts(), {'done': 1, 'failed': 1, 'timeout': 1})
+        assert_true('A' in results)
+        assert_equals(len(results), 3)
+
+
+class TestBulkManage:
+    '''
+    Endpoints are discovered and managed in batches, with few LXCA jobs in flight
+    '''
+
+    def test_endpoints_are_managed_with_own_credentials(self):
+        state = reset_standin()
+        state.undiscoverable = set(['10.1.0.7'])
+        endpoints = [{'ip': '10.1.0.%d' % i, 'pw': 'bad' if i == 3 else 'pw%d' % i} for i in range(12)]
+        results = lxca_bulk_manage.bulk_manage(con, endpoints, user='USERID', batch_size=5, max_jobs=2)
+        by_ip = statuses(results, 'ip')
+        assert_equals(by_ip.pop('10.1.0.3'), 'failed')
+        assert_equals(by_ip.pop('10.1.0.7'), 'not_discovered')
+        assert_equals(set(by_ip.values()), set(['managed']))
+        assert_equals([result['ip'] for result in results], [endpoint['ip'] for endpoint in endpoints])
+        assert_true(all(result['uuid'] for result in results if result['status'] == 'managed'))
+        assert_true(state.max_running <= 2)
+
+    def test_endpoint_without_credentials_is_rejected(self):
+        reset_standin()
+        assert_raises(ValueError, lxca_bulk_manage.bulk_manage, con, [{'ip': '10.1.0.1'}])
+
+
+class TestDiscoverySweep:
+
+    def test_closed_sweep_stops_polling_its_jobs(self):
+        # second request starts before first job is done and is still running when sweep is closed
+        state = reset_standin()
+        state.discover_seconds = 0.5
+        sweep = lxca_bulk_discovery.sweep_discovery(con, '10.9.0.1-20', max_jobs=2, batch_size=10, rate=4)
+        device = next(sweep)
+        assert_true(device['ipAddresses'][0].startswith('10.9.0.'))
+        assert_equals(con.job_poller.get_stats()['pending'], 1)
+        sweep.close()
+        assert_equals(con.job_poller.get_stats()['pending'], 0)
+
+
+class TestBulkUnmanage:
+
+    def test_failed_endpoints_are_unmanaged_again(self):
+        state = reset_standin()
+        state.unmanage_failures = {'U1': 1, 'U2': 5}
+        endpoints = ['10.2.0.%d;U%d;Rack-Tower' % (i, i) for i in range(4)]
+        results = lxca_bulk_manage.bulk_unmanage(con, endpoints, retries=1, batch_size=2)
+        by_uuid = dict((result['uuid'], result) for result in results)
+        assert_equals((by_uuid['U0']['status'], by_uuid['U0']['attempts']), ('unmanaged', 1))
+        assert_equals((by_uuid['U1']['status'], by_uuid['U1']['attempts']), ('unmanaged', 2))
+        assert_equals((by_uuid['U2']['status'], by_uuid['U2']['attempts']), ('failed', 2))
+        assert_equals(by_uuid['U2']['message'], 'Endpoint is busy')
+        assert_equals(by_uuid['U0']['ip'], ['10.2.0.0'])
+
+
+class TestBulkFirmware:
+
+    def test_rollout_pauses_over_threshold_and_resumes(self):
+        state = reset_standin()
+        uuids = ['R%02d' % i for i in range(6)]
+        state.update_failures = set(['R00'])
+        rollout = lxca_bulk_firmware.lxca_firmware_rollout(con, uuids, component='UEFI', wave_size=2,
+                                                           max_failures=1)
+        results = rollout.run()
+        assert_equals((rollout.state, rollout.wave), ('paused', 1))
+        assert_equals(Counter(result['status'] for result in results),
+                      Counter({'failed': 1, 'updated': 1, 'pending': 4}))
+        state.update_failures = set()
+        results = rollout.resume()
+        assert_equals((rollout.state, rollout.wave), ('done', 3))
+        assert_equals([result['status'] for result in results[2:]], ['updated'] * 4)
+
+
+class TestBulkPower:
+    '''
+    Power state of many devices changes with few requests, rejected ones are split
+    '''
+
+    def test_rejected_request_is_split_until_bad_device_fails_alone(self):
+        state = reset_standin()
+        state.power_failures = set(['S05'])
+        servers = ['S%02d' % i for i in range(16)]
+        results = lxca_bulk_power.bulk_power(con, {'server': servers, 'switch': ['W1,powerOff']}, 'powerOff')
+        by_uuid = statuses(results, 'uuid')
+        assert_equals(by_uuid.pop('S05'), 'failed')
+        assert_equals(set(by_uuid.values()), set(['done']))
+        assert_equals((results[-1]['state'], results[-1]['type']), ('powerOff', 'switch'))
+        # one request of all 17 devices, then halves of 8, 4, 2 and 1 down to the bad device
+        assert_equals(len(state.updates), 1 + 2 * 4)
+
+    def test_too_large_request_lowers_batch_size(self):
+        state = reset_standin()
+        state.power_max_devices = 4
+        results = lxca_bulk_power.bulk_power(con, ['S%02d,powerOn' % i for i in range(10)])
+        assert_equals(set(result['status'] for result in results), set(['done']))
+        sizes = [len(update[2]) for update in state.updates]
+        # each rejected request halves batch size for the rest of the run
+        assert_equals(sizes[:2], [10, 5])
+        assert_true(all(size <= 2 for size in sizes[2:]))
+
+    def test_invalid_power_state_is_rejected(self):
+        reset_standin()
+        assert_raises(ValueError, lxca_bulk_power.bulk_power, con, {'cmm': ['C1']}, 'powerOn')
+
+
+class TestBulkSwitchPorts:
+
+    def test_ports_of_each_switch_change_in_one_request(self):
+        state = reset_standin()
+        state.port_failures = set(['W2'])
+        results = lxca_bulk_switches.bulk_switch_ports(con, {'W1': ['1', '2'], 'W2': '3,4', 'W3': ['5', '5']},
+                                                       'disable')
+        assert_equals([(result['uuid'], result['port'], result['status']) for result in results], [
+            ('W1', '1', 'done'), ('W1', '2', 'done'), ('W2', '3', 'failed'), ('W2', '4', 'failed'),
+            ('W3', '5', 'done')])
+        assert_equals(sorted((uuid, action, ports) for _, uuid, action, ports in state.port_requests), [
+            ('W1', 'disable', ['1', '2']), ('W2', 'disable', ['3', '4']), ('W3', 'disable', ['5'])])
+
+    def test_ports_not_changed_before_deadline_time_out(self):
+        state = reset_standin()
+        state.port_seconds = 0.5
+        results = lxca_bulk_switches.bulk_switch_ports(con, dict(('W%d' % i, ['1']) for i in range(4)),
+                                                       'enable', max_workers=1, timeout=0.2)
+        assert_equals(set(result['status'] for result in results), set(['timeout']))
+        # request in flight is cut by the deadline, the others are never sent
+        assert_equals(len(state.port_requests), 1)
+
+
+class TestBulkFfdc:
+
+    def test_archives_are_downloaded(self):
+        state = reset_standin()
+        state.ffdc_size = 100000
+        state.ffdc_failures = set(['E2'])
+        directory = tempfile.mkdtemp()
+        try:
+            results = lxca_bulk_ffdc.bulk_ffdc(con, 'E1,E2,E3', directory, chunk_size=4096)
+            by_uuid = dict((result['uuid'], result) for result in results)
+            assert_equals(by_uuid['E2']['status'], 'failed')
+            assert_equals(by_uuid['E2']['message'], 'Endpoint did not respond')
+            for uuid in ('E1', 'E3'):
+                assert_equals(by_uuid[uuid]['status'], 'downloaded')
+                assert_equals(by_uuid[uuid]['file'], os.path.join(directory, 'FFDC_%s.tar.gz' % uuid))
+                assert_equals(by_uuid[uuid]['bytes'], 100000)
+                assert_equals(os.path.getsize(by_uuid[uuid]['file']), 100000)
+            assert_equals(sorted(os.listdir(directory)), ['FFDC_E1.tar.gz', 'FFDC_E3.tar.gz'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_downloads_cut_by_deadline_leave_no_files(self):
+        state = reset_standin()
+        state.ffdc_size = 10 << 20
+        state.ffdc_delay = 0.05
+        directory = tempfile.mkdtemp()
+        try:
+            results = lxca_bulk_ffdc.bulk_ffdc(con, ['E1'], directory, timeout=1, chunk_size=4096)
+            assert_equals(results[0]['status'], 'timeout')
+            assert_equals(os.listdir(directory), [])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_archive_name_must_be_plain_file_name(self):
+        assert_equals(lxca_bulk_ffdc.get_ffdc_file_name({'fileName': 'FFDC_1.tar.gz'}), 'FFDC_1.tar.gz')
+        assert_is_none(lxca_bulk_ffdc.get_ffdc_file_name({'fileName': '../etc/passwd'}))
+        assert_is_none(lxca_bulk_ffdc.get_ffdc_file_name({'message': 'FFDC_1.tar.gz'}))
+
+
+def make_packages():
+    '''
+    Returns paths of files of update packages pkgA and pkgB written to package_dir
+    '''
+    files = []
+    for name in ('pkgA', 'pkgB'):
+        for ext, size in (('.xml', 100), ('.tgz', 200000)):
+            path = os.path.join(package_dir, name + ext)
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+            files.append(path)
+    return files
+
+
+class TestBulkImport:
+    '''
+    Update packages are imported one per request, broken uploads are sent again
+    '''
+
+    @mock.patch.object(lxca_bulk_import, 'IMPORT_BACKOFF', 0.05)
+    def test_broken_upload_is_sent_again_to_same_job(self):
+        state = reset_standin()
+        state.import_breaks = {'pkgB.tgz': 1}
+        first_job = state.next_job
+        results = lxca_bulk_import.bulk_import_updates(con, make_packages())
+        assert_equals([(result['name'], result['status'], result['attempts']) for result in results], [
+            ('pkgA', 'imported', 1), ('pkgB', 'imported', 2)])
+        assert_equals(results[0]['files'], ['pkgA.xml', 'pkgA.tgz'])
+        assert_equals(results[1]['bytes'], 200100)
+        # one import job per package, retry uploads to the job it created
+        assert_equals(state.next_job, first_job + 2)
+        assert_equals(sorted(state.imported), ['pkgA.tgz', 'pkgA.xml', 'pkgB.tgz', 'pkgB.xml'])
+
+    def test_imported_packages_are_skipped(self):
+        state = reset_standin()
+        state.routes['/managementServer/updates'] = {'updateList': [
+            {'fileName': 'pkgA.xml'}, {'fileName': 'pkgA.tgz'}, {'fileName': 'pkgB.xml'},
+            {'fileName': 'other', 'description': 'replaces pkgB.tgz'}]}
+        results = lxca_bulk_import.bulk_import_updates(con, make_packages())
+        assert_equals(statuses(results, 'name'), {'pkgA': 'skipped', 'pkgB': 'imported'})
+        # only files LXCA does not list are sent
+        assert_equals(results[1]['bytes'], 200000)
+        assert_equals(state.imported, ['pkgB.tgz'])
+
+    @mock.patch.object(lxca_bulk_import, 'IMPORT_BACKOFF', 0.05)
+    def test_upload_fails_after_retries(self):
+        state = reset_standin()
+        state.import_breaks = {'pkgA.tgz': 5}
+        results = lxca_bulk_import.bulk_import_updates(con, make_packages()[:2], retries=1)
+        assert_equals((results[0]['status'], results[0]['attempts']), ('failed', 2))
+        assert_equals(state.imported, [])
+
+    def test_invalid_file_type_is_rejected(self):
+        reset_standin()
+        path = os.path.join(package_dir, 'notes.doc')
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        assert_raises(ValueError, lxca_bulk_import.bulk_import_updates, con, [path])
@@ -0,0 +1,169 @@
+import json
+
+import mock
+from nose.tools import assert_equals
+from nose.tools import assert_true
+from nose.tools import assert_false
+from nose.tools import assert_is_none
+
+from pylxca.pylxca_api import lxca_cache
+from pylxca.pylxca_api.lxca_cache import lxca_response_cache, lxca_validator_cache, lxca_discovery_cache
+
+
+class fake_connection(object):
+
+    def __init__(self, url, user = 'USERID'):
+        self.url = url
+        self.user = user
+
+    def get_url(self):
+        return self.url
+
+
+class TestResponseCache:
+    '''
+    Results of read-only commands are kept per connection for their TTL within
+    a memory bound, commands which change inventory drop them
+    '''
+
+    def test_put_and_get_return_copies(self):
+        cache = lxca_response_cache()
+        key = cache.make_key(fake_connection('https://a'), 'nodes', {'uuid': None})
+        cache.put(key, {'nodeList': [{'uuid': 'A'}]})
+        result = cache.get(key)
+        assert_equals(result, {'nodeList': [{'uuid': 'A'}]})
+        result['nodeList'].append({'uuid': 'B'})
+        assert_equals(cache.get(key), {'nodeList': [{'uuid': 'A'}]})
+        assert_equals(cache.get_stats()['hits'], 2)
+
+    @mock.patch.object(lxca_cache.time, 'time')
+    def test_entry_expires_after_ttl(self, now):
+        now.return_value = 1000.0
+        cache = lxca_response_cache(ttls={'nodes': 30})
+        key = cache.make_key(fake_connection('https://a'), 'nodes', None)
+        cache.put(key, [1])
+        now.return_value += 29
+        assert_equals(cache.get(key), [1])
+        now.return_value += 2
+        assert_is_none(cache.get(key))
+        assert_equals(cache.get_stats()['entries'], 0)
+
+    def test_least_recently_used_is_evicted(self):
+        con = fake_connection('https://a')
+        value = ['x' * 90]
+        size = len(json.dumps(value))
+        cache = lxca_response_cache(max_bytes=size * 2)
+        keys = [cache.make_key(con, name, None) for name in ('nodes', 'chassis', 'switches')]
+        cache.put(keys[0], value)
+        cache.put(keys[1], value)
+        # nodes is used, so chassis is oldest
+        assert_equals(cache.get(keys[0]), value)
+        cache.put(keys[2], value)
+        assert_is_none(cache.get(keys[1]))
+        assert_equals(cache.get(keys[0]), value)
+        stats = cache.get_stats()
+        assert_equals((stats['evictions'], stats['bytes']), (1, size * 2))
+
+    def test_result_over_memory_bound_is_not_cached(self):
+        cache = lxca_response_cache(max_bytes=10)
+        key = cache.make_key(fake_connection('https://a'), 'nodes', None)
+        cache.put(key, ['x' * 20])
+        assert_is_none(cache.get(key))
+
+    def test_mutation_invalidates_inventory_of_its_connection_only(self):
+        cache = lxca_response_cache()
+        con, other = fake_connection('https://a'), fake_connection('https://b')
+        keys = dict((name, cache.make_key(con, name, None)) for name in ('nodes', 'chassis', 'users'))
+        other_key = cache.make_key(other, 'nodes', None)
+        for key in list(keys.values()) + [other_key]:
+            cache.put(key, {})
+        cache.on_command(con, 'manage', {'ip': '10.0.0.1'})
+        assert_is_none(cache.get(keys['nodes']))
+        assert_is_none(cache.get(keys['chassis']))
+        assert_equals(cache.get(keys['users']), {})
+        assert_equals(cache.get(other_key), {})
+
+    def test_read_of_mutating_command_does_not_invalidate(self):
+        cache = lxca_response_cache()
+        con = fake_connection('https://a')
+        key = cache.make_key(con, 'nodes', None)
+        cache.put(key, {})
+        assert_false(cache.is_mutation('updatecomp', {'query': 'components'}))
+        cache.on_command(con, 'updatecomp', {'query': 'components'})
+        assert_equals(cache.get(key), {})
+        cache.on_command(con, 'updatecomp', {'action': 'apply'})
+        assert_is_none(cache.get(key))
+
+    def test_uncached_commands(self):
+        cache = lxca_response_cache(ttls={'nodes': 0})
+        assert_false(cache.is_cacheable('nodes', None))
+        assert_false(cache.is_cacheable('jobs', None))
+        assert_false(cache.is_cacheable('switches', {'action': 'enable'}))
+        assert_true(cache.is_cacheable('switches', {'uuid': 'A'}))
+
+
+class TestValidatorCache:
+    '''
+    Validators of responses are sent with next request of same URL, and object of
+    a 304 answer is the one remembered with them
+    '''
+
+    def test_not_modified_serves_remembered_object(self):
+        cache = lxca_validator_cache()
+        cache.store('/nodes', {'ETag': '"1"'}, {'nodeList': []}, size=100)
+        assert_equals(cache.request_headers('/nodes'), {'If-None-Match': '"1"'})
+        assert_equals(cache.not_modified('/nodes'), {'nodeList': []})
+        stats = cache.get_stats()
+        assert_equals((stats['not_modified'], stats['bytes_saved']), (1, 100))
+
+    def test_response_without_validators_is_not_remembered(self):
+        cache = lxca_validator_cache()
+        cache.store('/nodes', {}, {'nodeList': []})
+        assert_equals(cache.request_headers('/nodes'), {})
+        assert_is_none(cache.not_modified('/nodes'))
+
+    def test_too_large_body_drops_older_validators(self):
+        cache = lxca_validator_cache(max_bytes=50)
+        cache.store('/nodes', {'Last-Modified': 'Sat, 17 Oct 2026'}, ['small'])
+        assert_equals(cache.request_headers('/nodes'), {'If-Modified-Since': 'Sat, 17 Oct 2026'})
+        cache.store('/nodes', {'ETag': '"2"'}, ['x' * 100])
+        assert_equals(cache.request_headers('/nodes'), {})
+        cache.store('/chassis', {'ETag': '"3"'}, [], size=1000)
+        assert_equals(cache.request_headers('/chassis'), {})
+        assert_equals(cache.get_stats()['too_large'], 2)
+
+    def test_oldest_url_is_dropped_over_max_entries(self):
+        cache = lxca_validator_cache(max_entries=2)
+        for url in ('/a', '/b', '/c'):
+            cache.store(url, {'ETag': url}, [])
+        assert_is_none(cache.not_modified('/a'))
+        assert_equals(cache.get_stats()['entries'], 2)
+
+
+class TestDiscoveryCache:
+    '''
+    Devices of finished discovery jobs are kept under each of their addresses for TTL
+    '''
+
+    @mock.patch.object(lxca_cache.time, 'time')
+    def test_devices_are_kept_under_each_address(self, now):
+        now.return_value = 1000.0
+        cache = lxca_discovery_cache(ttl=60)
+        device = {'uuid': 'A', 'ipAddresses': ['10.0.0.1', '10.0.0.2']}
+        cache.store([device])
+        assert_equals(cache.get('10.0.0.1'), device)
+        assert_equals(cache.get('10.0.0.2'), device)
+        assert_is_none(cache.get('10.0.0.3'))
+        now.return_value += 61
+        assert_is_none(cache.get('10.0.0.1'))
+        stats = cache.get_stats()
+        assert_equals((stats['hits'], stats['misses']), (2, 2))
+
+    def test_invalidate_addresses(self):
+        cache = lxca_discovery_cache()
+        cache.store([{'uuid': 'A', 'ipAddresses': ['10.0.0.1']}, {'uuid': 'B', 'ipAddresses': ['10.0.0.2']}])
+        cache.invalidate(['10.0.0.1'])
+        assert_is_none(cache.get('10.0.0.1'))
+        assert_equals(cache.get('10.0.0.2')['uuid'], 'B')
+        cache.clear()
+        assert_equals(cache.get_stats()['entries'], 0)
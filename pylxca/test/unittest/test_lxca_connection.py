@@ -0,0 +1,263 @@
+import sys
+
+import mock
+import requests
+from requests.adapters import BaseAdapter
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_true
+from nose.tools import assert_false
+from nose.tools import assert_is_instance
+
+from pylxca.pylxca_api.lxca_connection import lxca_connection, lxcaAdapter, CircuitOpenError
+from pylxca.pylxca_api.lxca_retry import lxca_retry_policy, lxca_circuit_breaker, OPEN
+
+# package exports lxca_connection class under the name of its module
+lxca_connection_module = sys.modules['pylxca.pylxca_api.lxca_connection']
+
+URL = 'https://lxca.example.com'
+
+
+def make_connection(url = URL, **kwargs):
+    return lxca_connection(url, 'USERID', 'Passw0rd', verify_callback=False, **kwargs)
+
+
+class TestConnectionPool:
+    '''
+    Pool settings of lxca_connection reach its adapter, and connections with
+    share_pool=True to one appliance mount one reference counted adapter
+    '''
+
+    def test_pool_settings_reach_adapter(self):
+        con = make_connection(pool_connections=2, pool_maxsize=4, pool_block=True)
+        adapter = con._get_adapter()
+        assert_is_instance(adapter, lxcaAdapter)
+        assert_equals(adapter._pool_connections, 2)
+        assert_equals(adapter._pool_maxsize, 4)
+        assert_true(adapter._pool_block)
+        assert_true(con._get_adapter() is adapter)
+
+    def test_connections_get_own_adapter_by_default(self):
+        con, other = make_connection(), make_connection()
+        assert_false(con._get_adapter() is other._get_adapter())
+        assert_equals(lxca_connection_module._shared_adapters, {})
+
+    def test_shared_adapter_is_closed_by_last_connection(self):
+        con, other = make_connection(share_pool=True), make_connection(share_pool=True)
+        adapter = con._get_adapter()
+        assert_true(other._get_adapter() is adapter)
+        # other pool settings get other pool
+        small = make_connection(share_pool=True, pool_maxsize=2)
+        assert_false(small._get_adapter() is adapter)
+        small._release_adapter()
+
+        with mock.patch.object(adapter, 'close') as close:
+            con._release_adapter()
+            assert_equals(close.call_count, 0)
+            other._release_adapter()
+            assert_equals(close.call_count, 1)
+        assert_true(con.adapter is None and other.adapter is None)
+        assert_equals(lxca_connection_module._shared_adapters, {})
+
+    def test_pool_stats(self):
+        con = make_connection(pool_maxsize=4)
+        assert_equals(con.get_pool_stats(), {})
+        con._get_adapter().poolmanager.connection_from_url(URL)
+        assert_equals(con.get_pool_stats(), {'https://lxca.example.com:443':
+                                             {'requests': 0, 'hits': 0, 'misses': 0, 'maxsize': 4, 'block': False}})
+
+
+def make_response(request, status_code, body = b'{}'):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = body
+    resp.request = request
+    resp.url = request.url
+    return resp
+
+
+class scripted_adapter(BaseAdapter):
+    '''
+    Answers requests with status codes of script in order, records what was sent
+    '''
+
+    def __init__(self, statuses):
+        super(scripted_adapter, self).__init__()
+        self.statuses = list(statuses)
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        self.sent.append((request.method, request.url, request.headers.get('X-Csrf-Token')))
+        return make_response(request, self.statuses.pop(0) if self.statuses else 200)
+
+    def close(self):
+        pass
+
+
+def make_session(statuses, **kwargs):
+    con = make_connection(**kwargs)
+    con.session = requests.Session()
+    con.session.headers['X-Csrf-Token'] = 'old'
+    adapter = scripted_adapter(statuses)
+    con.session.mount(URL, adapter)
+    con.session.hooks['response'].append(con._check_session)
+
+    def _login():
+        con.session.headers['X-Csrf-Token'] = 'new'
+    con._login = mock.Mock(side_effect=_login)
+    return con, adapter
+
+
+class TestSessionReplay:
+    '''
+    Request answered 401 because session expired is replayed once after login
+    '''
+
+    def test_get_is_replayed_after_login(self):
+        con, adapter = make_session([401, 200])
+        resp = con.session.get(URL + '/nodes')
+        assert_equals(resp.status_code, 200)
+        assert_equals(con._login.call_count, 1)
+        assert_equals(con.session_renewals, 1)
+        assert_equals(adapter.sent, [('GET', URL + '/nodes', 'old'), ('GET', URL + '/nodes', 'new')])
+        assert_equals([item.status_code for item in resp.history], [401])
+
+    def test_put_is_not_replayed(self):
+        con, adapter = make_session([401, 200])
+        resp = con.session.put(URL + '/updatableComponents', data='{}')
+        assert_equals(resp.status_code, 401)
+        assert_equals(con._login.call_count, 0)
+        assert_equals(len(adapter.sent), 1)
+
+    def test_post_is_replayed_when_listed(self):
+        con, adapter = make_session([401, 200], replay_methods=('GET', 'POST'))
+        resp = con.session.post(URL + '/jobs', data='{}')
+        assert_equals(resp.status_code, 200)
+        assert_equals([method for method, url, csrf in adapter.sent], ['POST', 'POST'])
+
+    def test_replay_happens_once(self):
+        con, adapter = make_session([401, 401, 200])
+        resp = con.session.get(URL + '/nodes')
+        assert_equals(resp.status_code, 401)
+        assert_equals(len(adapter.sent), 2)
+
+    def test_forbidden_with_current_token_is_not_renewed(self):
+        con, adapter = make_session([403])
+        resp = con.session.get(URL + '/nodes')
+        assert_equals(resp.status_code, 403)
+        assert_equals(con._login.call_count, 0)
+
+    def test_token_renewed_by_other_request_is_reused(self):
+        con, adapter = make_session([401, 200])
+        con.session.hooks['response'] = []
+        resp = con.session.get(URL + '/nodes')
+        # other request renewed session meanwhile
+        con.session.headers['X-Csrf-Token'] = 'new'
+        resp = con._check_session(resp)
+        assert_equals(resp.status_code, 200)
+        assert_equals(con._login.call_count, 0)
+        assert_equals(adapter.sent[-1][2], 'new')
+
+    def test_failed_login_returns_expired_response(self):
+        con, adapter = make_session([401])
+        con._login.side_effect = requests.exceptions.HTTPError("login refused")
+        resp = con.session.get(URL + '/nodes')
+        assert_equals(resp.status_code, 401)
+        assert_equals(len(adapter.sent), 1)
+
+
+def script(items):
+    '''
+    Side effect of mocked HTTPAdapter.send answering with status codes or raising
+    exceptions of items in order
+    '''
+    items = list(items)
+
+    def _send(adapter, request, **kwargs):
+        item = items.pop(0) if items else 200
+        if isinstance(item, Exception):
+            raise item
+        return make_response(request, item)
+    return _send
+
+
+def make_adapter(retries = 3, threshold = 5):
+    return lxcaAdapter(lxca_retry_policy(retries, backoff_factor=0.5, backoff_max=2),
+                       lxca_circuit_breaker(threshold=threshold, reset=30))
+
+
+def send(adapter, method, path = '/nodes'):
+    request = requests.Request(method, URL + path).prepare()
+    return adapter.send(request, timeout=(1, 1))
+
+
+@mock.patch.object(lxca_connection_module.time, 'sleep')
+@mock.patch('requests.adapters.HTTPAdapter.send', autospec=True)
+class TestRetries:
+    '''
+    lxcaAdapter retries failed attempts allowed by retry policy with backoff, and
+    its circuit breaker counts one failure per request
+    '''
+
+    def test_get_is_retried_on_server_error(self, http_send, sleep):
+        http_send.side_effect = script([503, 502, 200])
+        adapter = make_adapter()
+        assert_equals(send(adapter, 'GET').status_code, 200)
+        assert_equals(http_send.call_count, 3)
+        sleeps = [call[0][0] for call in sleep.call_args_list]
+        assert_equals(len(sleeps), 2)
+        # full jitter backoff stays below backoff_factor * 2 ** attempt
+        assert_true(0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0)
+        stats = adapter.get_retry_stats()
+        assert_equals((stats['retries'], stats['gave_up']), (2, 0))
+
+    def test_backoff_is_capped(self, http_send, sleep):
+        policy = lxca_retry_policy(10, backoff_factor=1, backoff_max=3)
+        assert_true(all(0 <= policy.backoff(attempt) <= 3 for attempt in range(10) for _ in range(20)))
+
+    def test_retries_give_up(self, http_send, sleep):
+        http_send.side_effect = script([503] * 10)
+        adapter = make_adapter(retries=2)
+        assert_equals(send(adapter, 'GET').status_code, 503)
+        assert_equals(http_send.call_count, 3)
+        assert_equals(adapter.get_retry_stats()['gave_up'], 1)
+
+    def test_put_is_not_retried_on_server_error(self, http_send, sleep):
+        http_send.side_effect = script([503, 200])
+        assert_equals(send(make_adapter(), 'PUT').status_code, 503)
+        assert_equals(http_send.call_count, 1)
+        assert_equals(sleep.call_count, 0)
+
+    def test_put_is_not_retried_on_read_timeout(self, http_send, sleep):
+        http_send.side_effect = script([requests.exceptions.ReadTimeout("read timed out"), 200])
+        assert_raises(requests.exceptions.ReadTimeout, send, make_adapter(), 'PUT')
+        assert_equals(http_send.call_count, 1)
+
+    def test_put_is_retried_when_not_connected(self, http_send, sleep):
+        http_send.side_effect = script([requests.exceptions.ConnectTimeout("connect timed out"), 200])
+        assert_equals(send(make_adapter(), 'PUT').status_code, 200)
+        assert_equals(http_send.call_count, 2)
+
+    def test_retried_request_is_one_breaker_failure(self, http_send, sleep):
+        http_send.side_effect = script([503] * 4 + [503, 200])
+        adapter = make_adapter(retries=3, threshold=2)
+        assert_equals(send(adapter, 'GET').status_code, 503)
+        assert_equals(http_send.call_count, 4)
+        assert_equals(adapter.circuit_breaker.get_state()['/nodes']['failures'], 1)
+        # request which succeeds after retries is not a failure
+        assert_equals(send(adapter, 'GET').status_code, 200)
+        assert_equals(adapter.circuit_breaker.get_state()['/nodes']['failures'], 0)
+
+    def test_breaker_opens_and_rejects(self, http_send, sleep):
+        http_send.side_effect = script([500] * 10)
+        adapter = make_adapter(retries=0, threshold=3)
+        for _ in range(3):
+            assert_equals(send(adapter, 'GET').status_code, 500)
+        assert_equals(adapter.circuit_breaker.get_state()['/nodes']['state'], OPEN)
+        assert_raises(CircuitOpenError, send, adapter, 'GET')
+        assert_equals(http_send.call_count, 3)
+        # other paths are not affected
+        assert_true(adapter.circuit_breaker.allow('/chassis'))
+        stats = adapter.get_retry_stats()
+        assert_equals(stats['rejected'], 1)
+        assert_equals(stats['circuits']['/nodes']['rejected'], 1)
@@ -0,0 +1,134 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_true
+from nose.tools import assert_false
+from nose.tools import assert_is_instance
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmark'))
+
+import lxca_standin
+
+from pylxca.pylxca_api import lxca_jobs
+from pylxca.pylxca_api.lxca_connection import lxca_connection
+from pylxca.pylxca_api.lxca_jobs import lxca_job_poller, is_done, get_progress
+from pylxca.pylxca_api.lxca_timeout import DeadlineExceeded
+
+server = None
+con = None
+pollers = []
+
+
+def setup_module():
+    global server, con
+    server = lxca_standin.start(10)
+    con = lxca_connection(server.url, 'USERID', 'Passw0rd', verify_callback=False)
+    con.connect()
+
+
+def teardown_module():
+    for poller in pollers:
+        poller.close()
+    con.disconnect()
+    server.shutdown()
+    server.server_close()
+
+
+def make_poller():
+    '''
+    Returns poller of fresh stand-in state, polling as often as its short jobs need
+    '''
+    server.state = lxca_standin.standin_state(10)
+    poller = lxca_job_poller(con, interval=0.05, max_interval=0.2)
+    pollers.append(poller)
+    return poller
+
+
+class TestJobRecords:
+
+    def test_final_states(self):
+        assert_true(is_done({'id': '1', 'status': 'Complete'}))
+        assert_true(is_done({'jobUID': '1', 'state': 'Stopped_With_Error'}))
+        assert_true(is_done({'status': {'state': 'Failed'}}))
+        assert_false(is_done({'status': 'Running', 'percentage': 50}))
+
+    def test_progress_of_request_jobs(self):
+        assert_true(is_done({'progress': 100}))
+        assert_false(is_done({'progress': '42.5'}))
+        assert_equals(get_progress({'progress': '42.5'}), 42.5)
+        assert_equals(get_progress({'status': {'percentage': 10}}), 10)
+
+    def test_non_numeric_progress_falls_back_to_state(self):
+        assert_equals(get_progress({'progress': 'n/a', 'state': 'Running'}), None)
+        assert_false(is_done({'progress': 'n/a', 'state': 'Running'}))
+        assert_true(is_done({'progress': 'n/a', 'state': 'Complete'}))
+
+
+class TestJobPoller:
+    '''
+    Poller of a connection resolves futures of many jobs with few requests
+    '''
+
+    def test_watch_returns_future_of_final_record(self):
+        poller = make_poller()
+        server.state.add_job('J1', 0.2, result={'message': 'done'})
+        called = threading.Event()
+        future = poller.watch('J1', callback=lambda future: called.set())
+        assert_true(poller.watch('J1') is future)
+        record = future.result(5)
+        assert_equals((record['status'], record['message']), ('Complete', 'done'))
+        assert_true(called.wait(5))
+        assert_equals(poller.get_stats()['completed'], 1)
+
+    def test_jobs_are_polled_together(self):
+        poller = make_poller()
+        for job_id in ('J1', 'J2', 'J3'):
+            server.state.add_job(job_id, 0.3)
+        server.state.add_job('T1', 0.3, kind='tasks')
+        futures = [poller.watch(job_id) for job_id in ('J1', 'J2', 'J3')] + [poller.watch('T1', 'tasks')]
+        assert_equals([future.result(5)['percentage'] for future in futures], [100] * 4)
+        stats = poller.get_stats()
+        # one /jobs/ and one /tasks/ request per poll
+        assert_true(stats['requests'] <= stats['polls'] * 2)
+
+    def test_wait_returns_records_in_order(self):
+        poller = make_poller()
+        server.state.add_job('J2', 0.3)
+        server.state.add_job('J1', 0.1)
+        records = poller.wait(['J2', 'J1'], timeout=5)
+        assert_is_instance(records, OrderedDict)
+        assert_equals(list(records.keys()), ['J2', 'J1'])
+        assert_true(all(record['status'] == 'Complete' for record in records.values()))
+
+    def test_wait_raises_at_timeout(self):
+        poller = make_poller()
+        server.state.add_job('J1', 60)
+        assert_raises(DeadlineExceeded, poller.wait, ['J1'], timeout=0.2)
+
+    def test_future_fails_when_job_outlives_watch(self):
+        poller = make_poller()
+        server.state.add_job('J1', 60)
+        future = poller.watch('J1', timeout=0.1)
+        assert_raises(DeadlineExceeded, future.result, 5)
+
+    def test_missing_job_fails_after_max_errors(self):
+        poller = make_poller()
+        future = poller.watch('missing', 'tasks')
+        assert_raises(Exception, future.result, 5)
+        assert_true(poller.get_stats()['polls'] >= lxca_jobs.MAX_ERRORS)
+        assert_equals(poller.get_stats()['failed'], 1)
+
+    def test_close_cancels_pending_futures(self):
+        poller = make_poller()
+        server.state.add_job('J1', 60)
+        future = poller.watch('J1')
+        poller.close()
+        assert_true(future.cancelled())
+        assert_raises(RuntimeError, poller.watch, 'J2')
+
+    def test_connection_shares_one_poller(self):
+        assert_true(con.get_job_poller() is con.get_job_poller())
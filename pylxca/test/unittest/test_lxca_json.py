@@ -0,0 +1,158 @@
+import io
+import json
+
+import mock
+import requests
+from nose.tools import assert_equals
+from nose.tools import assert_raises
+from nose.tools import assert_true
+
+from pylxca.pylxca_api import lxca_json
+
+NODES = [{'uuid': '%032X' % i, 'name': u'node "%d" \\ caf\xe9 \u2603 \U0001f600' % i,
+          'ipv4Addresses': ['10.0.%d.%d' % (i // 256, i % 256)], 'powerStatus': i % 2,
+          'memory': {'total': 2.5e3, 'slots': []}, 'nested': [[{'a': None}], {}], 'flag': True}
+         for i in range(20)]
+
+DOCUMENTS = [{'nodeList': NODES},
+             NODES,
+             NODES[0],
+             {'nodeList': [], 'count': 0},
+             [],
+             {},
+             u'text with \\"escapes\\" \xe9',
+             12345,
+             None]
+
+# chunk sizes cutting body inside strings, escapes and numbers, and not at all
+CHUNK_SIZES = [1, 7, 1 << 20]
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestStream:
+    '''
+    Streamed decoding gives the same objects as json.loads of the whole body
+    however the body is cut into chunks
+    '''
+
+    def test_load_stream_equals_json_loads(self):
+        for document in DOCUMENTS:
+            body = json.dumps(document, ensure_ascii=False, indent=1).encode('utf-8')
+            for size in CHUNK_SIZES:
+                assert_equals(lxca_json.load_stream(chunked(body, size)), json.loads(body.decode('utf-8')))
+
+    def test_number_cut_by_chunk_boundary(self):
+        assert_equals(lxca_json.load_stream([b'[25', b'00.0, -1', b'e3]']), [2500.0, -1e3])
+
+    def test_iter_stream_yields_records(self):
+        for size in CHUNK_SIZES:
+            body = json.dumps({'nodeList': NODES}).encode('utf-8')
+            assert_equals(list(lxca_json.iter_stream(chunked(body, size), key='nodeList')), NODES)
+            body = json.dumps(NODES).encode('utf-8')
+            assert_equals(list(lxca_json.iter_stream(chunked(body, size))), NODES)
+
+    def test_iter_stream_of_other_documents(self):
+        # objects which do not wrap key list are yielded whole
+        body = json.dumps(NODES[0]).encode('utf-8')
+        assert_equals(list(lxca_json.iter_stream(chunked(body, 5), key='nodeList')), [NODES[0]])
+        body = json.dumps({'nodeList': NODES[:2], 'total': 2}).encode('utf-8')
+        assert_equals(list(lxca_json.iter_stream(chunked(body, 5), key='nodeList')), NODES[:2])
+        assert_equals(list(lxca_json.iter_stream([b'[]'], key='nodeList')), [])
+
+    def test_stream_of_other_charset(self):
+        body = json.dumps({'name': u'caf\xe9'}, ensure_ascii=False).encode('utf-16')
+        assert_equals(lxca_json.load_stream(chunked(body, 3), 'utf-16'), {'name': u'caf\xe9'})
+
+    def test_invalid_documents_raise_value_error(self):
+        for body in [b'{"a": 1', b'[1, 2', b'{"a": 1} x', b'[1,]', b'']:
+            assert_raises(ValueError, lxca_json.load_stream, chunked(body, 2))
+
+
+RESPONSE_BODIES = [
+    (b'{"nodeList": [{"uuid": "A", "name": "n1"}, {"uuid": "B", "name": "n2"}]}', None),
+    (b'[{"id": "1", "percentage": 100}, {"id": "2", "percentage": 12.5}]', 'utf-8'),
+    (u'{"name": "caf\xe9 \u2603", "esc": "a\\u00e9\\n\\"b\\""}'.encode('utf-8'), 'utf-8'),
+    (b'{"value": NaN, "list": [Infinity, -Infinity]}', 'utf-8'),
+    (('{"big": %d, "neg": %d, "huge": %d, "max": %d}' % (2 ** 64, -2 ** 63 - 1, 10 ** 30, 2 ** 63 - 1)).encode('ascii'),
+     'utf-8'),
+    (b'{"float": 1.2345678901234567890123, "exp": 1e400, "small": 5e-324}', 'utf-8'),
+    (u'{"name": "caf\xe9"}'.encode('iso-8859-1'), 'ISO-8859-1'),
+    (u'{"price": "\u20ac 5"}'.encode('cp1252'), 'cp1252'),
+    (u'{"nodeList": [{"name": "caf\xe9"}]}'.encode('utf-16'), 'utf-16'),
+    (b'{"nodeList": [], "total": 0}', 'utf-8'),
+    (b'"text"', None),
+    (b'12345678901234567890123', None),
+]
+
+
+def make_response(body, encoding = None):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.raw = io.BytesIO(body)
+    resp.encoding = encoding
+    return resp
+
+
+def backends():
+    '''
+    Yield each installed decoder backend while lxca_json uses it
+    '''
+    for backend in ['orjson', 'json']:
+        if backend == 'orjson' and lxca_json.orjson is None:
+            continue
+        with mock.patch.object(lxca_json, 'BACKEND', backend):
+            yield backend
+
+
+def assert_same(result, expected):
+    # NaN is not equal to itself, objects are compared by their serialized form
+    assert_equals(json.dumps(result, sort_keys=True), json.dumps(expected, sort_keys=True))
+
+
+class TestDecodeResponse:
+    '''
+    Responses decode to the same objects as json.loads(resp.text) with either backend
+    '''
+
+    def test_decode_response_equals_json_loads_of_text(self):
+        for backend in backends():
+            for body, encoding in RESPONSE_BODIES:
+                expected = json.loads(make_response(body, encoding).text)
+                assert_same(lxca_json.decode_response(make_response(body, encoding)), expected)
+
+    def test_load_response_equals_json_loads_of_text(self):
+        for backend in backends():
+            for body, encoding in RESPONSE_BODIES:
+                expected = json.loads(make_response(body, encoding).text)
+                assert_same(lxca_json.load_response(make_response(body, encoding), chunk_size=3), expected)
+
+    def test_large_integers_stay_integers(self):
+        for backend in backends():
+            result = lxca_json.decode_response(make_response(('[%d, %d]' % (2 ** 64, -2 ** 70)).encode('ascii')))
+            assert_equals(result, [2 ** 64, -2 ** 70])
+            assert_true(all(isinstance(value, int) for value in result))
+
+    def test_nan_falls_back_to_json_module(self):
+        for backend in backends():
+            lxca_json.reset_decode_stats()
+            result = lxca_json.decode_response(make_response(b'{"value": NaN}'))
+            assert_true(result['value'] != result['value'])
+            stats = lxca_json.get_decode_stats()
+            assert_equals((stats['backend'], stats['responses']), (backend, 1))
+            assert_equals(stats['fallbacks'], 1 if backend == 'orjson' else 0)
+
+    def test_undecodable_utf8_is_replaced_like_text(self):
+        body = b'{"name": "caf\xe9"}'
+        for backend in backends():
+            assert_equals(lxca_json.decode_response(make_response(body, 'utf-8')),
+                          json.loads(make_response(body, 'utf-8').text))
+
+    def test_invalid_body_raises_value_error(self):
+        for backend in backends():
+            for body in [b'{"a": 1', b'<html>Bad gateway</html>', b'']:
+                assert_raises(ValueError, json.loads, make_response(body, 'utf-8').text)
+                assert_raises(ValueError, lxca_json.decode_response, make_response(body, 'utf-8'))
+                assert_raises(ValueError, lxca_json.load_response, make_response(body, 'utf-8'))
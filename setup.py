@@ -38,7 +38,10 @@ setup(
     url                 = "http://www.lenovo.com",
     packages            = ['pylxca','pylxca.pylxca_api','pylxca.pylxca_cmd'],
     long_description    = read('README'),
-    install_requires    = ['requests>=2.7.0', 'requests-toolbelt>=0.8.0'],
+    install_requires    = ['requests>=2.7.0', 'requests-toolbelt>=0.8.0',
+                           'futures>=3.0.0; python_version < "3.2"'],
+    extras_require      = {'session_cache': ['cryptography>=2.0'],
+                           'fast_json': ['orjson>=3.0; python_version >= "3.6"']},
     include_package_data= True,
     scripts             = ['lxca_shell'],
 #    data_files          = [('pylxca_api', ['pylxca/pylxca_api/lxca_logger.conf'])],